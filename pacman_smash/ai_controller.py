@@ -5,9 +5,13 @@ Manages performance tracking, difficulty balancing, and chaos events.
 
 import time
 import random
+import bisect
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, field
 from enum import Enum
+import numpy as np
+from metrics_store import MetricsStore
+from chaos import create_default_engine
 
 class BalancingAction(Enum):
     """Types of balancing actions the AI can take."""
@@ -23,7 +27,9 @@ class PerformanceMetrics:
     avg_speed: float = 0.0
     pellet_collection_rate: float = 0.0
     death_frequency: float = 0.0
-    score_trend: List[int] = field(default_factory=list)
+    score_trend: List[int] = field(default_factory=list)  # last 10 sampled scores
+    score_velocity: float = 0.0  # points per second over the last metrics samples
+    score_slope: float = 0.0  # least-squares score slope over the stored history
     last_updated: float = 0.0
     
     def update_score_trend(self, current_score: int) -> None:
@@ -34,15 +40,8 @@ class PerformanceMetrics:
             self.score_trend.pop(0)
     
     def get_score_velocity(self) -> float:
-        """Calculate the rate of score change."""
-        if len(self.score_trend) < 2:
-            return 0.0
-        
-        recent_scores = self.score_trend[-5:]  # Last 5 scores
-        if len(recent_scores) < 2:
-            return 0.0
-        
-        return (recent_scores[-1] - recent_scores[0]) / len(recent_scores)
+        """Get the score change per second, as computed from the metrics store."""
+        return self.score_velocity
 
 @dataclass
 class ChaosEvent:
@@ -61,14 +60,90 @@ class ChaosEvent:
         """Mark the event as triggered."""
         self.last_triggered = time.time()
 
+class ScoreBoard:
+    """
+    Players ordered by score, maintained incrementally.
+    
+    Only players whose score changed are re-inserted, so finding the winner and
+    loser never requires sorting all players.
+    """
+    
+    def __init__(self):
+        """Initialize an empty scoreboard."""
+        # Sorted (score, -player_id) keys: ties favour the lower id as winner
+        self._entries: List[Tuple[int, int]] = []
+        self._scores: Dict[int, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def update(self, player_id: int, score: int) -> bool:
+        """
+        Record a player's score.
+        
+        Returns:
+            True if the ordering had to be updated
+        """
+        old_score = self._scores.get(player_id)
+        if old_score == score:
+            return False
+        
+        if old_score is not None:
+            index = bisect.bisect_left(self._entries, (old_score, -player_id))
+            del self._entries[index]
+        
+        bisect.insort(self._entries, (score, -player_id))
+        self._scores[player_id] = score
+        return True
+    
+    def remove(self, player_id: int) -> None:
+        """Stop tracking a player."""
+        old_score = self._scores.pop(player_id, None)
+        if old_score is not None:
+            index = bisect.bisect_left(self._entries, (old_score, -player_id))
+            del self._entries[index]
+    
+    def sync(self, players: List) -> None:
+        """Update the board from current player scores."""
+        for player in players:
+            self.update(player.player_id, player.score)
+    
+    def leader(self) -> Optional[int]:
+        """Get the id of the highest scoring player."""
+        return -self._entries[-1][1] if self._entries else None
+    
+    def trailer(self) -> Optional[int]:
+        """Get the id of the lowest scoring player."""
+        return -self._entries[0][1] if self._entries else None
+    
+    def leader_excluding(self, player_id: int) -> Optional[int]:
+        """Get the highest scoring player other than player_id."""
+        for score, negative_id in reversed(self._entries):
+            if -negative_id != player_id:
+                return -negative_id
+        return None
+    
+    def score_of(self, player_id: int) -> int:
+        """Get the last recorded score of a player."""
+        return self._scores[player_id]
+
 class AIController:
     """Central AI system that manages game balance and chaos."""
     
-    def __init__(self):
-        """Initialize the AI controller."""
+    def __init__(self, tracking_interval: float = 2.0, history_length: int = 64):
+        """
+        Initialize the AI controller.
+        
+        Args:
+            tracking_interval: Seconds between performance samples
+            history_length: Number of samples kept per player
+        """
         # Performance tracking
         self.player_metrics: Dict[int, PerformanceMetrics] = {}
-        self.tracking_interval = 2.0  # Update metrics every 2 seconds
+        self.metrics_store = MetricsStore(capacity=history_length)
+        self.velocity_samples = 5  # Score velocity spans 4 intervals (8 s by default)
+        self.scoreboard = ScoreBoard()
+        self.tracking_interval = tracking_interval
         self.last_tracking_update = 0.0
         
         # Difficulty balancing
@@ -78,6 +153,7 @@ class AIController:
         
         # Chaos management
         self.chaos_events = self._initialize_chaos_events()
+        self.chaos_engine = create_default_engine()
         self.chaos_interval_min = 30.0  # Minimum 30 seconds between chaos
         self.chaos_interval_max = 45.0  # Maximum 45 seconds between chaos
         self.next_chaos_time = time.time() + random.uniform(self.chaos_interval_min, 
@@ -106,6 +182,7 @@ class AIController:
     def register_player(self, player_id: int) -> None:
         """Register a player for performance tracking."""
         self.player_metrics[player_id] = PerformanceMetrics(player_id)
+        self.metrics_store.add_player(player_id)
     
     def update_player_metrics(self, players: List) -> None:
         """Update performance metrics for all players."""
@@ -117,19 +194,29 @@ class AIController:
         for player in players:
             if player.player_id not in self.player_metrics:
                 self.register_player(player.player_id)
-            
-            metrics = self.player_metrics[player.player_id]
-            
-            # Update metrics
-            metrics.avg_speed = player.get_average_speed()
-            metrics.pellet_collection_rate = player.get_pellet_collection_rate()
-            
-            # Calculate death frequency (deaths per minute)
-            game_duration = max(1.0, current_time - self.game_start_time)
-            metrics.death_frequency = (player.death_count / game_duration) * 60.0
-            
-            # Update score trend
-            metrics.update_score_trend(player.score)
+        
+        # Sample one time slice for every player (each accessor is O(1))
+        store = self.metrics_store
+        values = np.zeros((store.num_players, len(store.metric_names)))
+        for player in players:
+            values[store.rows[player.player_id]] = (
+                player.score,
+                player.get_average_speed(),
+                player.get_pellet_collection_rate(),
+                player.get_death_rate(),  # deaths per minute
+            )
+        store.record(current_time, values)
+        
+        # Velocities and trends for all players in one pass
+        velocities = store.velocity('score', self.velocity_samples)
+        slopes = store.trend_slopes('score')
+        for row, player_id in enumerate(store.player_ids):
+            metrics = self.player_metrics[player_id]
+            metrics.avg_speed, metrics.pellet_collection_rate, \
+                metrics.death_frequency = values[row, 1:]
+            metrics.update_score_trend(int(values[row, 0]))
+            metrics.score_velocity = float(velocities[row])
+            metrics.score_slope = float(slopes[row])
             metrics.last_updated = current_time
         
         self.last_tracking_update = current_time
@@ -138,26 +225,23 @@ class AIController:
         """
         Analyze if there's a performance imbalance between players.
         
+        Compares the scores of the newest metrics sample, so the result is at
+        most one tracking interval old.
+        
         Returns:
             Tuple of (winning_player_id, losing_player_id, imbalance_ratio) or None
         """
         if len(players) < 2:
             return None
         
-        # Sort players by score
-        sorted_players = sorted(players, key=lambda p: p.score, reverse=True)
-        winner = sorted_players[0]
-        loser = sorted_players[-1]
-        
-        # Calculate imbalance ratio
-        if loser.score == 0:
-            imbalance_ratio = float('inf') if winner.score > 0 else 0.0
-        else:
-            imbalance_ratio = winner.score / loser.score
+        imbalance = self.metrics_store.imbalance('score')
+        if imbalance is None:
+            return None
+        winner_id, loser_id, imbalance_ratio = imbalance
         
         # Check if imbalance exceeds threshold
         if imbalance_ratio > (1.0 + self.score_difference_threshold):
-            return winner.player_id, loser.player_id, imbalance_ratio
+            return winner_id, loser_id, imbalance_ratio
         
         return None
     
@@ -166,8 +250,11 @@ class AIController:
         """Determine what balancing actions to take."""
         actions = []
         
-        # More severe imbalance = more actions
-        severity = min(3, int(imbalance_ratio - 1.0))
+        # More severe imbalance = more actions (a scoreless loser gives an infinite ratio)
+        if imbalance_ratio == float('inf'):
+            severity = 3
+        else:
+            severity = min(3, int(imbalance_ratio - 1.0))
         
         if severity >= 1:
             # Always increase ghost aggression toward winner
@@ -219,7 +306,7 @@ class AIController:
                 available_events = [e for e in self.chaos_events if e.can_trigger()]
                 if available_events:
                     event = random.choice(available_events)
-                    self._trigger_chaos_event(event, maze, ghost_manager)
+                    self._trigger_chaos_event(event, maze, ghost_manager, players)
                     messages.append(f"CHAOS: {event.description}!")
             
             elif action == BalancingAction.REDUCE_GHOST_SPEED:
@@ -235,39 +322,19 @@ class AIController:
         
         return messages
     
-    def _trigger_chaos_event(self, event: ChaosEvent, maze, ghost_manager) -> None:
-        """Trigger a specific chaos event."""
+    def _trigger_chaos_event(self, event: ChaosEvent, maze, ghost_manager,
+                             players: Optional[List] = None) -> None:
+        """Trigger a specific chaos event (its revert is scheduled by the engine)."""
         event.trigger()
-        
-        if event.name == "Wall Removal":
-            maze.apply_chaos_mode(event.duration, random.randint(3, 7))
-        
-        elif event.name == "Ghost Speed Boost":
-            for ghost in ghost_manager.ghosts:
-                ghost.set_speed_multiplier(ghost.speed_multiplier * 1.5)
-            # Schedule speed restoration (would need a timer system)
-        
-        elif event.name == "Pellet Shower":
-            # Add extra pellets to random empty positions
-            empty_positions = maze.find_path_positions()
-            for _ in range(random.randint(5, 10)):
-                if empty_positions:
-                    pos = random.choice(empty_positions)
-                    maze.place_powerup(pos[0], pos[1])
-        
-        elif event.name == "Confusion Storm":
-            ghost_manager.set_all_confused(event.duration)
-        
-        elif event.name == "Speed Reversal":
-            # This would need to be implemented in the game loop
-            pass
+        self.chaos_engine.trigger(event, maze, ghost_manager, players or [])
     
     def check_chaos_timing(self) -> bool:
         """Check if it's time for a chaos event."""
         current_time = time.time()
         return current_time >= self.next_chaos_time
     
-    def trigger_random_chaos(self, maze, ghost_manager) -> Optional[str]:
+    def trigger_random_chaos(self, maze, ghost_manager,
+                             players: Optional[List] = None) -> Optional[str]:
         """Trigger a random chaos event if it's time."""
         if not self.check_chaos_timing():
             return None
@@ -278,7 +345,7 @@ class AIController:
         
         # Weight events by chaos preference
         event = random.choice(available_events)
-        self._trigger_chaos_event(event, maze, ghost_manager)
+        self._trigger_chaos_event(event, maze, ghost_manager, players)
         
         # Schedule next chaos event
         self.next_chaos_time = time.time() + random.uniform(
@@ -289,44 +356,62 @@ class AIController:
         self.total_chaos_events += 1
         return f"CHAOS EVENT: {event.description}!"
     
-    def update(self, players: List, ghost_manager, maze) -> List[str]:
+    def update_balancing(self, players: List, ghost_manager, maze) -> List[str]:
         """
-        Main update method for the AI controller.
+        Check for a performance imbalance and apply balancing actions.
         
         Returns:
-            List of messages about AI actions taken
+            List of messages about balancing actions taken
         """
-        messages = []
-        
-        # Update player metrics
-        self.update_player_metrics(players)
-        
-        # Check for performance imbalance and apply balancing
         imbalance = self.analyze_performance_imbalance(players)
-        if imbalance:
-            winner_id, loser_id, ratio = imbalance
-            actions = self.determine_balancing_actions(winner_id, loser_id, ratio)
-            balance_messages = self.apply_balancing_actions(
-                actions, winner_id, loser_id, ghost_manager, maze, players
-            )
-            messages.extend(balance_messages)
+        if not imbalance:
+            return []
+        
+        winner_id, loser_id, ratio = imbalance
+        actions = self.determine_balancing_actions(winner_id, loser_id, ratio)
+        return self.apply_balancing_actions(
+            actions, winner_id, loser_id, ghost_manager, maze, players
+        )
+    
+    def update_chaos(self, players: List, ghost_manager, maze) -> List[str]:
+        """
+        Revert expired chaos events and trigger a new one if it's time.
         
-        # Check for chaos events
-        chaos_message = self.trigger_random_chaos(maze, ghost_manager)
-        if chaos_message:
-            messages.append(chaos_message)
+        Returns:
+            List of messages about chaos events
+        """
+        self.chaos_engine.update(maze, ghost_manager, players)
+        chaos_message = self.trigger_random_chaos(maze, ghost_manager, players)
+        return [chaos_message] if chaos_message else []
+    
+    def next_chaos_due(self) -> float:
+        """Get when update_chaos next has work to do."""
+        return min(self.next_chaos_time, self.chaos_engine.next_revert_time())
+    
+    def update(self, players: List, ghost_manager, maze) -> List[str]:
+        """
+        Main update method for the AI controller (runs every step at once).
         
+        Returns:
+            List of messages about AI actions taken
+        """
+        self.update_player_metrics(players)
+        messages = self.update_balancing(players, ghost_manager, maze)
+        messages.extend(self.update_chaos(players, ghost_manager, maze))
         return messages
     
     def get_performance_summary(self) -> Dict[int, Dict[str, float]]:
         """Get a summary of all player performance metrics."""
         summary = {}
+        relative_scores = self.metrics_store.relative('score')
         for player_id, metrics in self.player_metrics.items():
             summary[player_id] = {
                 'avg_speed': metrics.avg_speed,
                 'collection_rate': metrics.pellet_collection_rate,
                 'death_frequency': metrics.death_frequency,
-                'score_velocity': metrics.get_score_velocity()
+                'score_velocity': metrics.get_score_velocity(),
+                'score_slope': metrics.score_slope,
+                'relative_score': float(relative_scores[self.metrics_store.rows[player_id]])
             }
         return summary
     
@@ -0,0 +1,224 @@
+"""
+Batched headless simulator for Pacman Smash.
+Advances many independent matches in lockstep using stacked NumPy arrays.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+from dataclasses import dataclass
+from maze import Maze, CellType
+from ghost_ai import GhostManager
+
+# Action indices shared by every environment in the batch
+ACTION_STAY = 0
+ACTION_UP = 1
+ACTION_DOWN = 2
+ACTION_LEFT = 3
+ACTION_RIGHT = 4
+
+ACTION_NAMES = ('stay', 'up', 'down', 'left', 'right')
+
+# (dx, dy) for each action index
+ACTION_VECTORS = np.array([(0, 0), (0, -1), (0, 1), (-1, 0), (1, 0)], dtype=np.int32)
+
+@dataclass
+class BatchStepResult:
+    """Per-environment outcome of a single batched step."""
+    score_deltas: np.ndarray       # (K, P) score change this step
+    pellets_collected: np.ndarray  # (K, P) bool
+    caught: np.ndarray             # (K, P) bool, player was caught by a ghost
+    done: np.ndarray               # (K,) bool, no pellets left
+
+class BatchSimulator:
+    """Runs K independent matches with all per-match state held in arrays."""
+
+    def __init__(self, num_envs: int, width: int = 25, height: int = 19,
+                 num_players: int = 2, ghost_move_interval: int = 3,
+                 chase_probability: float = 0.75, seed: Optional[int] = None,
+                 template: Optional[Maze] = None):
+        """
+        Initialize the batched simulator.
+
+        Args:
+            num_envs: Number of matches (K) advanced in lockstep
+            width: Maze width in grid cells (ignored when template is given)
+            height: Maze height in grid cells (ignored when template is given)
+            num_players: Players per match (uses the two maze start positions)
+            ghost_move_interval: Steps between ghost moves
+            chase_probability: Chance a ghost chases the nearest player instead of wandering
+            seed: Seed for the simulator's random generator
+            template: Maze whose layout is copied into every environment
+        """
+        if template is None:
+            template = Maze(width, height)
+
+        self.num_envs = num_envs
+        self.width = template.width
+        self.height = template.height
+        self.ghost_move_interval = max(1, ghost_move_interval)
+        self.chase_probability = chase_probability
+        self.pellet_points = 10
+        self.death_penalty = 50
+        self.rng = np.random.default_rng(seed)
+
+        # Layout shared by all environments, copied on reset
+        self.template_grid = np.array(template.grid, dtype=np.int8)
+
+        # Starting positions as (x, y)
+        starts = template.get_player_starting_positions()
+        self.player_starts = np.array([starts[i % len(starts)] for i in range(num_players)],
+                                      dtype=np.int32)
+
+        ghost_manager = GhostManager()
+        ghost_manager.create_default_ghosts(self.width, self.height)
+        self.ghost_starts = np.array([g.start_position for g in ghost_manager.ghosts],
+                                     dtype=np.int32)
+
+        self.num_players = num_players
+        self.num_ghosts = len(self.ghost_starts)
+
+        # Stacked per-environment state
+        self.grids = np.empty((num_envs, self.height, self.width), dtype=np.int8)
+        self.player_positions = np.empty((num_envs, num_players, 2), dtype=np.int32)
+        self.ghost_positions = np.empty((num_envs, self.num_ghosts, 2), dtype=np.int32)
+        self.scores = np.zeros((num_envs, num_players), dtype=np.int32)
+        self.deaths = np.zeros((num_envs, num_players), dtype=np.int32)
+        self.pellets_remaining = np.zeros(num_envs, dtype=np.int32)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.tick = 0  # Global lockstep counter driving ghost timing
+
+        self._env_index = np.arange(num_envs)
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """
+        Reset environments to the template layout.
+
+        Args:
+            mask: Boolean (K,) array selecting environments to reset; all if None
+        """
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+
+        self.grids[mask] = self.template_grid
+        self.player_positions[mask] = self.player_starts
+        self.ghost_positions[mask] = self.ghost_starts
+        self.scores[mask] = 0
+        self.deaths[mask] = 0
+        self.steps[mask] = 0
+        self.pellets_remaining[mask] = np.count_nonzero(
+            self.template_grid == CellType.PELLET.value)
+
+    def _open_at(self, positions: np.ndarray) -> np.ndarray:
+        """Check which (K, N, 2) positions are in bounds and not walls."""
+        x = positions[..., 0]
+        y = positions[..., 1]
+        in_bounds = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        xc = np.clip(x, 0, self.width - 1)
+        yc = np.clip(y, 0, self.height - 1)
+        cells = self.grids[self._env_index[:, None], yc, xc]
+        return in_bounds & (cells != CellType.WALL.value)
+
+    def _move_players(self, actions: np.ndarray) -> None:
+        """Apply player actions, keeping players in place when blocked."""
+        targets = self.player_positions + ACTION_VECTORS[actions]
+        allowed = self._open_at(targets)
+        self.player_positions = np.where(allowed[..., None], targets, self.player_positions)
+
+    def _collect_pellets(self) -> np.ndarray:
+        """Collect pellets under players; earlier players win shared cells."""
+        collected = np.zeros((self.num_envs, self.num_players), dtype=bool)
+
+        # Players are processed in order so a contested pellet is only scored once
+        for p in range(self.num_players):
+            x = self.player_positions[:, p, 0]
+            y = self.player_positions[:, p, 1]
+            on_pellet = self.grids[self._env_index, y, x] == CellType.PELLET.value
+            self.grids[self._env_index[on_pellet], y[on_pellet], x[on_pellet]] = \
+                CellType.EMPTY.value
+            collected[:, p] = on_pellet
+
+        self.pellets_remaining -= collected.sum(axis=1, dtype=np.int32)
+        return collected
+
+    def _move_ghosts(self) -> None:
+        """Move every ghost in every environment one step."""
+        # Candidate positions for the four real directions: (K, G, 4, 2)
+        candidates = self.ghost_positions[:, :, None, :] + ACTION_VECTORS[None, None, 1:]
+        valid = self._open_at(candidates.reshape(self.num_envs, -1, 2))
+        valid = valid.reshape(self.num_envs, self.num_ghosts, 4)
+
+        # Manhattan distance from each candidate to the nearest player: (K, G, 4)
+        deltas = np.abs(candidates[:, :, :, None, :] -
+                        self.player_positions[:, None, None, :, :]).sum(axis=-1)
+        nearest = deltas.min(axis=-1)
+
+        chase = self.rng.random((self.num_envs, self.num_ghosts)) < self.chase_probability
+        noise = self.rng.random((self.num_envs, self.num_ghosts, 4))
+
+        # Chasing ghosts minimise distance (noise only breaks ties), others wander
+        preference = np.where(chase[..., None], -nearest + noise * 0.5, noise)
+        preference = np.where(valid, preference, -np.inf)
+        choice = preference.argmax(axis=-1)
+
+        has_move = valid.any(axis=-1)
+        chosen = np.take_along_axis(candidates, choice[..., None, None], axis=2)[:, :, 0, :]
+        self.ghost_positions = np.where(has_move[..., None], chosen, self.ghost_positions)
+
+    def _resolve_collisions(self) -> np.ndarray:
+        """Penalise and respawn players that share a cell with any ghost."""
+        same_cell = (self.ghost_positions[:, :, None, :] ==
+                     self.player_positions[:, None, :, :]).all(axis=-1)
+        caught = same_cell.any(axis=1)
+
+        self.scores = np.where(caught, np.maximum(0, self.scores - self.death_penalty),
+                               self.scores)
+        self.deaths += caught
+        self.player_positions = np.where(caught[..., None], self.player_starts[None],
+                                         self.player_positions)
+        return caught
+
+    def step(self, actions: np.ndarray) -> BatchStepResult:
+        """
+        Advance every environment by one step.
+
+        Args:
+            actions: Integer (K, P) array of action indices (see ACTION_NAMES)
+
+        Returns:
+            BatchStepResult describing what happened in each environment
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs, self.num_players):
+            raise ValueError(f"actions must have shape {(self.num_envs, self.num_players)}, "
+                             f"got {actions.shape}")
+
+        previous_scores = self.scores.copy()
+
+        self._move_players(actions)
+        collected = self._collect_pellets()
+        self.scores += collected * self.pellet_points
+
+        # Players walking into a ghost are caught before ghosts move
+        caught = self._resolve_collisions()
+
+        self.steps += 1
+        self.tick += 1
+        if self.tick % self.ghost_move_interval == 0:
+            self._move_ghosts()
+            caught |= self._resolve_collisions()
+
+        return BatchStepResult(
+            score_deltas=self.scores - previous_scores,
+            pellets_collected=collected,
+            caught=caught,
+            done=self.pellets_remaining <= 0,
+        )
+
+    def random_actions(self) -> np.ndarray:
+        """Sample a uniformly random (K, P) action array."""
+        return self.rng.integers(0, len(ACTION_NAMES), size=(self.num_envs, self.num_players))
+
+    def get_env_state(self, env: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get (grid, player_positions, ghost_positions) views for one environment."""
+        return self.grids[env], self.player_positions[env], self.ghost_positions[env]
@@ -0,0 +1,193 @@
+"""
+Bitboard cell store for Pacman Smash.
+Keeps one big-int bitset per cell type so whole-maze questions (how many
+pellets, which empty cells may respawn one, where can anything move) become
+a few AND, OR, shift and popcount operations instead of grid scans.
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+from maze import Maze, CellType
+
+Position = Tuple[int, int]
+
+def popcount(board: int) -> int:
+    """Number of set bits in a board."""
+    return board.bit_count()
+
+class MazeBitboards:
+    """
+    Bitsets of a maze's cell types, kept in step with its cell listener.
+
+    Cell (x, y) is bit y * stride + x with stride = width + 1: the extra
+    column is always clear, so shifting by 1 never wraps a cell onto the
+    neighbouring row and shifting by stride moves a whole row up or down.
+
+    Python ints are immutable, so flipping one bit copies the board. Cell
+    changes are therefore queued and applied as one XOR mask per board on
+    the next query, making a change O(1) and a query O(cells / 64) however
+    many cells changed since the last one.
+    """
+
+    def __init__(self, maze: Maze):
+        """
+        Initialize the bitsets and start following cell changes.
+
+        Args:
+            maze: Maze to mirror
+        """
+        self.maze = maze
+        self.stride = maze.width + 1
+        self.boards: Dict[int, int] = {}
+        self._pending: List[Tuple[int, int, int]] = []  # (bit, old value, new value)
+        # Sync early once the queue would cost more to hold than to apply
+        self.max_pending = max(64, self.stride * maze.height // 64)
+        self._open = None
+
+        # Masks that only depend on the maze size
+        row = (1 << maze.width) - 1
+        self.full = sum(row << (y * self.stride) for y in range(maze.height))
+        interior_row = row & ~1 & ~(1 << (maze.width - 1))
+        self.interior = sum(interior_row << (y * self.stride) for y in range(1, maze.height - 1))
+        self.no_respawn = self._ghost_house_and_starts()
+
+        self.rebuild()
+        maze.add_cell_listener(self._on_cell_changed)
+
+    def detach(self) -> None:
+        """Stop following maze changes."""
+        self.maze.remove_cell_listener(self._on_cell_changed)
+
+    def bit(self, x: int, y: int) -> int:
+        """Bit index of a cell."""
+        return y * self.stride + x
+
+    def _ghost_house_and_starts(self) -> int:
+        """Cells that never get pellets: the 5x5 ghost house and the start cells."""
+        maze = self.maze
+        center_x, center_y = maze.width // 2, maze.height // 2
+        mask = 0
+        for y in range(max(0, center_y - 2), min(maze.height, center_y + 3)):
+            for x in range(max(0, center_x - 2), min(maze.width, center_x + 3)):
+                mask |= 1 << self.bit(x, y)
+        for x, y in maze.get_player_starting_positions():
+            mask |= 1 << self.bit(x, y)
+        return mask
+
+    def rebuild(self) -> None:
+        """Rebuild every board from the grid (e.g. after a new maze is generated)."""
+        grid = np.array(self.maze.grid, dtype=np.uint8)
+        bits = np.zeros((self.maze.height, self.stride), dtype=bool)  # Guard column stays clear
+        self.boards = {}
+        for cell_type in CellType:
+            bits[:, :self.maze.width] = grid == cell_type.value
+            packed = np.packbits(bits.ravel(), bitorder='little')
+            self.boards[cell_type.value] = int.from_bytes(packed.tobytes(), 'little')
+        self._pending = []
+        self._open = None
+
+    def _on_cell_changed(self, x: int, y: int, old_value: int, new_value: int) -> None:
+        self._pending.append((self.bit(x, y), old_value, new_value))
+        if len(self._pending) > self.max_pending:
+            self._sync()
+
+    def _sync(self) -> None:
+        """Apply queued cell changes, one XOR per affected board."""
+        if not self._pending:
+            return
+        size = (self.stride * self.maze.height + 7) // 8
+        masks: Dict[int, bytearray] = {}
+        for bit, old_value, new_value in self._pending:
+            for value in (old_value, new_value):
+                mask = masks.get(value)
+                if mask is None:
+                    mask = masks[value] = bytearray(size)
+                mask[bit >> 3] ^= 1 << (bit & 7)
+        for value, mask in masks.items():
+            self.boards[value] ^= int.from_bytes(mask, 'little')
+        if CellType.WALL.value in masks:
+            self._open = None
+        self._pending = []
+
+    def board(self, cell_type: CellType) -> int:
+        """Get the bitset of one cell type."""
+        self._sync()
+        return self.boards[cell_type.value]
+
+    @property
+    def walls(self) -> int:
+        """Wall cells."""
+        return self.board(CellType.WALL)
+
+    @property
+    def open(self) -> int:
+        """Cells that are not walls."""
+        walls = self.walls
+        if self._open is None:
+            self._open = self.full & ~walls
+        return self._open
+
+    def positions(self, board: int) -> List[Position]:
+        """List the cells of a board in row-major order."""
+        if not board:
+            return []
+        data = board.to_bytes((self.stride * self.maze.height + 7) // 8, 'little')
+        bits = np.flatnonzero(np.unpackbits(np.frombuffer(data, dtype=np.uint8),
+                                            bitorder='little'))
+        ys, xs = np.divmod(bits, self.stride)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def pellet_count(self) -> int:
+        """Number of pellets on the board."""
+        return popcount(self.board(CellType.PELLET))
+
+    def respawn_mask(self) -> int:
+        """Empty cells outside the ghost house and the start cells."""
+        return self.board(CellType.EMPTY) & ~self.no_respawn
+
+    def interior_walls(self) -> int:
+        """Walls that are not part of the outer border."""
+        return self.walls & self.interior
+
+    def spread(self, board: int) -> int:
+        """Open cells one step from any cell of a board."""
+        stride = self.stride
+        return ((board << 1) | (board >> 1) | (board << stride) | (board >> stride)) & self.open
+
+    def moves(self, x: int, y: int) -> List[Position]:
+        """
+        Get the open neighbours of a cell, like get_valid_adjacent_positions.
+
+        One shift brings the 3-row window around the cell to the bottom of
+        the board, so the four tests are on a small int.
+        """
+        stride = self.stride
+        center = self.bit(x, y)
+        low = center - stride
+        window = (self.open >> low) if low >= 0 else (self.open << -low)
+        window &= (1 << (2 * stride + 1)) - 1
+        moves = []
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):  # up, down, left, right
+            if window >> (stride + dy * stride + dx) & 1:
+                moves.append((x + dx, y + dy))
+        return moves
+
+    def reachable(self, start: Position) -> int:
+        """
+        Flood fill the open cells reachable from start.
+
+        Each round spreads the whole frontier at once, so the fill takes one
+        round per step of the longest shortest path.
+        """
+        if not self.maze.is_valid_position(*start):
+            return 0
+        reached = 1 << self.bit(*start)
+        frontier = reached
+        open_cells = self.open
+        stride = self.stride
+        while frontier:
+            grown = ((frontier << 1) | (frontier >> 1) | (frontier << stride) |
+                     (frontier >> stride)) & open_cells & ~reached
+            reached |= grown
+            frontier = grown
+        return reached
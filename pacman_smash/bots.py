@@ -0,0 +1,208 @@
+"""
+Bot controllers for Pacman Smash.
+Automated players for solo play, load testing and balancing soak tests.
+"""
+
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from maze import Maze
+from navigation import DistanceCache
+from nav_graph import CorridorGraph
+from player import DIRECTION_VECTORS
+
+Position = Tuple[int, int]
+
+def direction_between(start: Position, end: Position) -> Optional[str]:
+    """Get the direction name for a single step from start to end."""
+    offset = (end[0] - start[0], end[1] - start[1])
+    for direction, vector in DIRECTION_VECTORS.items():
+        if vector == offset:
+            return direction
+    return None
+
+class BotController(ABC):
+    """Base class for automated player controllers."""
+
+    name = "bot"
+
+    @abstractmethod
+    def choose_direction(self, player, maze: Maze, ghosts: List) -> Optional[str]:
+        """
+        Choose the next movement direction for a player.
+
+        Args:
+            player: Player being controlled
+            maze: Current maze
+            ghosts: Ghosts in the game
+
+        Returns:
+            One of the DIRECTION_VECTORS keys, or None to stay in place
+        """
+
+class RandomBot(BotController):
+    """Wanders randomly, preferring to keep its heading."""
+
+    name = "random"
+
+    def __init__(self, turn_probability: float = 0.2, seed: Optional[int] = None):
+        """
+        Initialize the random bot.
+
+        Args:
+            turn_probability: Chance of picking a new direction at any step
+            seed: Seed for reproducible wandering
+        """
+        self.turn_probability = turn_probability
+        self.rng = random.Random(seed)
+        self.heading: Optional[str] = None
+
+    def choose_direction(self, player, maze: Maze, ghosts: List) -> Optional[str]:
+        x, y = player.position
+        options = [direction for direction, (dx, dy) in DIRECTION_VECTORS.items()
+                   if maze.is_valid_position(x + dx, y + dy)]
+        if not options:
+            return None
+
+        if self.heading not in options or self.rng.random() < self.turn_probability:
+            self.heading = self.rng.choice(options)
+        return self.heading
+
+class GreedyPelletBot(BotController):
+    """Heads for the nearest pellet by path distance."""
+
+    name = "greedy"
+
+    def __init__(self, distance_cache: DistanceCache,
+                 nav_graph: Optional[CorridorGraph] = None):
+        """
+        Initialize the greedy bot.
+
+        Args:
+            distance_cache: Shared cache of maze distance fields
+            nav_graph: Shared corridor graph; when given, the bot follows a
+                route planned on it instead of a distance field per target
+        """
+        self.distance_cache = distance_cache
+        self.nav_graph = nav_graph
+        self.target: Optional[Position] = None
+        self.route: Tuple[Position, ...] = ()
+        self.route_version = -1
+
+    def _pick_target(self, position: Position, maze: Maze) -> Optional[Position]:
+        """Pick the reachable pellet closest to position (other than position itself)."""
+        field = self.distance_cache.distances_from(position)
+        best_target = None
+        best_distance = None
+        for pellet in maze.pellet_positions:
+            distance = field.get(pellet)
+            if not distance:
+                # Unreachable, or respawned under the player
+                continue
+            if best_distance is None or distance < best_distance:
+                best_distance = distance
+                best_target = pellet
+        return best_target
+
+    def _next_step(self, position: Position, maze: Maze) -> Optional[Position]:
+        """Get the next cell towards the target."""
+        if self.nav_graph is None:
+            return self.distance_cache.next_step_towards(position, self.target)
+
+        # Advance along the route once the last step was taken
+        route = self.route
+        if len(route) > 1 and route[1] == position:
+            route = route[1:]
+        # Replan when walls changed, the target moved on or the bot left its route
+        if (self.route_version != maze.wall_version or len(route) < 2 or
+                route[-1] != self.target or route[0] != position):
+            route = self.nav_graph.route(position, self.target) or ()
+            self.route_version = maze.wall_version
+        self.route = route
+        return route[1] if len(route) > 1 else None
+
+    def choose_direction(self, player, maze: Maze, ghosts: List) -> Optional[str]:
+        # Keep the current target until it is eaten so its distance field stays cached
+        if self.target not in maze.pellet_positions or self.target == player.position:
+            self.target = self._pick_target(player.position, maze)
+        if self.target is None:
+            return None
+
+        step = self._next_step(player.position, maze)
+        if step is None:
+            self.target = None
+            return None
+        return direction_between(player.position, step)
+
+class GhostAvoidingBot(GreedyPelletBot):
+    """Collects pellets greedily but flees when a ghost gets close."""
+
+    name = "avoid"
+
+    def __init__(self, distance_cache: DistanceCache,
+                 nav_graph: Optional[CorridorGraph] = None, danger_distance: int = 4):
+        """
+        Initialize the ghost-avoiding bot.
+
+        Args:
+            distance_cache: Shared cache of maze distance fields
+            nav_graph: Shared corridor graph for routing to pellets
+            danger_distance: Path distance at which the bot starts fleeing
+        """
+        super().__init__(distance_cache, nav_graph)
+        self.danger_distance = danger_distance
+
+    def _ghost_distance(self, position: Position, ghost_fields: List[Dict]) -> int:
+        """Get the path distance from position to the closest ghost."""
+        unreachable = self.danger_distance * 4
+        return min((field.get(position, unreachable) for field in ghost_fields),
+                   default=unreachable)
+
+    def choose_direction(self, player, maze: Maze, ghosts: List) -> Optional[str]:
+        # Ghosts move rarely compared to frames, so their fields are mostly cache hits
+        ghost_fields = [self.distance_cache.distances_from(ghost.position) for ghost in ghosts]
+
+        if self._ghost_distance(player.position, ghost_fields) > self.danger_distance:
+            return super().choose_direction(player, maze, ghosts)
+
+        # Flee: pick the neighbour that maximises distance to the closest ghost
+        x, y = player.position
+        best_direction = None
+        best_distance = self._ghost_distance(player.position, ghost_fields)
+        for direction, (dx, dy) in DIRECTION_VECTORS.items():
+            if not maze.is_valid_position(x + dx, y + dy):
+                continue
+            distance = self._ghost_distance((x + dx, y + dy), ghost_fields)
+            if distance > best_distance:
+                best_distance = distance
+                best_direction = direction
+
+        return best_direction
+
+# Bot kinds available by name (e.g. from the command line)
+BOT_TYPES = {
+    RandomBot.name: RandomBot,
+    GreedyPelletBot.name: GreedyPelletBot,
+    GhostAvoidingBot.name: GhostAvoidingBot,
+}
+
+def create_bot(kind: str, distance_cache: DistanceCache, seed: Optional[int] = None,
+               nav_graph: Optional[CorridorGraph] = None) -> BotController:
+    """
+    Create a bot controller by name.
+
+    Args:
+        kind: One of the BOT_TYPES keys
+        distance_cache: Shared cache of maze distance fields
+        seed: Seed for bots with random behaviour
+        nav_graph: Shared corridor graph for route queries
+
+    Returns:
+        The new bot controller
+    """
+    if kind not in BOT_TYPES:
+        raise ValueError(f"Unknown bot type '{kind}', expected one of {sorted(BOT_TYPES)}")
+
+    if kind == RandomBot.name:
+        return RandomBot(seed=seed)
+    return BOT_TYPES[kind](distance_cache, nav_graph)
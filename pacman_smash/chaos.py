@@ -0,0 +1,175 @@
+"""
+Chaos effect engine for Pacman Smash.
+Applies chaos events through registered handlers and undoes them on a timer.
+"""
+
+import heapq
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# apply(event, maze, ghost_manager, players) -> state passed to revert
+ApplyHandler = Callable[[Any, Any, Any, List], Any]
+# revert(state, maze, ghost_manager, players)
+RevertHandler = Callable[[Any, Any, Any, List], None]
+
+@dataclass
+class ChaosHandler:
+    """Apply/revert pair registered for a chaos event."""
+    apply: ApplyHandler
+    revert: Optional[RevertHandler] = None
+
+class ChaosEffectEngine:
+    """
+    Dispatches chaos events to their handlers and schedules reverts.
+
+    Pending reverts sit in a min-heap keyed by due time, so update() only looks
+    at events that are due; its cost does not depend on how many events are
+    registered or running.
+    """
+
+    def __init__(self):
+        """Initialize the engine with no handlers."""
+        self.handlers: Dict[str, ChaosHandler] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._active: Dict[str, Tuple[int, Any]] = {}  # name -> (sequence, state)
+        self._sequence = 0
+
+    def register(self, name: str, apply: ApplyHandler,
+                 revert: Optional[RevertHandler] = None) -> None:
+        """Register the handlers for a chaos event name."""
+        self.handlers[name] = ChaosHandler(apply, revert)
+
+    def is_active(self, name: str) -> bool:
+        """Check if an event is waiting to be reverted."""
+        return name in self._active
+
+    def active_events(self) -> List[str]:
+        """Get the names of events waiting to be reverted."""
+        return list(self._active)
+
+    def trigger(self, event, maze, ghost_manager, players: List,
+                current_time: Optional[float] = None) -> bool:
+        """
+        Apply a chaos event and schedule its revert after event.duration.
+
+        Re-triggering an active event reverts it first, so effects never stack.
+
+        Returns:
+            True if a handler was registered for the event
+        """
+        handler = self.handlers.get(event.name)
+        if handler is None:
+            return False
+        if current_time is None:
+            current_time = time.time()
+
+        if event.name in self._active:
+            self._revert(event.name, maze, ghost_manager, players)
+
+        state = handler.apply(event, maze, ghost_manager, players)
+        if handler.revert is not None:
+            self._sequence += 1
+            self._active[event.name] = (self._sequence, state)
+            heapq.heappush(self._queue,
+                           (current_time + event.duration, self._sequence, event.name))
+        return True
+
+    def next_revert_time(self) -> float:
+        """Get when the next queued revert is due (inf if none)."""
+        return self._queue[0][0] if self._queue else float('inf')
+
+    def _revert(self, name: str, maze, ghost_manager, players: List) -> None:
+        """Undo an active event now (its queue entry becomes stale)."""
+        _, state = self._active.pop(name)
+        self.handlers[name].revert(state, maze, ghost_manager, players)
+
+    def update(self, maze, ghost_manager, players: List,
+               current_time: Optional[float] = None) -> List[str]:
+        """
+        Revert events whose duration has passed.
+
+        Returns:
+            Names of the events reverted
+        """
+        if current_time is None:
+            current_time = time.time()
+
+        reverted = []
+        queue = self._queue
+        while queue and queue[0][0] <= current_time:
+            _, sequence, name = heapq.heappop(queue)
+            active = self._active.get(name)
+            if active is None or active[0] != sequence:
+                continue  # Already reverted early or re-triggered
+            self._revert(name, maze, ghost_manager, players)
+            reverted.append(name)
+        return reverted
+
+    def revert_all(self, maze, ghost_manager, players: List) -> None:
+        """Undo every active event immediately (e.g. at game end)."""
+        for name in list(self._active):
+            self._revert(name, maze, ghost_manager, players)
+        self._queue.clear()
+
+# Built-in chaos event handlers
+
+GHOST_SPEED_MODIFIER = "chaos_speed_boost"
+
+def _apply_wall_removal(event, maze, ghost_manager, players):
+    # The maze restores removed walls itself when the modifications expire
+    maze.apply_chaos_mode(event.duration, random.randint(3, 7))
+
+def _apply_ghost_speed_boost(event, maze, ghost_manager, players):
+    for ghost in ghost_manager.ghosts:
+        ghost.set_speed_modifier(GHOST_SPEED_MODIFIER, 1.5)
+
+def _revert_ghost_speed_boost(state, maze, ghost_manager, players):
+    for ghost in ghost_manager.ghosts:
+        ghost.clear_speed_modifier(GHOST_SPEED_MODIFIER)
+
+def _apply_pellet_shower(event, maze, ghost_manager, players):
+    # Add extra power-ups to random empty positions
+    empty_positions = maze.find_path_positions()
+    for _ in range(random.randint(5, 10)):
+        if empty_positions:
+            pos = random.choice(empty_positions)
+            maze.place_powerup(pos[0], pos[1])
+
+def _apply_confusion_storm(event, maze, ghost_manager, players):
+    ghost_manager.set_all_confused(event.duration)
+
+def _apply_speed_reversal(event, maze, ghost_manager, players):
+    """Pair players by score (leader with trailer) and swap their speeds."""
+    original_speeds = {player.player_id: player.speed for player in players}
+    ranked = sorted(players, key=lambda p: p.score, reverse=True)
+    effective = {player.player_id: player.get_current_speed() for player in ranked}
+
+    for high, low in zip(ranked, reversed(ranked[len(ranked) // 2:])):
+        if high is low:
+            break
+        # Base speeds are scaled so each player moves at the partner's current pace
+        high.speed = effective[low.player_id] / (effective[high.player_id] / high.speed)
+        low.speed = effective[high.player_id] / (effective[low.player_id] / low.speed)
+    return original_speeds
+
+def _revert_speed_reversal(original_speeds, maze, ghost_manager, players):
+    for player in players:
+        if player.player_id in original_speeds:
+            player.speed = original_speeds[player.player_id]
+
+DEFAULT_CHAOS_HANDLERS = {
+    "Wall Removal": ChaosHandler(_apply_wall_removal),
+    "Ghost Speed Boost": ChaosHandler(_apply_ghost_speed_boost, _revert_ghost_speed_boost),
+    "Pellet Shower": ChaosHandler(_apply_pellet_shower),
+    "Confusion Storm": ChaosHandler(_apply_confusion_storm),
+    "Speed Reversal": ChaosHandler(_apply_speed_reversal, _revert_speed_reversal),
+}
+
+def create_default_engine() -> ChaosEffectEngine:
+    """Create an engine with the built-in chaos events registered."""
+    engine = ChaosEffectEngine()
+    for name, handler in DEFAULT_CHAOS_HANDLERS.items():
+        engine.register(name, handler.apply, handler.revert)
+    return engine
@@ -0,0 +1,195 @@
+"""
+Chaos wall planner for Pacman Smash.
+Picks walls for chaos events from a maintained index and restores them
+without sealing anyone in.
+"""
+
+import heapq
+import random
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from maze import Maze, CellType, TemporaryModification
+
+Position = Tuple[int, int]
+
+def _no_occupants() -> List[Position]:
+    return []
+
+class WallChaosPlanner:
+    """
+    Removes and restores walls for chaos events.
+
+    Interior walls are kept in a list with a position -> slot map, updated
+    from the maze's cell listener with swap-and-pop, so adding, dropping and
+    sampling k walls are O(1), O(1) and O(k) with no grid scan. Restorations
+    sit in a min-heap keyed by end time; each one is checked against the
+    maze's connectivity index first and postponed if closing the cell would
+    trap a player or ghost (Property 9). At most max_restores_per_update
+    walls come back per update, so events with thousands of walls are spread
+    over several frames.
+    """
+
+    def __init__(self, maze: Maze, retry_delay: float = 0.5,
+                 max_restores_per_update: int = 256):
+        """
+        Initialize the planner and index the maze's interior walls.
+
+        Args:
+            maze: Maze to modify
+            retry_delay: Seconds to wait before retrying a blocked restoration
+            max_restores_per_update: Most walls restored by one update
+        """
+        self.maze = maze
+        self.retry_delay = retry_delay
+        self.max_restores_per_update = max_restores_per_update
+        # Positions of players and ghosts; set by the game engine
+        self.occupants: Callable[[], Iterable[Position]] = _no_occupants
+
+        self._walls: List[Position] = []
+        self._slot: Dict[Position, int] = {}
+        self._restore_queue: List[Tuple[float, Position]] = []
+
+        # Statistics
+        self.walls_removed = 0
+        self.walls_restored = 0
+        self.restores_postponed = 0
+
+        self.rebuild_index()
+        maze.add_cell_listener(self._on_cell_changed)
+
+    def detach(self) -> None:
+        """Stop following maze changes."""
+        self.maze.remove_cell_listener(self._on_cell_changed)
+
+    def _is_interior(self, x: int, y: int) -> bool:
+        return 0 < x < self.maze.width - 1 and 0 < y < self.maze.height - 1
+
+    def rebuild_index(self) -> None:
+        """Index every interior wall (e.g. after a new maze is generated)."""
+        self._walls = []
+        self._slot = {}
+        bitboards = self.maze.bitboards
+        for position in bitboards.positions(bitboards.interior_walls()):
+            self._add_wall(position)
+
+    def _add_wall(self, position: Position) -> None:
+        if position not in self._slot:
+            self._slot[position] = len(self._walls)
+            self._walls.append(position)
+
+    def _drop_wall(self, position: Position) -> None:
+        slot = self._slot.pop(position, None)
+        if slot is None:
+            return
+        last = self._walls.pop()
+        if slot < len(self._walls):
+            # Move the last wall into the freed slot
+            self._walls[slot] = last
+            self._slot[last] = slot
+
+    def _on_cell_changed(self, x: int, y: int, old_value: int, new_value: int) -> None:
+        wall = CellType.WALL.value
+        if (old_value == wall) == (new_value == wall) or not self._is_interior(x, y):
+            return
+        if new_value == wall:
+            self._add_wall((x, y))
+        else:
+            self._drop_wall((x, y))
+
+    @property
+    def wall_count(self) -> int:
+        """Number of interior walls that could be removed."""
+        return len(self._walls)
+
+    def sample_walls(self, count: int, rng: Optional[random.Random] = None) -> List[Position]:
+        """
+        Pick distinct interior walls uniformly at random in O(count).
+
+        A partial Fisher-Yates shuffle moves the picks to the front of the
+        index, keeping the slot map in step.
+        """
+        rng = rng or random
+        walls = self._walls
+        count = min(count, len(walls))
+        for i in range(count):
+            j = rng.randrange(i, len(walls))
+            walls[i], walls[j] = walls[j], walls[i]
+            self._slot[walls[i]] = i
+            self._slot[walls[j]] = j
+        return walls[:count]
+
+    def remove_walls(self, count: int, duration: float, current_time: Optional[float] = None,
+                     rng: Optional[random.Random] = None) -> List[Position]:
+        """
+        Temporarily open random interior walls.
+
+        Args:
+            count: Number of walls to remove
+            duration: Seconds until each wall is restored
+            current_time: Current time (defaults to now)
+            rng: Random source (defaults to the random module)
+
+        Returns:
+            Positions of the removed walls
+        """
+        if current_time is None:
+            current_time = time.time()
+        end_time = current_time + duration
+
+        removed = self.sample_walls(count, rng)
+        for x, y in removed:
+            mod = TemporaryModification((x, y), CellType.WALL.value,
+                                        CellType.PATH.value, end_time)
+            self.maze.temporary_modifications[(x, y)] = mod
+            heapq.heappush(self._restore_queue, (end_time, (x, y)))
+            self.maze.set_cell(x, y, CellType.PATH.value)
+        self.walls_removed += len(removed)
+        return removed
+
+    def next_restore_time(self) -> float:
+        """Get when the next restoration is due (inf if none)."""
+        queue = self._restore_queue
+        modifications = self.maze.temporary_modifications
+        while queue:
+            end_time, position = queue[0]
+            mod = modifications.get(position)
+            if mod is not None and mod.end_time == end_time:
+                return end_time
+            heapq.heappop(queue)  # Restored some other way or postponed
+        return float('inf')
+
+    def restore_due(self, current_time: Optional[float] = None) -> int:
+        """
+        Restore walls whose time is up, unless that would trap an occupant.
+
+        Returns:
+            Number of cells restored
+        """
+        if current_time is None:
+            current_time = time.time()
+
+        queue = self._restore_queue
+        modifications = self.maze.temporary_modifications
+        occupants = None
+        restored = 0
+        while (queue and queue[0][0] <= current_time and
+               restored < self.max_restores_per_update):
+            end_time, position = heapq.heappop(queue)
+            mod = modifications.get(position)
+            if mod is None or mod.end_time != end_time:
+                continue  # Stale entry
+
+            if occupants is None:
+                occupants = list(self.occupants())
+            if (mod.original_value == CellType.WALL.value and
+                    self.maze.connectivity.seals_in(position, occupants)):
+                mod.end_time = current_time + self.retry_delay
+                heapq.heappush(queue, (mod.end_time, position))
+                self.restores_postponed += 1
+                continue
+
+            del modifications[position]
+            self.maze.set_cell(position[0], position[1], mod.original_value)
+            restored += 1
+        self.walls_restored += restored
+        return restored
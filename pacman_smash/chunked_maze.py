@@ -0,0 +1,475 @@
+"""
+Chunked maze storage for Pacman Smash.
+Open-world maps are split into fixed-size square chunks that are generated
+or read back from disk on first access. Only a bounded number of chunks stay
+in memory; the least recently used ones are spilled to disk, so maps can be
+far larger than a list-of-lists grid would allow.
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from maze import Maze, CellType
+from maze_generators import generate, MIN_SIZE
+
+Position = Tuple[int, int]
+ChunkKey = Tuple[int, int]
+# source(chunk_x, chunk_y, chunk_size) -> chunk_size * chunk_size CellType values, row-major
+ChunkSource = Callable[[int, int, int], bytes]
+
+WALL = CellType.WALL.value
+PATH = CellType.PATH.value
+PELLET = CellType.PELLET.value
+
+# Generators whose mazes keep every odd-coordinate cell open and connected,
+# which is what lets chunk doorways join neighbouring chunks
+LATTICE_GENERATORS = ('binary_tree', 'sidewinder', 'braided', 'backtracker')
+
+class ChunkStore:
+    """
+    Cell values of a large grid, held as an LRU cache of square chunks.
+
+    Each chunk is a bytearray of chunk_size * chunk_size cells. A chunk that
+    is not resident is read from the spill directory if it was ever spilled
+    and otherwise regenerated from the source, which must be deterministic.
+    Only chunks modified since they were loaded are written out on eviction.
+    """
+
+    def __init__(self, width: int, height: int, source: ChunkSource, chunk_size: int = 64,
+                 max_resident: int = 64, spill_dir: Optional[str] = None,
+                 on_load: Optional[Callable[[ChunkKey, bytearray], None]] = None,
+                 on_evict: Optional[Callable[[ChunkKey, bytearray], None]] = None):
+        """
+        Initialize an empty store.
+
+        Args:
+            width: Grid width in cells
+            height: Grid height in cells
+            source: Generates the original contents of a chunk
+            chunk_size: Side of a chunk in cells
+            max_resident: Most chunks kept in memory
+            spill_dir: Directory for evicted chunks (default: a temporary
+                directory created on first spill and removed by close())
+            on_load: Called with each chunk after it becomes resident
+            on_evict: Called with each chunk before it leaves memory
+        """
+        self.width = width
+        self.height = height
+        self.source = source
+        self.chunk_size = chunk_size
+        self.max_resident = max(1, max_resident)
+        self.spill_dir = spill_dir
+        self._owns_spill_dir = False
+        self.on_load = on_load
+        self.on_evict = on_evict
+
+        self._chunks: 'OrderedDict[ChunkKey, bytearray]' = OrderedDict()
+        self._dirty: Set[ChunkKey] = set()  # Resident chunks changed since loading
+        self._spilled: Set[ChunkKey] = set()  # Chunks whose latest contents are on disk
+        self._last_key: Optional[ChunkKey] = None
+        self._last_chunk: Optional[bytearray] = None
+
+        # Statistics
+        self.generated = 0
+        self.loaded_from_disk = 0
+        self.spills = 0
+        self.evictions = 0
+
+    @property
+    def resident_count(self) -> int:
+        """Number of chunks in memory."""
+        return len(self._chunks)
+
+    def resident_keys(self) -> List[ChunkKey]:
+        """Get the chunks in memory, least recently used first."""
+        return list(self._chunks)
+
+    def chunk_bounds(self, key: ChunkKey) -> Tuple[int, int, int, int]:
+        """Get a chunk's cells as (x0, y0, x1, y1), clipped to the grid."""
+        size = self.chunk_size
+        x0, y0 = key[0] * size, key[1] * size
+        return x0, y0, min(x0 + size, self.width), min(y0 + size, self.height)
+
+    def _spill_path(self, key: ChunkKey) -> str:
+        return os.path.join(self.spill_dir, f"{key[0]}_{key[1]}.chunk")
+
+    def chunk(self, key: ChunkKey) -> bytearray:
+        """Get a chunk's cells, loading it if needed."""
+        if key == self._last_key:
+            return self._last_chunk
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._load(key)
+        else:
+            self._chunks.move_to_end(key)
+        self._last_key, self._last_chunk = key, chunk
+        return chunk
+
+    def _load(self, key: ChunkKey) -> bytearray:
+        while len(self._chunks) >= self.max_resident:
+            self._evict()
+        if key in self._spilled:
+            with open(self._spill_path(key), "rb") as file:
+                chunk = bytearray(file.read())
+            self.loaded_from_disk += 1
+        else:
+            chunk = bytearray(self.source(key[0], key[1], self.chunk_size))
+            self.generated += 1
+        self._chunks[key] = chunk
+        if self.on_load is not None:
+            self.on_load(key, chunk)
+        return chunk
+
+    def _evict(self) -> None:
+        key, chunk = self._chunks.popitem(last=False)
+        if key == self._last_key:
+            self._last_key = self._last_chunk = None
+        if self.on_evict is not None:
+            self.on_evict(key, chunk)
+        if key in self._dirty:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="pacman_chunks_")
+                self._owns_spill_dir = True
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(self._spill_path(key), "wb") as file:
+                file.write(chunk)
+            self._dirty.discard(key)
+            self._spilled.add(key)
+            self.spills += 1
+        self.evictions += 1
+
+    def get(self, x: int, y: int) -> int:
+        """Get a cell value (the position must be inside the grid)."""
+        size = self.chunk_size
+        return self.chunk((x // size, y // size))[(y % size) * size + x % size]
+
+    def set(self, x: int, y: int, value: int) -> None:
+        """Set a cell value (the position must be inside the grid)."""
+        size = self.chunk_size
+        key = (x // size, y // size)
+        self.chunk(key)[(y % size) * size + x % size] = value
+        self._dirty.add(key)
+
+    def close(self) -> None:
+        """Drop every chunk and delete a temporary spill directory."""
+        self._chunks.clear()
+        self._dirty.clear()
+        self._spilled.clear()
+        self._last_key = self._last_chunk = None
+        if self._owns_spill_dir and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+            self._owns_spill_dir = False
+
+class _ChunkedRow:
+    """One row of a ChunkedGrid, indexable like a list."""
+
+    __slots__ = ('_store', '_y')
+
+    def __init__(self, store: ChunkStore, y: int):
+        self._store = store
+        self._y = y
+
+    def __len__(self) -> int:
+        return self._store.width
+
+    def __getitem__(self, x: int) -> int:
+        if not 0 <= x < self._store.width:
+            raise IndexError(x)
+        return self._store.get(x, self._y)
+
+    def __setitem__(self, x: int, value: int) -> None:
+        if not 0 <= x < self._store.width:
+            raise IndexError(x)
+        self._store.set(x, self._y, value)
+
+    def __iter__(self) -> Iterator[int]:
+        return (self._store.get(x, self._y) for x in range(self._store.width))
+
+class ChunkedGrid:
+    """
+    List-of-lists view of a ChunkStore.
+
+    grid[y][x] reads and writes go to the chunk holding the cell, so code
+    written against Maze.grid works unchanged; hot paths should call the
+    store directly to skip the row object.
+    """
+
+    def __init__(self, store: ChunkStore):
+        self.store = store
+
+    def __len__(self) -> int:
+        return self.store.height
+
+    def __getitem__(self, y: int) -> _ChunkedRow:
+        if not 0 <= y < self.store.height:
+            raise IndexError(y)
+        return _ChunkedRow(self.store, y)
+
+    def __iter__(self) -> Iterator[_ChunkedRow]:
+        return (_ChunkedRow(self.store, y) for y in range(self.store.height))
+
+class TiledMazeSource:
+    """
+    Deterministic chunk generator built from the lattice maze generators.
+
+    Every chunk is an independent maze seeded from (seed, chunk_x, chunk_y).
+    Chunks agree on one doorway per shared edge, derived from the edge's own
+    seed, so the lattices of neighbouring chunks join up. The world border,
+    the ghost house and the player starts are carved in world coordinates,
+    and open cells outside them get pellets as in Maze._add_pellets.
+    """
+
+    def __init__(self, width: int, height: int, generator: str = "braided", seed: int = 0):
+        """
+        Args:
+            width: World width in cells
+            height: World height in cells
+            generator: Lattice generator from maze_generators
+            seed: World seed
+        """
+        if generator not in LATTICE_GENERATORS:
+            raise ValueError(f"Chunked mazes need a lattice generator {LATTICE_GENERATORS}, "
+                             f"got '{generator}'")
+        self.width = width
+        self.height = height
+        self.generator = generator
+        self.seed = seed
+
+    def _door(self, kind: int, chunk_x: int, chunk_y: int, span: int) -> Optional[int]:
+        """
+        Odd offset of the doorway on an edge shared by two chunks.
+
+        Args:
+            span: In-world length of the edge; the door stays inside it and
+                off the world border
+
+        Returns:
+            The offset, or None if the edge has no room for a door
+        """
+        choices = (span - 1) // 2  # Odd offsets in [1, span - 2]
+        if choices <= 0:
+            return None
+        rng = np.random.default_rng([self.seed, kind, chunk_x, chunk_y])
+        return 1 + 2 * int(rng.integers(choices))
+
+    def _tile(self, chunk_x: int, chunk_y: int, size: int, width: int, height: int) -> np.ndarray:
+        """
+        Generate the cells of a chunk with width x height cells inside the world.
+
+        Inner chunks are generated one cell larger (the lattice needs an odd
+        side) and cropped, which only drops their closing border. Chunks
+        whose far edge is the world border, partial or not, are generated at
+        their in-world size instead, so the world border never overwrites a
+        lattice line; slivers too thin for a lattice are left open and join
+        their neighbours through the doors.
+        """
+        tile = np.full((size, size), WALL, dtype=np.uint8)
+        if width < MIN_SIZE or height < MIN_SIZE:
+            tile[:height, :width] = PATH
+            return tile
+        at_right_border = chunk_x * size + width >= self.width
+        at_bottom_border = chunk_y * size + height >= self.height
+        chunk_seed = np.random.SeedSequence([self.seed, chunk_x, chunk_y]).generate_state(1)[0]
+        generated = generate(self.generator, width if at_right_border else size + 1,
+                             height if at_bottom_border else size + 1, int(chunk_seed))
+        tile[:height, :width] = generated[:height, :width]
+        return tile
+
+    def __call__(self, chunk_x: int, chunk_y: int, size: int) -> bytes:
+        x0, y0 = chunk_x * size, chunk_y * size
+        # Cells of this chunk inside the world (the last row and column may be partial)
+        width = min(size, self.width - x0)
+        height = min(size, self.height - y0)
+        tile = self._tile(chunk_x, chunk_y, size, width, height)
+
+        # Doors on shared edges, kept inside the rows and columns both chunks have
+        right_width = min(size, self.width - x0 - size)
+        below_height = min(size, self.height - y0 - size)
+        doors = []
+        if chunk_x > 0:
+            doors.append((self._door(0, chunk_x, chunk_y, height), slice(0, 2), True))
+        if right_width > 0:
+            doors.append((self._door(0, chunk_x + 1, chunk_y, height), size - 1, True))
+        if chunk_y > 0:
+            doors.append((self._door(1, chunk_x, chunk_y, width), slice(0, 2), False))
+        if below_height > 0:
+            doors.append((self._door(1, chunk_x, chunk_y + 1, width), size - 1, False))
+        for door, span, vertical_edge in doors:
+            if door is None:
+                continue
+            if vertical_edge:
+                tile[door, span] = PATH
+            else:
+                tile[span, door] = PATH
+
+        def carve(left: int, top: int, right: int, bottom: int, value: int) -> None:
+            # Fill a world-coordinate rectangle (inclusive) where it overlaps the tile
+            left, right = max(left, x0) - x0, min(right, x0 + size - 1) - x0
+            top, bottom = max(top, y0) - y0, min(bottom, y0 + size - 1) - y0
+            if left <= right and top <= bottom:
+                tile[top:bottom + 1, left:right + 1] = value
+
+        end_x, end_y = self.width - 2, self.height - 2
+        center_x, center_y = self.width // 2, self.height // 2
+        carve(end_x - (1 - end_x % 2), end_y, end_x, end_y, PATH)
+        carve(end_x, end_y - (1 - end_y % 2), end_x, end_y, PATH)
+        carve(center_x - 2, center_y - 2, center_x + 2, center_y + 2, PATH)
+
+        # Pellets everywhere open except the ghost house and the player starts
+        pellets = tile == PATH
+        tile[pellets] = PELLET
+        carve(center_x - 2, center_y - 2, center_x + 2, center_y + 2, PATH)
+        for x, y in ((1, 1), (end_x, end_y)):
+            if x0 <= x < x0 + size and y0 <= y < y0 + size and tile[y - y0, x - x0] == PELLET:
+                tile[y - y0, x - x0] = PATH
+
+        carve(0, 0, self.width - 1, 0, WALL)
+        carve(0, 0, 0, self.height - 1, WALL)
+        carve(0, self.height - 1, self.width - 1, self.height - 1, WALL)
+        carve(self.width - 1, 0, self.width - 1, self.height - 1, WALL)
+        return tile.tobytes()
+
+class ChunkedMaze(Maze):
+    """
+    Maze whose cells live in a ChunkStore instead of a list of lists.
+
+    grid and original_grid are ChunkedGrid views, so everything that reads
+    maze.grid[y][x] or calls is_valid_position (A*, distance fields, ghosts,
+    rendering) works across chunk boundaries and only touches the chunks it
+    visits. pellet_positions holds the pellets of resident chunks; counts
+    cover every chunk seen so far. Whole-map indexes (connectivity, chaos
+    walls, corridor graph) still visit every cell, so avoid them on maps
+    that should stay mostly on disk.
+    """
+
+    # Whole-map tables would generate every chunk
+    flat_cells = False
+
+    def __init__(self, width: int, height: int, generator: str = "braided", seed: int = 0,
+                 chunk_size: int = 64, max_resident_chunks: int = 64,
+                 spill_dir: Optional[str] = None, chunk_source: Optional[ChunkSource] = None):
+        """
+        Initialize the maze; no chunk is generated until it is first used.
+
+        Args:
+            width: Maze width in cells
+            height: Maze height in cells
+            generator: Lattice generator used by the default chunk source
+            seed: World seed
+            chunk_size: Side of a chunk in cells (even)
+            max_resident_chunks: Most chunks kept in memory
+            spill_dir: Directory for evicted chunks (default: temporary)
+            chunk_source: Custom chunk generator (default: TiledMazeSource)
+        """
+        if chunk_size % 2 or chunk_size < 6:
+            raise ValueError(f"chunk_size must be even and at least 6, got {chunk_size}")
+        self.chunk_size = chunk_size
+        self.max_resident_chunks = max_resident_chunks
+        self.spill_dir = spill_dir
+        self.chunk_source = chunk_source or TiledMazeSource(width, height, generator, seed)
+        self.store: Optional[ChunkStore] = None
+        self._chunk_pellets: Dict[ChunkKey, int] = {}
+        super().__init__(width, height, generator=generator, seed=seed)
+
+    def generate_maze(self) -> None:
+        """Start from untouched chunks; nothing is generated yet."""
+        if self.store is not None:
+            self.store.close()
+        self.store = ChunkStore(self.width, self.height, self.chunk_source, self.chunk_size,
+                                self.max_resident_chunks, self.spill_dir,
+                                on_load=self._chunk_loaded, on_evict=self._chunk_evicted)
+        self.grid = ChunkedGrid(self.store)
+        # Originals are regenerated on demand and never spilled
+        self.original_grid = ChunkedGrid(ChunkStore(self.width, self.height, self.chunk_source,
+                                                    self.chunk_size, max_resident=4))
+        self.pellet_positions = set()
+        self._chunk_pellets = {}
+        self.total_pellets = 0
+        self._reset_journal()
+
+        if self._connectivity is not None:
+            self._connectivity.rebuild()
+        if self._chaos_planner is not None:
+            self._chaos_planner.rebuild_index()
+        if self._bitboards is not None:
+            self._bitboards.rebuild()
+
+    def _chunk_cells(self, key: ChunkKey, chunk: bytearray, value: int) -> List[Position]:
+        """Positions in a chunk holding value."""
+        size = self.chunk_size
+        x0, y0, x1, y1 = self.store.chunk_bounds(key)
+        cells = np.frombuffer(chunk, dtype=np.uint8).reshape(size, size)[:y1 - y0, :x1 - x0]
+        ys, xs = np.nonzero(cells == value)
+        return list(zip((xs + x0).tolist(), (ys + y0).tolist()))
+
+    def _chunk_loaded(self, key: ChunkKey, chunk: bytearray) -> None:
+        pellets = self._chunk_cells(key, chunk, PELLET)
+        self.pellet_positions.update(pellets)
+        if key not in self._chunk_pellets:
+            self.total_pellets += len(pellets)
+        self._chunk_pellets[key] = len(pellets)
+
+    def _chunk_evicted(self, key: ChunkKey, chunk: bytearray) -> None:
+        self.pellet_positions.difference_update(self._chunk_cells(key, chunk, PELLET))
+
+    def is_valid_position(self, x: int, y: int) -> bool:
+        """Check if a position is within bounds and not a wall."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return self.store.get(x, y) != WALL
+
+    def is_wall(self, x: int, y: int) -> bool:
+        """Check if a position is a wall."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        return self.store.get(x, y) == WALL
+
+    def set_cell(self, x: int, y: int, value: int) -> None:
+        """Change a single cell, keeping the per-chunk pellet counts in step."""
+        old_value = self.store.get(x, y)
+        if old_value != value:
+            key = (x // self.chunk_size, y // self.chunk_size)
+            if old_value == PELLET:
+                self.pellet_positions.discard((x, y))
+                self._chunk_pellets[key] -= 1
+            if value == PELLET:
+                self.pellet_positions.add((x, y))
+                self._chunk_pellets[key] += 1
+        super().set_cell(x, y, value)
+
+    def collect_pellet(self, x: int, y: int) -> bool:
+        """Collect a pellet at the given position."""
+        if not (0 <= x < self.width and 0 <= y < self.height) or self.store.get(x, y) != PELLET:
+            return False
+        self.set_cell(x, y, CellType.EMPTY.value)
+        return True
+
+    def get_pellet_count(self) -> int:
+        """Get the number of pellets left in every chunk seen so far."""
+        return sum(self._chunk_pellets.values())
+
+    def _respawn_candidates(self) -> List[Position]:
+        """Empty cells in resident chunks, outside the starts and ghost house."""
+        center_x, center_y = self.width // 2, self.height // 2
+        starts = self.get_player_starting_positions()
+        return [(x, y) for key in self.store.resident_keys()
+                for x, y in self._chunk_cells(key, self.store.chunk(key), CellType.EMPTY.value)
+                if (x, y) not in starts and
+                not (abs(x - center_x) <= 2 and abs(y - center_y) <= 2)]
+
+    def restore_original_maze(self) -> None:
+        """Restore changed cells to their original values, keeping pellets eaten."""
+        self.temporary_modifications.clear()
+        for (x, y), value in list(self._original_values.items()):
+            if value == PELLET and self.store.get(x, y) != PELLET:
+                value = CellType.EMPTY.value
+            self.set_cell(x, y, value)
+
+    def close(self) -> None:
+        """Release the chunks and any temporary spill files."""
+        self.store.close()
+        self.original_grid.store.close()
@@ -0,0 +1,264 @@
+"""
+Connectivity index for Pacman Smash.
+Keeps the connected components of the open maze cells in a labelled
+disjoint-set so reachability checks are near O(1).
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Position = Tuple[int, int]
+
+class ConnectivityIndex:
+    """
+    Connected components of the open cells of a maze.
+
+    Every open cell carries a label and labels are merged in a disjoint-set
+    forest, so the component of a cell is find(label). Opening a wall merges
+    the labels around it in O(alpha). Closing a cell may split a component;
+    the pieces are found by BFS searches run in lockstep from the cell's open
+    neighbours. Searches that meet are merged, and the search that runs dry
+    first is the smallest piece, so only that piece is relabelled. When the
+    closed cell sat on a loop the searches meet quickly and nothing is
+    relabelled at all.
+
+    The maze is only used through is_valid_position, width, height and its
+    cell listener, so the index has no import dependency on the maze module.
+    """
+
+    def __init__(self, maze):
+        """
+        Initialize the index and start following wall changes.
+
+        Args:
+            maze: Maze to index
+        """
+        self.maze = maze
+        self.width = maze.width
+        self._labels: List[int] = []  # Flat cell index -> label (-1 for walls)
+        self._parent: List[int] = []  # Label -> parent label
+        self._size: List[int] = []  # Root label -> cells in the component
+        self.component_count = 0
+
+        # Statistics
+        self.merges = 0
+        self.splits = 0
+        self.relabelled_cells = 0
+
+        self.rebuild()
+        maze.add_cell_listener(self._on_cell_changed)
+
+    def detach(self) -> None:
+        """Stop following maze changes."""
+        self.maze.remove_cell_listener(self._on_cell_changed)
+
+    def rebuild(self) -> None:
+        """Label every component from scratch (e.g. after a new maze is generated)."""
+        maze = self.maze
+        self._labels = [-1] * (maze.width * maze.height)
+        self._parent = []
+        self._size = []
+        self.component_count = 0
+        for y in range(maze.height):
+            for x in range(maze.width):
+                if maze.is_valid_position(x, y) and self._labels[y * self.width + x] < 0:
+                    self._label_flood((x, y))
+
+    def _new_label(self, size: int) -> int:
+        label = len(self._parent)
+        self._parent.append(label)
+        self._size.append(size)
+        self.component_count += 1
+        return label
+
+    def _label_flood(self, start: Position) -> None:
+        """Give every cell reachable from start one new label."""
+        label = self._new_label(0)
+        labels = self._labels
+        width = self.width
+        labels[start[1] * width + start[0]] = label
+        queue = deque([start])
+        count = 0
+        while queue:
+            x, y = queue.popleft()
+            count += 1
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if self.maze.is_valid_position(nx, ny) and labels[ny * width + nx] < 0:
+                    labels[ny * width + nx] = label
+                    queue.append((nx, ny))
+        self._size[label] = count
+
+    def _find(self, label: int) -> int:
+        parent = self._parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]  # Path halving
+            label = parent[label]
+        return label
+
+    def _union(self, a: int, b: int) -> int:
+        """Merge two components by size; returns the surviving root."""
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return a
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        self.component_count -= 1
+        self.merges += 1
+        return a
+
+    def _open_neighbours(self, x: int, y: int) -> List[Position]:
+        return [(nx, ny) for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                if self.maze.is_valid_position(nx, ny)]
+
+    def _on_cell_changed(self, x: int, y: int, old_value: int, new_value: int) -> None:
+        was_open = self._labels[y * self.width + x] >= 0
+        is_open = self.maze.is_valid_position(x, y)
+        if was_open == is_open:
+            return  # Pellets and power-ups do not change connectivity
+        if is_open:
+            self._open_cell(x, y)
+        else:
+            self._close_cell(x, y)
+
+    def _open_cell(self, x: int, y: int) -> None:
+        """Merge the components around a cell that stopped being a wall."""
+        label = self._new_label(1)
+        self._labels[y * self.width + x] = label
+        for nx, ny in self._open_neighbours(x, y):
+            label = self._union(label, self._labels[ny * self.width + nx])
+
+    def _close_cell(self, x: int, y: int) -> None:
+        """Remove a cell that became a wall and split its component if needed."""
+        root = self._find(self._labels[y * self.width + x])
+        self._labels[y * self.width + x] = -1
+        self._size[root] -= 1
+
+        neighbours = self._open_neighbours(x, y)
+        if not neighbours:
+            self.component_count -= 1
+            return
+        for piece in self._cut_pieces((x, y), neighbours):
+            self._split_off(root, piece)
+
+    def _cut_pieces(self, blocked: Position, neighbours: List[Position]) -> List[List[Position]]:
+        """
+        Find the pieces a component falls into without the blocked cell.
+
+        One BFS per open neighbour runs in lockstep; searches that meet are
+        merged and continue as one. A search that runs dry while others are
+        still going is a separate piece, and never a larger one than the rest.
+
+        Returns:
+            The cells of every piece except the one still searching at the end
+        """
+        if len(neighbours) < 2:
+            return []
+
+        # owner maps visited cells to their search; merged searches point at the survivor
+        owner: Dict[Position, int] = {blocked: -1}
+        group = list(range(len(neighbours)))
+        queues: Dict[int, deque] = {}
+        visited: Dict[int, List[Position]] = {}
+        for search, cell in enumerate(neighbours):
+            owner[cell] = search
+            queues[search] = deque([cell])
+            visited[search] = [cell]
+
+        def find_group(search: int) -> int:
+            while group[search] != search:
+                search = group[search]
+            return search
+
+        pieces = []
+        active = list(queues)
+        while len(active) > 1:
+            for search in list(active):
+                if search not in queues:
+                    continue  # Merged into another search this round
+                queue = queues[search]
+                if not queue:
+                    active.remove(search)
+                    pieces.append(visited.pop(search))
+                    del queues[search]
+                    if len(active) == 1:
+                        break
+                    continue
+
+                cx, cy = queue.popleft()
+                for cell in self._open_neighbours(cx, cy):
+                    other = owner.get(cell)
+                    if other is None:
+                        owner[cell] = search
+                        queue.append(cell)
+                        visited[search].append(cell)
+                        continue
+                    if other < 0:
+                        continue  # The blocked cell
+                    other = find_group(other)
+                    if other != search:
+                        # The searches met: continue them as one
+                        group[other] = search
+                        queue.extend(queues.pop(other))
+                        visited[search].extend(visited.pop(other))
+                        active.remove(other)
+                if len(active) == 1:
+                    break
+        return pieces
+
+    def seals_in(self, cell: Position, occupants: Iterable[Position]) -> bool:
+        """
+        Check if walling up an open cell would trap any occupant.
+
+        An occupant is trapped when it stands on the cell or ends up in one
+        of the smaller pieces the cell's component would split into. The
+        maze is not modified.
+        """
+        component = self.component(cell)
+        if component is None:
+            return False
+        occupants = [pos for pos in occupants if self.component(pos) == component]
+        if not occupants:
+            return False
+        if cell in occupants:
+            return True
+        trapped = set()
+        for piece in self._cut_pieces(cell, self._open_neighbours(*cell)):
+            trapped.update(piece)
+        return any(pos in trapped for pos in occupants)
+
+    def _split_off(self, root: int, cells: List[Position]) -> None:
+        """Move a piece of a component under a new label."""
+        label = self._new_label(len(cells))
+        self._size[root] -= len(cells)
+        width = self.width
+        for x, y in cells:
+            self._labels[y * width + x] = label
+        self.splits += 1
+        self.relabelled_cells += len(cells)
+
+    def component(self, position: Position) -> Optional[int]:
+        """Get the id of a cell's component, or None for walls and out-of-bounds cells."""
+        x, y = position
+        if not (0 <= x < self.maze.width and 0 <= y < self.maze.height):
+            return None
+        label = self._labels[y * self.width + x]
+        return self._find(label) if label >= 0 else None
+
+    def component_size(self, position: Position) -> int:
+        """Get the number of open cells connected to a cell (0 for walls)."""
+        component = self.component(position)
+        return self._size[component] if component is not None else 0
+
+    def connected(self, a: Position, b: Position) -> bool:
+        """Check if two open cells are connected."""
+        component = self.component(a)
+        return component is not None and component == self.component(b)
+
+    def all_connected(self, start: Position, targets: Iterable[Position]) -> bool:
+        """Check if every target is connected to start."""
+        component = self.component(start)
+        if component is None:
+            return False
+        return all(self.component(target) == component for target in targets)
@@ -0,0 +1,175 @@
+"""
+Timed effect tracking for Pacman Smash.
+Keeps effects in expiry order and caches the stats they derive.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class EffectRule:
+    """How an effect kind modifies stats and stacks with itself."""
+    speed_multiplier: float = 1.0  # Applied once per active stack
+    freezes: bool = False
+    max_stacks: Optional[int] = None  # None = unlimited
+    refresh: bool = True  # At max stacks, extend the earliest-ending stack
+
+DEFAULT_RULE = EffectRule()
+
+@dataclass
+class ActiveEffect:
+    """A running instance of an effect."""
+    type: Hashable
+    duration: float
+    start_time: float
+    end_time: float = field(init=False)
+
+    def __post_init__(self):
+        self.end_time = self.start_time + self.duration
+
+    def is_expired(self) -> bool:
+        """Check if the effect has run out."""
+        return time.time() >= self.end_time
+
+    def remaining(self, current_time: float) -> float:
+        """Seconds left before the effect ends."""
+        return max(0.0, self.end_time - current_time)
+
+class EffectTracker:
+    """
+    Effects held in a min-heap keyed by end time.
+
+    Derived stats (speed multiplier, frozen) are cached and only recomputed when
+    an effect starts or ends. update() is O(1) when nothing is due, so per-frame
+    cost does not depend on how many effects are running.
+    """
+
+    def __init__(self, rules: Dict[Hashable, EffectRule]):
+        """
+        Initialize the tracker.
+
+        Args:
+            rules: Stacking and stat rules per effect kind
+        """
+        self.rules = rules
+        self._heap: List[Tuple[float, int, ActiveEffect]] = []
+        self._active: Dict[Hashable, List[ActiveEffect]] = {}
+        self._sequence = 0
+
+        # Cached derived stats
+        self.speed_multiplier = 1.0
+        self.frozen = False
+        self.next_expiry = float('inf')
+
+    def __len__(self) -> int:
+        return sum(len(stack) for stack in self._active.values())
+
+    def _push(self, effect: ActiveEffect) -> None:
+        """Schedule an effect's expiry (older entries for it become stale)."""
+        self._sequence += 1
+        heapq.heappush(self._heap, (effect.end_time, self._sequence, effect))
+        self.next_expiry = self._heap[0][0]
+
+    def _recompute_stats(self) -> None:
+        """Rebuild cached stats from the active stacks."""
+        speed_multiplier = 1.0
+        frozen = False
+        for kind, stack in self._active.items():
+            rule = self.rules.get(kind, DEFAULT_RULE)
+            speed_multiplier *= rule.speed_multiplier ** len(stack)
+            frozen = frozen or (rule.freezes and bool(stack))
+        self.speed_multiplier = speed_multiplier
+        self.frozen = frozen
+
+    def add(self, kind: Hashable, duration: float,
+            current_time: Optional[float] = None) -> ActiveEffect:
+        """
+        Start an effect, applying the kind's stacking rule.
+
+        Args:
+            kind: Effect kind (key into the rules)
+            duration: Seconds the effect lasts
+            current_time: Start time; defaults to now
+
+        Returns:
+            The new or refreshed effect instance
+        """
+        if current_time is None:
+            current_time = time.time()
+        rule = self.rules.get(kind, DEFAULT_RULE)
+        stack = self._active.setdefault(kind, [])
+
+        if rule.max_stacks is not None and len(stack) >= rule.max_stacks:
+            earliest = min(stack, key=lambda e: e.end_time)
+            if rule.refresh and current_time + duration > earliest.end_time:
+                # Stats are unchanged, only the expiry moves
+                earliest.start_time = current_time
+                earliest.duration = duration
+                earliest.end_time = current_time + duration
+                self._push(earliest)
+            return earliest
+
+        effect = ActiveEffect(kind, duration, current_time)
+        stack.append(effect)
+        self._push(effect)
+        self._recompute_stats()
+        return effect
+
+    def update(self, current_time: Optional[float] = None) -> List[ActiveEffect]:
+        """
+        Expire effects whose time is up.
+
+        Returns:
+            Effects that ended during this call
+        """
+        if current_time is None:
+            current_time = time.time()
+        if current_time < self.next_expiry:
+            return []
+
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= current_time:
+            end_time, _, effect = heapq.heappop(heap)
+            stack = self._active.get(effect.type)
+            # Skip entries superseded by a refresh or a removal
+            if end_time != effect.end_time or not stack or effect not in stack:
+                continue
+            stack.remove(effect)
+            if not stack:
+                del self._active[effect.type]
+            expired.append(effect)
+
+        self.next_expiry = heap[0][0] if heap else float('inf')
+        if expired:
+            self._recompute_stats()
+        return expired
+
+    def active(self, kind: Optional[Hashable] = None) -> List[ActiveEffect]:
+        """Get running effects, optionally of a single kind."""
+        if kind is not None:
+            return list(self._active.get(kind, []))
+        return [effect for stack in self._active.values() for effect in stack]
+
+    def count(self, kind: Hashable) -> int:
+        """Get the number of running stacks of a kind."""
+        return len(self._active.get(kind, ()))
+
+    def end_time(self, kind: Hashable) -> float:
+        """Get when the last stack of a kind ends (0.0 if none is running)."""
+        stack = self._active.get(kind)
+        return max(effect.end_time for effect in stack) if stack else 0.0
+
+    def remove(self, kind: Hashable) -> None:
+        """End all stacks of a kind immediately."""
+        if self._active.pop(kind, None):
+            self._recompute_stats()
+
+    def clear(self) -> None:
+        """End every effect."""
+        self._heap.clear()
+        self._active.clear()
+        self.next_expiry = float('inf')
+        self._recompute_stats()
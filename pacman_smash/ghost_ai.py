@@ -4,11 +4,17 @@ Handles ghost behavior, pathfinding, and adaptive targeting.
 """
 
 import pygame
+import heapq
 import random
 import time
-from typing import List, Tuple, Optional, Set
+from typing import Callable, Dict, List, Tuple, Optional, Set
 from enum import Enum
 from dataclasses import dataclass
+from pathfinding import PathCache
+from nav_graph import CorridorGraph
+
+# Mazes with at least this many cells use ghost level of detail by default
+LOD_CELLS = 10000
 
 class GhostBehavior(Enum):
     """Different behavior states for ghosts."""
@@ -42,7 +48,9 @@ class Ghost:
         self.color = color
         
         # Movement and behavior
-        self.speed_multiplier = 1.0
+        self.speed_multiplier = 1.0  # Effective multiplier (base x named modifiers)
+        self.base_speed_multiplier = 1.0
+        self.speed_modifiers: Dict[str, float] = {}
         self.behavior_state = GhostBehavior.NEUTRAL
         self.target_player: Optional[int] = None
         
@@ -57,6 +65,14 @@ class Ghost:
         # Coordination to prevent clustering
         self.preferred_distance_from_others = 3
         
+        # Owning manager, told when the move schedule changes
+        self.manager: Optional['GhostManager'] = None
+        
+        # Planned chase path (start to target) and the wall version it was planned on
+        self.path: Tuple[Tuple[int, int], ...] = ()
+        self.path_index = 0  # Index of the ghost's current cell in the path
+        self.path_version = -1
+        
     def set_behavior(self, behavior: GhostBehavior, duration: Optional[float] = None) -> None:
         """Set the ghost's behavior state."""
         self.behavior_state = behavior
@@ -69,15 +85,39 @@ class Ghost:
         self.target_player = player_id
     
     def set_speed_multiplier(self, multiplier: float) -> None:
-        """Adjust the ghost's movement speed."""
-        self.speed_multiplier = max(0.1, min(3.0, multiplier))  # Clamp between 0.1 and 3.0
+        """Adjust the ghost's base movement speed."""
+        self.base_speed_multiplier = multiplier
+        self._update_speed_multiplier()
+    
+    def set_speed_modifier(self, name: str, factor: float) -> None:
+        """Apply a named speed factor; setting the same name again replaces it."""
+        self.speed_modifiers[name] = factor
+        self._update_speed_multiplier()
+    
+    def clear_speed_modifier(self, name: str) -> None:
+        """Remove a named speed factor."""
+        if self.speed_modifiers.pop(name, None) is not None:
+            self._update_speed_multiplier()
+    
+    def _update_speed_multiplier(self) -> None:
+        """Recompute the effective speed from the base and named modifiers."""
+        multiplier = self.base_speed_multiplier
+        for factor in self.speed_modifiers.values():
+            multiplier *= factor
+        multiplier = max(0.1, min(3.0, multiplier))  # Clamp between 0.1 and 3.0
+        if multiplier == self.speed_multiplier:
+            return  # e.g. a balancing pass re-applying the same speed
+        self.speed_multiplier = multiplier
+        if self.manager is not None:
+            self.manager.reschedule(self)
     
     def can_move(self) -> bool:
         """Check if enough time has passed since last move."""
-        current_time = time.time()
-        time_since_move = current_time - self.last_move_time
-        move_interval = self.move_cooldown / self.speed_multiplier
-        return time_since_move >= move_interval
+        return time.time() >= self.next_move_time()
+    
+    def next_move_time(self) -> float:
+        """Get the earliest time the ghost may move again."""
+        return self.last_move_time + self.move_cooldown / self.speed_multiplier
     
     def is_confused(self) -> bool:
         """Check if the ghost is currently confused."""
@@ -86,6 +126,12 @@ class Ghost:
     
     def get_valid_moves(self, maze_grid: List[List[int]]) -> List[Tuple[int, int]]:
         """Get all valid adjacent positions the ghost can move to."""
+        maze = self.manager.maze if self.manager is not None else None
+        if maze is not None and maze.grid is maze_grid and maze.flat_cells:
+            # Precomputed neighbour indices and shared position tuples
+            positions = maze.cell_positions
+            return [positions[cell] for cell in maze.neighbours[maze.cell_index(*self.position)]]
+        
         x, y = self.position
         valid_moves = []
         
@@ -127,6 +173,52 @@ class Ghost:
         
         return best_move
     
+    def follow_path(self, valid_moves: List[Tuple[int, int]], target_position: Tuple[int, int],
+                    path_cache: PathCache) -> Optional[Tuple[int, int]]:
+        """
+        Get the next step of a wall-correct chase path.
+        
+        The current path is kept while the ghost is on it and the target is
+        still somewhere along it (the path is cut short at the target);
+        otherwise a new path is planned. Wall changes only patch the blocked
+        stretches of the remaining path.
+        
+        Returns:
+            The next cell, or None if no usable path step is available
+        """
+        path = self.path
+        index = self.path_index
+        on_path = index < len(path) - 1 and path[index] == self.position
+        if on_path and self.path_version != path_cache.maze.wall_version:
+            remaining = path_cache.update_path(path[index:], self.path_version)
+            on_path = remaining is not None and len(remaining) > 1
+            if on_path:
+                self.path = path = remaining
+                self.path_index = index = 0
+                self.path_version = path_cache.maze.wall_version
+        if on_path and path[-1] != target_position:
+            try:
+                target_index = path.index(target_position, index + 1)
+            except ValueError:
+                on_path = False
+            else:
+                self.path = path = path[:target_index + 1]
+        
+        if not on_path:
+            planned = path_cache.find_path(self.position, target_position)
+            if planned is None or len(planned) < 2:
+                self.path = ()
+                return None
+            self.path = path = planned
+            self.path_index = index = 0
+            self.path_version = path_cache.maze.wall_version
+        
+        next_position = path[index + 1]
+        if next_position not in valid_moves:
+            return None  # Blocked (e.g. by clustering avoidance); replanned next move
+        self.path_index = index + 1
+        return next_position
+    
     def choose_random_move(self, valid_moves: List[Tuple[int, int]]) -> Tuple[int, int]:
         """Choose a random valid move."""
         if not valid_moves:
@@ -157,10 +249,15 @@ class Ghost:
         return filtered_moves if filtered_moves else valid_moves
     
     def update(self, maze_grid: List[List[int]], players: List, 
-               other_ghosts: List['Ghost']) -> None:
-        """Update ghost AI and movement."""
+               other_ghosts: List['Ghost']) -> bool:
+        """
+        Update ghost AI and movement.
+        
+        Returns:
+            True if the ghost moved
+        """
         if not self.can_move():
-            return
+            return False
         
         # Update confusion state
         if self.is_confused():
@@ -170,7 +267,7 @@ class Ghost:
         
         valid_moves = self.get_valid_moves(maze_grid)
         if not valid_moves:
-            return
+            return False
         
         # Apply clustering avoidance
         valid_moves = self.avoid_clustering(valid_moves, other_ghosts)
@@ -190,7 +287,12 @@ class Ghost:
                     break
             
             if target_position:
-                new_position = self.choose_chase_move(valid_moves, target_position)
+                path_cache = self.manager.path_cache if self.manager is not None else None
+                new_position = None
+                if path_cache is not None:
+                    new_position = self.follow_path(valid_moves, target_position, path_cache)
+                if new_position is None:
+                    new_position = self.choose_chase_move(valid_moves, target_position)
             else:
                 new_position = self.choose_random_move(valid_moves)
         
@@ -224,6 +326,70 @@ class Ghost:
             # Limit history size
             if len(self.path_history) > 10:
                 self.path_history.pop(0)
+            return True
+        
+        return False
+    
+    def coarse_update(self, maze_grid: List[List[int]], players: List, steps: int) -> bool:
+        """
+        Cheap update for ghosts far from every player.
+        
+        Moves several cells in one tick. Chasers keep stepping along their
+        wall-correct chase path, like the full update; other ghosts follow
+        the current corridor and pick a random branch at junctions. No
+        clustering checks.
+        
+        Returns:
+            True if the ghost moved
+        """
+        if not self.can_move():
+            return False
+        
+        target_position = None
+        if self.behavior_state == GhostBehavior.CHASE and self.target_player is not None:
+            for player in players:
+                if player.player_id == self.target_player:
+                    target_position = player.position
+                    break
+        path_cache = self.manager.path_cache if self.manager is not None else None
+        
+        previous = self.path_history[-1] if self.path_history else None
+        start = self.position
+        for _ in range(steps):
+            valid_moves = self.get_valid_moves(maze_grid)
+            if not valid_moves:
+                break
+            
+            # Don't turn back unless at a dead end
+            options = [move for move in valid_moves if move != previous] or valid_moves
+            new_position = None
+            if target_position is not None and path_cache is not None:
+                new_position = self.follow_path(valid_moves, target_position, path_cache)
+            if new_position is None:
+                if len(options) == 1:
+                    new_position = options[0]
+                elif target_position is not None:
+                    new_position = self.choose_chase_move(options, target_position)
+                else:
+                    # Keep heading straight through junctions when possible
+                    if previous is not None:
+                        straight = (2 * self.position[0] - previous[0],
+                                    2 * self.position[1] - previous[1])
+                        if straight in options and random.random() < 0.5:
+                            options = [straight]
+                    new_position = self.choose_random_move(options)
+            
+            previous = self.position
+            self.path_history.append(self.position)
+            self.position = new_position
+        
+        if len(self.path_history) > 10:
+            del self.path_history[:-10]
+        
+        if self.position == start:
+            return False
+        self.last_move_time = time.time()
+        return True
     
     def check_collision_with_player(self, player) -> bool:
         """Check if ghost collides with a player."""
@@ -254,13 +420,75 @@ class Ghost:
 class GhostManager:
     """Manages multiple ghosts and their coordination."""
     
-    def __init__(self):
-        """Initialize the ghost manager."""
+    def __init__(self, maze=None, lod_distance: Optional[int] = None, coarse_steps: int = 2,
+                 nav_graph: Optional[CorridorGraph] = None):
+        """
+        Initialize the ghost manager.
+        
+        Args:
+            maze: Maze the ghosts move in; lets the level-of-detail area be
+                cached until walls change
+            lod_distance: Path distance from the nearest player beyond which
+                ghosts use the coarse update (None = always full AI; see
+                lod_distance_for for a size-based default)
+            coarse_steps: Cells a far ghost moves per coarse tick (it ticks
+                this many times less often)
+            nav_graph: Corridor graph to plan chase paths on (built from the
+                maze when not given)
+        """
         self.ghosts: List[Ghost] = []
         
+        # Shared chase path planner (needs the maze)
+        if nav_graph is None and maze is not None:
+            nav_graph = CorridorGraph(maze)
+        self.nav_graph = nav_graph
+        self.path_cache = PathCache(maze, graph=nav_graph) if maze is not None else None
+        
+        # Level of detail
+        self.maze = maze
+        self.lod_distance = lod_distance
+        self.coarse_steps = max(1, coarse_steps)
+        self._near_cells: Optional[Set[Tuple[int, int]]] = None
+        self._near_key = None
+        self.full_updates = 0
+        self.coarse_updates = 0
+        
+        # Ghosts keyed by next move time; entries superseded by a reschedule are skipped
+        self._move_queue: List[Tuple[float, int, Ghost]] = []
+        self._queue_entry: Dict[Ghost, int] = {}
+        self._sequence = 0
+        self.retry_delay = 0.05  # Wait before retrying a ghost that could not move
+        # Called with the new earliest due time when a re-key moves it earlier
+        self.on_earlier_move: Optional[Callable[[float], None]] = None
+        
     def add_ghost(self, ghost: Ghost) -> None:
         """Add a ghost to the manager."""
         self.ghosts.append(ghost)
+        ghost.manager = self
+        self.reschedule(ghost)
+    
+    def reschedule(self, ghost: Ghost, due: Optional[float] = None) -> None:
+        """Re-key a ghost in the move queue (defaults to its next move time)."""
+        if due is None:
+            due = ghost.next_move_time()
+        if self.on_earlier_move is not None and due < self.next_move_time():
+            self.on_earlier_move(due)
+        self._sequence += 1
+        self._queue_entry[ghost] = self._sequence
+        heapq.heappush(self._move_queue, (due, self._sequence, ghost))
+        if len(self._move_queue) > 2 * len(self._queue_entry):
+            self._compact_queue()
+    
+    def _compact_queue(self) -> None:
+        """Drop superseded entries once they outnumber the live ones."""
+        entry = self._queue_entry
+        self._move_queue = [item for item in self._move_queue if entry.get(item[2]) == item[1]]
+        heapq.heapify(self._move_queue)
+    
+    def reschedule_all(self) -> None:
+        """Re-key every ghost, e.g. after move timers were changed directly."""
+        for ghost in self.ghosts:
+            self.reschedule(ghost)
     
     def create_default_ghosts(self, maze_width: int, maze_height: int) -> None:
         """Create a default set of ghosts."""
@@ -287,10 +515,91 @@ class GhostManager:
             ghost = Ghost(i, pos, color)
             self.add_ghost(ghost)
     
-    def update_all(self, maze_grid: List[List[int]], players: List) -> None:
-        """Update all ghosts."""
-        for ghost in self.ghosts:
-            ghost.update(maze_grid, players, self.ghosts)
+    def update_all(self, maze_grid: List[List[int]], players: List,
+                   current_time: Optional[float] = None) -> int:
+        """
+        Update the ghosts that are due to move.
+        
+        Returns:
+            Number of ghosts processed
+        """
+        if current_time is None:
+            current_time = time.time()
+        
+        due_ghosts = []
+        queue = self._move_queue
+        while queue and queue[0][0] <= current_time:
+            _, sequence, ghost = heapq.heappop(queue)
+            if self._queue_entry.get(ghost) == sequence:
+                due_ghosts.append(ghost)
+        
+        near_cells = self.get_near_cells(maze_grid, players) if due_ghosts else None
+        
+        for ghost in due_ghosts:
+            if near_cells is None or ghost.position in near_cells:
+                self.full_updates += 1
+                moved = ghost.update(maze_grid, players, self.ghosts)
+                interval_steps = 1
+            else:
+                self.coarse_updates += 1
+                moved = ghost.coarse_update(maze_grid, players, self.coarse_steps)
+                interval_steps = self.coarse_steps
+            
+            if moved:
+                interval = ghost.move_cooldown / ghost.speed_multiplier
+                self.reschedule(ghost, ghost.last_move_time + interval * interval_steps)
+            else:
+                # Blocked, or its timer has not quite run out yet
+                self.reschedule(ghost, max(ghost.next_move_time(),
+                                           current_time + self.retry_delay))
+        return len(due_ghosts)
+    
+    def get_near_cells(self, maze_grid: List[List[int]],
+                       players: List) -> Optional[Set[Tuple[int, int]]]:
+        """
+        Get the cells within lod_distance steps of any player.
+        
+        A bounded multi-source BFS, so its cost depends on the area around the
+        players rather than the map size. Cached until a player moves or (when
+        the manager knows the maze) a wall changes.
+        
+        Returns:
+            The set of cells, or None when level of detail is disabled
+        """
+        if self.lod_distance is None:
+            return None
+        
+        positions = tuple(player.position for player in players)
+        key = (positions, self.maze.wall_version) if self.maze is not None else None
+        if key is not None and key == self._near_key:
+            return self._near_cells
+        
+        height = len(maze_grid)
+        width = len(maze_grid[0]) if height else 0
+        near = set(positions)
+        frontier = list(near)
+        for _ in range(self.lod_distance):
+            next_frontier = []
+            for x, y in frontier:
+                for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                    if (0 <= nx < width and 0 <= ny < height and
+                            (nx, ny) not in near and maze_grid[ny][nx] != 1):
+                        near.add((nx, ny))
+                        next_frontier.append((nx, ny))
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        
+        self._near_cells = near
+        self._near_key = key
+        return near
+    
+    def next_move_time(self) -> float:
+        """Get the earliest time any ghost is due (inf with no ghosts)."""
+        queue = self._move_queue
+        while queue and self._queue_entry.get(queue[0][2]) != queue[0][1]:
+            heapq.heappop(queue)
+        return queue[0][0] if queue else float('inf')
     
     def check_collisions(self, players: List) -> List[Tuple[Ghost, any]]:
         """Check for collisions between ghosts and players."""
@@ -323,4 +632,15 @@ class GhostManager:
                    offset_x: int = 0, offset_y: int = 0) -> None:
         """Render all ghosts."""
         for ghost in self.ghosts:
-            ghost.render(screen, cell_size, offset_x, offset_y)
\ No newline at end of file
+            ghost.render(screen, cell_size, offset_x, offset_y)
+
+def lod_distance_for(maze, distance: int = 12, lod_cells: int = LOD_CELLS) -> Optional[int]:
+    """
+    Get the ghost level-of-detail distance suited to a maze's size.
+    
+    Small mazes keep the full AI for every ghost; mazes with at least
+    lod_cells cells switch far ghosts to the coarse update.
+    """
+    if maze.width * maze.height >= lod_cells:
+        return distance
+    return None
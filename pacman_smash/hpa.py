@@ -0,0 +1,436 @@
+"""
+Hierarchical pathfinding (HPA*) for Pacman Smash.
+Splits large mazes into square clusters joined by entrances, searches the
+small abstract graph of entrances first and refines it into cells lazily.
+"""
+
+import heapq
+from collections import deque
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from maze import Maze, CellType
+from nav_graph import CorridorGraph
+from pathfinding import astar, manhattan
+
+Position = Tuple[int, int]
+Cluster = Tuple[int, int]
+
+# Mazes with at least this many cells are routed hierarchically
+HIERARCHICAL_CELLS = 40000
+
+class HierarchicalPathfinder:
+    """
+    Two-level route planner over a maze grid.
+
+    Every border between two neighbouring clusters is scanned for runs of
+    open cell pairs; each run becomes one entrance (two for long runs) whose
+    cells are abstract nodes. Inside a cluster the entrance-to-entrance
+    distances are precomputed with a BFS that never leaves the cluster.
+
+    A query links the start and goal into their clusters, runs A* on the
+    abstract graph and expands each abstract hop into cells only when the
+    route reaches it. Routes are near-shortest rather than exact.
+
+    Wall changes only mark the clusters (and borders) they touch; those are
+    recomputed on the next query and the rest of the map is left alone.
+    """
+
+    def __init__(self, maze: Maze, cluster_size: int = 16, long_entrance: int = 6):
+        """
+        Initialize the pathfinder and precompute every cluster.
+
+        Args:
+            maze: Maze to plan on
+            cluster_size: Width and height of a cluster in cells
+            long_entrance: Entrance runs at least this long get a node at
+                each end instead of one in the middle
+        """
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.long_entrance = long_entrance
+        self.clusters_x = (maze.width + cluster_size - 1) // cluster_size
+        self.clusters_y = (maze.height + cluster_size - 1) // cluster_size
+
+        # (cluster, neighbour to the right or below) -> [(cell, partner cell)]
+        self._borders: Dict[Tuple[Cluster, Cluster], List[Tuple[Position, Position]]] = {}
+        self._partners: Dict[Position, Set[Position]] = {}
+        # cluster -> node -> {other node in the cluster: distance}
+        self._intra: Dict[Cluster, Dict[Position, Dict[Position, int]]] = {}
+        self._dirty_clusters: Set[Cluster] = set()
+        self._dirty_borders: Set[Tuple[Cluster, Cluster]] = set()
+
+        # Statistics
+        self.clusters_rebuilt = 0
+
+        for border in self._all_borders():
+            self._scan_border(border)
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                self._build_cluster((cx, cy))
+        self.clusters_rebuilt = 0
+        maze.add_cell_listener(self._on_cell_changed)
+
+    def detach(self) -> None:
+        """Stop following maze changes."""
+        self.maze.remove_cell_listener(self._on_cell_changed)
+
+    def cluster_of(self, cell: Position) -> Cluster:
+        """Get the cluster containing a cell."""
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def _bounds(self, cluster: Cluster) -> Tuple[int, int, int, int]:
+        """Get a cluster's cell bounds as (x0, y0, x1, y1), exclusive at the end."""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return x0, y0, min(x0 + size, self.maze.width), min(y0 + size, self.maze.height)
+
+    def _all_borders(self) -> Iterator[Tuple[Cluster, Cluster]]:
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    yield ((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.clusters_y:
+                    yield ((cx, cy), (cx, cy + 1))
+
+    def _on_cell_changed(self, x: int, y: int, old_value: int, new_value: int) -> None:
+        wall = CellType.WALL.value
+        if (old_value == wall) == (new_value == wall):
+            return  # Pellets and power-ups do not change routes
+        cluster = self.cluster_of((x, y))
+        self._dirty_clusters.add(cluster)
+        # Cells on a cluster edge also change the entrances of that border
+        cx, cy = cluster
+        size = self.cluster_size
+        if x % size == 0 and cx > 0:
+            self._dirty_borders.add(((cx - 1, cy), cluster))
+        if x % size == size - 1 and cx + 1 < self.clusters_x:
+            self._dirty_borders.add((cluster, (cx + 1, cy)))
+        if y % size == 0 and cy > 0:
+            self._dirty_borders.add(((cx, cy - 1), cluster))
+        if y % size == size - 1 and cy + 1 < self.clusters_y:
+            self._dirty_borders.add((cluster, (cx, cy + 1)))
+
+    def _scan_border(self, border: Tuple[Cluster, Cluster]) -> None:
+        """Find the entrances across one border and link their cells."""
+        for cell, partner in self._borders.pop(border, ()):
+            self._partners[cell].discard(partner)
+            self._partners[partner].discard(cell)
+
+        first, second = border
+        x0, y0, x1, y1 = self._bounds(first)
+        if second[0] > first[0]:
+            # Vertical border: pair the last column with the next cluster's first
+            pairs = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+        else:
+            pairs = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+
+        is_valid = self.maze.is_valid_position
+        transitions = []
+        run: List[Tuple[Position, Position]] = []
+        for pair in pairs + [None]:
+            if pair is not None and is_valid(*pair[0]) and is_valid(*pair[1]):
+                run.append(pair)
+                continue
+            if run:
+                if len(run) >= self.long_entrance:
+                    transitions.extend((run[0], run[-1]))
+                else:
+                    transitions.append(run[len(run) // 2])
+                run = []
+
+        self._borders[border] = transitions
+        for cell, partner in transitions:
+            self._partners.setdefault(cell, set()).add(partner)
+            self._partners.setdefault(partner, set()).add(cell)
+
+    def _cluster_nodes(self, cluster: Cluster) -> Set[Position]:
+        """Get the entrance cells on a cluster's side of its borders."""
+        cx, cy = cluster
+        nodes = set()
+        for border, side in ((((cx - 1, cy), cluster), 1), (((cx, cy - 1), cluster), 1),
+                             ((cluster, (cx + 1, cy)), 0), ((cluster, (cx, cy + 1)), 0)):
+            for pair in self._borders.get(border, ()):
+                nodes.add(pair[side])
+        return nodes
+
+    def _local_distances(self, source: Position, cluster: Cluster) -> Dict[Position, int]:
+        """BFS distances from source to every cell reachable inside a cluster."""
+        x0, y0, x1, y1 = self._bounds(cluster)
+        grid = self.maze.grid
+        wall = CellType.WALL.value
+        distances = {source: 0}
+        queue = deque([source])
+        while queue:
+            x, y = queue.popleft()
+            next_distance = distances[(x, y)] + 1
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if (x0 <= nx < x1 and y0 <= ny < y1 and grid[ny][nx] != wall and
+                        (nx, ny) not in distances):
+                    distances[(nx, ny)] = next_distance
+                    queue.append((nx, ny))
+        return distances
+
+    def _build_cluster(self, cluster: Cluster) -> None:
+        """Precompute the distances between a cluster's entrance nodes."""
+        nodes = self._cluster_nodes(cluster)
+        edges: Dict[Position, Dict[Position, int]] = {}
+        for node in nodes:
+            distances = self._local_distances(node, cluster)
+            edges[node] = {other: distances[other] for other in nodes
+                           if other != node and other in distances}
+        self._intra[cluster] = edges
+        self.clusters_rebuilt += 1
+
+    def _sync(self) -> None:
+        """Recompute the borders and clusters touched by wall changes."""
+        if not self._dirty_clusters and not self._dirty_borders:
+            return
+        for border in self._dirty_borders:
+            self._scan_border(border)
+            self._dirty_clusters.update(border)  # Both sides gain or lose nodes
+        for cluster in self._dirty_clusters:
+            self._build_cluster(cluster)
+        self._dirty_borders.clear()
+        self._dirty_clusters.clear()
+
+    def waypoints(self, start: Position, goal: Position) -> Optional[List[Position]]:
+        """
+        Search the abstract graph for the entrances a route passes through.
+
+        Returns:
+            Cells from start to goal where each consecutive pair is either
+            adjacent across a border or inside one cluster, or None if the
+            goal is unreachable
+        """
+        found = self._abstract_route(start, goal)
+        return None if found is None else found[0]
+
+    def _abstract_route(self, start: Position,
+                        goal: Position) -> Optional[Tuple[List[Position], List[int]]]:
+        """A* over the abstract graph; returns the waypoints and their steps from start."""
+        self._sync()
+        is_valid = self.maze.is_valid_position
+        if not is_valid(*start) or not is_valid(*goal):
+            return None
+        if start == goal:
+            return [start], [0]
+
+        # Link the start and goal into the abstract graph of their clusters
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        start_field = self._local_distances(start, start_cluster)
+        start_edges = {node: start_field[node] for node in self._cluster_nodes(start_cluster)
+                       if node in start_field and node != start}
+        if goal in start_field:
+            start_edges[goal] = start_field[goal]
+        goal_field = self._local_distances(goal, goal_cluster)
+        goal_edges = {node: goal_field[node] for node in self._cluster_nodes(goal_cluster)
+                      if node in goal_field}
+
+        costs = {start: 0}
+        came_from: Dict[Position, Optional[Position]] = {start: None}
+        # (f, -cost, node): ties prefer nodes further along, which matters on open maps
+        heap = [(manhattan(start, goal), 0, start)]
+        while heap:
+            _, negative_cost, node = heapq.heappop(heap)
+            cost = -negative_cost
+            if node == goal:
+                route = []
+                while node is not None:
+                    route.append(node)
+                    node = came_from[node]
+                route.reverse()
+                return route, [costs[node] for node in route]
+            if cost > costs[node]:
+                continue  # Stale heap entry
+
+            if node == start:
+                edges = list(start_edges.items())
+            else:
+                edges = list(self._intra[self.cluster_of(node)].get(node, {}).items())
+                if node in goal_edges:
+                    edges.append((goal, goal_edges[node]))
+            edges.extend((partner, 1) for partner in self._partners.get(node, ()))
+
+            for neighbour, step in edges:
+                new_cost = cost + step
+                if new_cost < costs.get(neighbour, new_cost + 1):
+                    costs[neighbour] = new_cost
+                    came_from[neighbour] = node
+                    heapq.heappush(heap, (new_cost + manhattan(neighbour, goal),
+                                          -new_cost, neighbour))
+        return None
+
+    def _refine(self, a: Position, b: Position) -> List[Position]:
+        """
+        Expand one abstract hop into the cells after a, up to and including b.
+
+        If walls changed since the route was planned and the hop is now cut
+        inside its cluster, a maze-wide A* detour is used instead (and just
+        [b] if b is out of reach, which path followers treat as blocked).
+        """
+        if manhattan(a, b) == 1:
+            return [b]
+        cluster = self.cluster_of(a)
+        x0, y0, x1, y1 = self._bounds(cluster)
+        grid = self.maze.grid
+        wall = CellType.WALL.value
+        came_from: Dict[Position, Optional[Position]] = {b: None}
+        queue = deque([b])
+        # Search backwards from b so the path reads forwards from a
+        while queue and a not in came_from:
+            x, y = queue.popleft()
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if (x0 <= nx < x1 and y0 <= ny < y1 and grid[ny][nx] != wall and
+                        (nx, ny) not in came_from):
+                    came_from[(nx, ny)] = (x, y)
+                    queue.append((nx, ny))
+        if a not in came_from:
+            detour = astar(self.maze, a, b)
+            return list(detour[1:]) if detour is not None else [b]
+        cells = []
+        cell = came_from[a]
+        while cell is not None:
+            cells.append(cell)
+            cell = came_from[cell]
+        return cells
+
+    def iter_route(self, start: Position, goal: Position) -> Iterator[Position]:
+        """
+        Yield the cells of a route from start to goal, refining each abstract
+        hop only when the walk reaches it.
+
+        Yields nothing if the goal is unreachable.
+        """
+        waypoints = self.waypoints(start, goal)
+        if waypoints is None:
+            return
+        yield waypoints[0]
+        for a, b in zip(waypoints, waypoints[1:]):
+            yield from self._refine(a, b)
+
+    def route(self, start: Position, goal: Position) -> Optional['LazyPath']:
+        """
+        Find a near-shortest route.
+
+        Only the abstract search runs here: the returned path knows its
+        length and goal up front and refines each hop into cells the first
+        time a cell of it is read.
+
+        Returns:
+            Cells from start to goal inclusive, or None if unreachable
+        """
+        found = self._abstract_route(start, goal)
+        if found is None:
+            return None
+        return LazyPath(_Refinement(self, *found))
+
+    def distance(self, start: Position, goal: Position) -> Optional[int]:
+        """Get the route length between two cells, or None if unreachable."""
+        path = self.route(start, goal)
+        return None if path is None else len(path) - 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the size of the abstract graph."""
+        self._sync()
+        return {
+            'clusters': self.clusters_x * self.clusters_y,
+            'nodes': len([node for node, partners in self._partners.items() if partners]),
+            'entrances': sum(len(transitions) for transitions in self._borders.values()),
+            'clusters_rebuilt': self.clusters_rebuilt,
+        }
+
+class _Refinement:
+    """Cells of one route, refined hop by hop and shared by its LazyPath views."""
+
+    def __init__(self, planner: HierarchicalPathfinder, waypoints: List[Position],
+                 steps: List[int]):
+        self.planner = planner
+        self.waypoints = waypoints
+        self.steps = steps  # Route steps from the start to each waypoint
+        self.length = steps[-1] + 1  # Exact unless a hop had to detour around new walls
+        self.cells = [waypoints[0]]
+        self.hop = 0  # Next abstract hop to refine
+
+    def cell(self, index: int) -> Position:
+        """Get a cell of the route, refining hops up to it."""
+        if index == self.length - 1 and self.hop < len(self.waypoints) - 1:
+            return self.waypoints[-1]  # The goal is known without refining
+        cells = self.cells
+        waypoints = self.waypoints
+        while len(cells) <= index and self.hop < len(waypoints) - 1:
+            hop_cells = self.planner._refine(waypoints[self.hop], waypoints[self.hop + 1])
+            self.length += len(hop_cells) - (self.steps[self.hop + 1] - self.steps[self.hop])
+            cells.extend(hop_cells)
+            self.hop += 1
+        return cells[index]
+
+class LazyPath(Sequence):
+    """
+    Route cells from HierarchicalPathfinder.route, refined on demand.
+
+    Behaves like the tuple paths of the other planners (indexing, slicing,
+    iteration, comparison with tuples), but len() and the last cell are
+    answered from the abstract search and each hop is expanded into cells
+    only when a cell inside it is read. Slices with step 1 are views that
+    share the refinement.
+    """
+
+    __slots__ = ('_source', '_start', '_stop')
+
+    def __init__(self, source: _Refinement, start: int = 0, stop: Optional[int] = None):
+        self._source = source
+        self._start = start
+        self._stop = stop  # None = up to the goal
+
+    def __len__(self) -> int:
+        stop = self._source.length if self._stop is None else self._stop
+        return max(0, stop - self._start)
+
+    def __getitem__(self, key):
+        length = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(length)
+            if step != 1:
+                return tuple(self[i] for i in range(start, stop, step))
+            stop = max(start, stop)
+            open_ended = stop == length and self._stop is None
+            return LazyPath(self._source, self._start + start,
+                            None if open_ended else self._start + stop)
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError(key)
+        return self._source.cell(self._start + key)
+
+    def __iter__(self) -> Iterator[Position]:
+        index = 0
+        while index < len(self):
+            yield self[index]
+            index += 1
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (tuple, list, LazyPath)):
+            return len(self) == len(other) and tuple(self) == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    @property
+    def refined(self) -> int:
+        """Number of cells of the whole route expanded so far."""
+        return len(self._source.cells)
+
+    def __repr__(self) -> str:
+        return f"LazyPath({len(self)} cells, {self.refined} refined)"
+
+def create_route_planner(maze: Maze, hierarchical_cells: int = HIERARCHICAL_CELLS):
+    """
+    Create the route planner suited to a maze's size.
+
+    Small mazes get an exact CorridorGraph; mazes with at least
+    hierarchical_cells cells get a HierarchicalPathfinder.
+    """
+    if maze.width * maze.height >= hierarchical_cells:
+        return HierarchicalPathfinder(maze)
+    return CorridorGraph(maze)
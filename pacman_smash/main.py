@@ -5,11 +5,18 @@ A competitive two-player Pacman game with AI-driven dynamic elements.
 
 import pygame
 import sys
-from typing import Optional, List
+import time
+import argparse
+from typing import Optional, List, Tuple
 from maze import Maze
-from player import Player, PLAYER_1_CONTROLS, PLAYER_2_CONTROLS, PLAYER_1_COLOR, PLAYER_2_COLOR
-from ghost_ai import GhostManager
+from player import Player, DIRECTION_VECTORS, get_player_controls, get_player_color
+from ghost_ai import GhostManager, lod_distance_for
 from ai_controller import AIController
+from navigation import DistanceCache
+from hpa import create_route_planner
+from maze_pool import MazePool
+from bots import BotController, create_bot
+from scheduler import Scheduler
 
 # Game constants
 SCREEN_WIDTH = 800
@@ -20,18 +27,43 @@ BACKGROUND_COLOR = (0, 0, 0)  # Black
 class GameEngine:
     """Main game engine that manages the game loop and coordinates all systems."""
     
-    def __init__(self):
-        """Initialize the game engine."""
+    def __init__(self, headless: bool = False, num_players: int = 2,
+                 maze_generator: Optional[str] = None, seed: Optional[int] = None,
+                 maze_pool: Optional[MazePool] = None):
+        """
+        Initialize the game engine.
+        
+        Args:
+            headless: Run without a window (no event handling or rendering)
+            num_players: Number of players; seats beyond the fourth have no
+                keyboard layout and need a bot controller
+            maze_generator: Procedural maze generator name (None = classic layout)
+            seed: Maze generator seed
+            maze_pool: Pool to take a ready maze from instead of generating
+                one here (overrides maze_generator and seed)
+        """
         pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Pacman Smash")
+        self.headless = headless
+        if headless:
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Pacman Smash")
         self.clock = pygame.time.Clock()
         self.running = True
         
         # Initialize game systems
-        self.maze = Maze(25, 19)
-        self.ghost_manager = GhostManager()
+        if maze_pool is not None:
+            prepared = maze_pool.take()
+            self.maze = prepared.maze
+            self.nav_graph = prepared.nav_graph or create_route_planner(self.maze)
+        else:
+            self.maze = Maze(25, 19, generator=maze_generator, seed=seed)
+            self.nav_graph = create_route_planner(self.maze)
+        self.ghost_manager = GhostManager(self.maze, lod_distance=lod_distance_for(self.maze),
+                                          nav_graph=self.nav_graph)
         self.ai_controller = AIController()
+        self.distance_cache = DistanceCache(self.maze)
         
         # Calculate maze rendering offset to center it
         maze_pixel_width = self.maze.width * self.maze.cell_size
@@ -40,11 +72,12 @@ class GameEngine:
         self.maze_offset_y = (SCREEN_HEIGHT - maze_pixel_height) // 2
         
         # Initialize players
-        player_starts = self.maze.get_player_starting_positions()
+        player_starts = self.maze.get_spawn_positions(num_players)
         self.players = [
-            Player(1, player_starts[0], PLAYER_1_CONTROLS, PLAYER_1_COLOR),
-            Player(2, player_starts[1], PLAYER_2_CONTROLS, PLAYER_2_COLOR)
+            Player(i + 1, start, get_player_controls(i), get_player_color(i))
+            for i, start in enumerate(player_starts)
         ]
+        self.rebuild_input_bindings()
         
         # Register players with AI controller
         for player in self.players:
@@ -53,6 +86,9 @@ class GameEngine:
         # Initialize ghosts
         self.ghost_manager.create_default_ghosts(self.maze.width, self.maze.height)
         
+        # Chaos must never restore a wall that seals a player or ghost in
+        self.maze.chaos_planner.occupants = self.occupied_positions
+        
         # Game state
         self.game_messages: List[str] = []
         self.message_display_time = 3.0  # seconds
@@ -63,6 +99,11 @@ class GameEngine:
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
+        # Each subsystem runs at its own rate
+        self.scheduler = Scheduler()
+        self.register_subsystems()
+        self.ghost_manager.on_earlier_move = self.wake_ghosts
+        
     def handle_events(self) -> None:
         """Process all pygame events."""
         for event in pygame.event.get():
@@ -76,41 +117,91 @@ class GameEngine:
         keys = pygame.key.get_pressed()
         self.handle_player_input(keys)
     
+    def occupied_positions(self) -> List[Tuple[int, int]]:
+        """Get the cells currently occupied by players and ghosts."""
+        return ([player.position for player in self.players] +
+                [ghost.position for ghost in self.ghost_manager.ghosts])
+    
+    def set_bot(self, player_id: int, controller: Optional[BotController]) -> None:
+        """Hand a player over to a bot controller (None restores keyboard control)."""
+        player = self.get_player(player_id)
+        if player is None:
+            raise ValueError(f"No player with id {player_id}")
+        player.controller = controller
+    
+    def add_bot(self, player_id: int, kind: str, seed: Optional[int] = None) -> BotController:
+        """Create a bot of the given kind and let it control a player."""
+        controller = create_bot(kind, self.distance_cache, seed, self.nav_graph)
+        self.set_bot(player_id, controller)
+        return controller
+    
+    def rebuild_input_bindings(self) -> None:
+        """Rebuild the key table from each player's controls dict."""
+        # (player, [(key, (dx, dy)), ...]) in the order directions are checked
+        self.input_bindings = [
+            (player, [(key, DIRECTION_VECTORS[direction])
+                      for direction, key in player.controls.items()
+                      if direction in DIRECTION_VECTORS])
+            for player in self.players
+        ]
+    
     def handle_player_input(self, keys) -> None:
-        """Handle player input for movement."""
-        # Player 1 controls (WASD)
-        player1 = self.players[0]
-        if player1.is_movement_allowed():
-            new_pos = None
-            if keys[pygame.K_w]:  # Up
-                new_pos = (player1.position[0], player1.position[1] - 1)
-            elif keys[pygame.K_s]:  # Down
-                new_pos = (player1.position[0], player1.position[1] + 1)
-            elif keys[pygame.K_a]:  # Left
-                new_pos = (player1.position[0] - 1, player1.position[1])
-            elif keys[pygame.K_d]:  # Right
-                new_pos = (player1.position[0] + 1, player1.position[1])
+        """Handle player input for movement (keys may be None when headless)."""
+        # Gather every player's intended move, then resolve them in one pass
+        moves: List[Tuple[Player, Tuple[int, int]]] = []
+        ghosts = self.ghost_manager.ghosts
+        
+        for player, bindings in self.input_bindings:
+            if not player.is_movement_allowed():
+                continue
             
-            if new_pos and self.maze.is_valid_position(new_pos[0], new_pos[1]):
-                player1.move(new_pos)
-                self.handle_player_maze_interactions(player1)
-        
-        # Player 2 controls (Arrow keys)
-        player2 = self.players[1]
-        if player2.is_movement_allowed():
-            new_pos = None
-            if keys[pygame.K_UP]:  # Up
-                new_pos = (player2.position[0], player2.position[1] - 1)
-            elif keys[pygame.K_DOWN]:  # Down
-                new_pos = (player2.position[0], player2.position[1] + 1)
-            elif keys[pygame.K_LEFT]:  # Left
-                new_pos = (player2.position[0] - 1, player2.position[1])
-            elif keys[pygame.K_RIGHT]:  # Right
-                new_pos = (player2.position[0] + 1, player2.position[1])
+            offset = None
+            if player.controller is not None:
+                direction = player.controller.choose_direction(player, self.maze, ghosts)
+                if direction is not None:
+                    offset = DIRECTION_VECTORS[direction]
+            elif keys is not None:
+                for key, vector in bindings:
+                    if keys[key]:
+                        offset = vector
+                        break
             
-            if new_pos and self.maze.is_valid_position(new_pos[0], new_pos[1]):
-                player2.move(new_pos)
-                self.handle_player_maze_interactions(player2)
+            if offset is not None:
+                moves.append((player, offset))
+        
+        if moves:
+            self.resolve_moves(moves)
+    
+    def resolve_moves(self, moves: List[Tuple[Player, Tuple[int, int]]]) -> None:
+        """
+        Apply a batch of movement requests.
+        
+        All moves are validated against the maze before any interaction runs,
+        then pellet and power-up pickups are processed in player order.
+        """
+        moved = []
+        maze = self.maze
+        if maze.flat_cells:
+            # Step along flat cell indices; a target is valid if it is an open neighbour
+            neighbours = maze.neighbours
+            positions = maze.cell_positions
+            width = maze.width
+            for player, (dx, dy) in moves:
+                cell = maze.cell_index(*player.position)
+                target = cell + dy * width + dx
+                if target in neighbours[cell]:
+                    player.move(positions[target])
+                    moved.append(player)
+        else:
+            for player, (dx, dy) in moves:
+                new_x = player.position[0] + dx
+                new_y = player.position[1] + dy
+                if maze.is_valid_position(new_x, new_y):
+                    player.move((new_x, new_y))
+                    moved.append(player)
+        
+        for player in moved:
+            self.handle_player_maze_interactions(player)
     
     def handle_player_maze_interactions(self, player) -> None:
         """Handle player interactions with maze elements."""
@@ -129,52 +220,113 @@ class GameEngine:
             from player import PowerUpType
             
             powerup_types = list(PowerUpType)
-            powerup_type = random.choice(powerup_types)
-            player.add_powerup(powerup_type, 5.0)
-            
-            # Apply power-up effects
-            if powerup_type == PowerUpType.FREEZE_OPPONENT:
-                # Freeze the other player
-                other_player = self.players[1] if player.player_id == 1 else self.players[0]
+            self.apply_powerup(player, random.choice(powerup_types))
+    
+    def apply_powerup(self, player, powerup_type) -> None:
+        """Give a player a power-up and apply its effects."""
+        from player import PowerUpType
+        
+        player.add_powerup(powerup_type, 5.0)
+        
+        # Apply power-up effects
+        if powerup_type == PowerUpType.FREEZE_OPPONENT:
+            # Freeze the strongest opponent
+            scoreboard = self.ai_controller.scoreboard
+            scoreboard.sync(self.players)
+            target_id = scoreboard.leader_excluding(player.player_id)
+            other_player = self.get_player(target_id)
+            if other_player is not None:
                 other_player.freeze(3.0)
                 self.add_message(f"Player {other_player.player_id} is frozen!")
-            
-            elif powerup_type == PowerUpType.GHOST_CONFUSION:
-                # Confuse all ghosts
-                self.ghost_manager.set_all_confused(5.0)
-                self.add_message("All ghosts are confused!")
-            
-            elif powerup_type == PowerUpType.SPEED_BOOST:
-                self.add_message(f"Player {player.player_id} got a speed boost!")
-            
-            self.add_message(f"Player {player.player_id} collected a power-up!")
-    
-    def update(self) -> None:
-        """Update all game systems."""
-        # Update maze (handle temporary modifications and pellet respawning)
-        respawned_pellets = self.maze.update_temporary_modifications()
-        if respawned_pellets > 0:
-            self.add_message(f"{respawned_pellets} pellets respawned!")
         
-        # Update players (power-ups, etc.)
-        for player in self.players:
-            player.update_powerups()
+        elif powerup_type == PowerUpType.GHOST_CONFUSION:
+            # Confuse all ghosts
+            self.ghost_manager.set_all_confused(5.0)
+            self.add_message("All ghosts are confused!")
         
-        # Update ghosts
-        self.ghost_manager.update_all(self.maze.grid, self.players)
+        elif powerup_type == PowerUpType.SPEED_BOOST:
+            self.add_message(f"Player {player.player_id} got a speed boost!")
         
-        # Check ghost-player collisions
+        self.add_message(f"Player {player.player_id} collected a power-up!")
+    
+    def get_player(self, player_id: Optional[int]) -> Optional[Player]:
+        """Get a player by id."""
+        for player in self.players:
+            if player.player_id == player_id:
+                return player
+        return None
+    
+    def register_subsystems(self) -> None:
+        """Register the game systems with the scheduler."""
+        add = self.scheduler.add
+        add("collisions", self.update_collisions)  # Every tick: players move every frame
+        add("ghosts", self.update_ghosts, min_interval=0.01)
+        add("powerups", self.update_player_effects, interval=0.1)
+        add("maze_modifications", self.update_maze_modifications)
+        add("pellet_respawn", self.update_pellet_respawn)
+        add("ai_metrics", self.update_ai_metrics, interval=self.ai_controller.tracking_interval)
+        add("ai_balancing", self.update_ai_balancing, interval=0.5)
+        add("ai_chaos", self.update_ai_chaos)
+        add("messages", self.update_messages, interval=0.25)
+    
+    def update(self) -> None:
+        """Update the game systems that are due."""
+        self.scheduler.run_due(time.time())
+    
+    def update_collisions(self, current_time: float) -> None:
+        """Check ghost-player collisions."""
         collisions = self.ghost_manager.check_collisions(self.players)
         for ghost, player in collisions:
             player.die()
             self.add_message(f"Player {player.player_id} was caught by a ghost!")
-        
-        # Update AI controller
-        ai_messages = self.ai_controller.update(self.players, self.ghost_manager, self.maze)
-        for message in ai_messages:
+    
+    def update_ghosts(self, current_time: float) -> float:
+        """Move the ghosts; runs again when the next ghost may move."""
+        self.ghost_manager.update_all(self.maze.grid, self.players)
+        return self.ghost_manager.next_move_time()
+    
+    def wake_ghosts(self, due: float) -> None:
+        """Pull the ghost update forward when a ghost became due sooner."""
+        self.scheduler.wake("ghosts", due)
+    
+    def update_player_effects(self, current_time: float) -> None:
+        """Expire players' power-ups and freezes."""
+        for player in self.players:
+            player.update_powerups()
+    
+    def update_maze_modifications(self, current_time: float) -> float:
+        """Restore chaos-removed walls; checks for new ones at least every second."""
+        self.maze.restore_expired_modifications()
+        return min(self.maze.next_modification_expiry(), current_time + 1.0)
+    
+    def update_pellet_respawn(self, current_time: float) -> float:
+        """Respawn pellets; runs again when the respawn interval is up."""
+        respawned_pellets = self.maze.update_pellet_respawn()
+        if respawned_pellets > 0:
+            self.add_message(f"{respawned_pellets} pellets respawned!")
+        return self.maze.pellet_respawn_timer + self.maze.pellet_respawn_interval
+    
+    def update_ai_metrics(self, current_time: float) -> None:
+        """Sample player performance metrics."""
+        self.ai_controller.update_player_metrics(self.players)
+    
+    def update_ai_balancing(self, current_time: float) -> None:
+        """Apply difficulty balancing."""
+        for message in self.ai_controller.update_balancing(
+                self.players, self.ghost_manager, self.maze):
             self.add_message(message)
-        
-        # Clean up old messages
+        # Balancing can trigger chaos, whose revert the chaos subsystem must see
+        self.scheduler.wake("ai_chaos", self.ai_controller.next_chaos_due())
+    
+    def update_ai_chaos(self, current_time: float) -> float:
+        """Trigger and revert chaos events; runs again when one is due."""
+        for message in self.ai_controller.update_chaos(
+                self.players, self.ghost_manager, self.maze):
+            self.add_message(message)
+        return self.ai_controller.next_chaos_due()
+    
+    def update_messages(self, current_time: float) -> None:
+        """Drop expired on-screen messages."""
         self.cleanup_old_messages()
     
     def add_message(self, message: str) -> None:
@@ -202,17 +354,24 @@ class GameEngine:
         """Render the user interface."""
         # Render player scores
         score_y = 10
-        for i, player in enumerate(self.players):
-            score_text = f"Player {player.player_id}: {player.score}"
-            color = player.color
-            text_surface = self.font.render(score_text, True, color)
-            self.screen.blit(text_surface, (10 + i * 200, score_y))
-            
-            # Show active power-ups
-            if player.active_powerups:
-                powerup_text = f"Power-ups: {len(player.active_powerups)}"
-                powerup_surface = self.small_font.render(powerup_text, True, color)
-                self.screen.blit(powerup_surface, (10 + i * 200, score_y + 30))
+        if len(self.players) <= 2:
+            for i, player in enumerate(self.players):
+                score_text = f"Player {player.player_id}: {player.score}"
+                color = player.color
+                text_surface = self.font.render(score_text, True, color)
+                self.screen.blit(text_surface, (10 + i * 200, score_y))
+                
+                # Show active power-ups
+                if player.active_powerups:
+                    powerup_text = f"Power-ups: {len(player.active_powerups)}"
+                    powerup_surface = self.small_font.render(powerup_text, True, color)
+                    self.screen.blit(powerup_surface, (10 + i * 200, score_y + 30))
+        else:
+            # Compact grid of scores for party modes
+            for i, player in enumerate(self.players):
+                score_text = f"P{player.player_id}: {player.score}"
+                text_surface = self.small_font.render(score_text, True, player.color)
+                self.screen.blit(text_surface, (10 + (i % 4) * 130, score_y + (i // 4) * 20))
         
         # Render game messages
         message_y = SCREEN_HEIGHT - 150
@@ -234,6 +393,9 @@ class GameEngine:
     
     def render(self) -> None:
         """Render all game elements."""
+        if self.headless:
+            return
+        
         self.screen.fill(BACKGROUND_COLOR)
         
         # Render maze
@@ -269,10 +431,52 @@ class GameEngine:
         
         pygame.quit()
         sys.exit()
+    
+    def run_headless(self, duration: float, fps: int = FPS) -> None:
+        """
+        Run the simulation without a window, e.g. for bot soak tests.
+        
+        Args:
+            duration: Wall-clock seconds to simulate
+            fps: Update rate
+        """
+        end_time = time.time() + duration
+        while self.running and time.time() < end_time:
+            self.handle_player_input(None)
+            self.update()
+            self.clock.tick(fps)
 
 def main():
     """Entry point for the game."""
-    game = GameEngine()
+    parser = argparse.ArgumentParser(description="Pacman Smash")
+    parser.add_argument("--bot", action="append", default=[], metavar="ID:KIND",
+                        help="let a bot control a player, e.g. 2:greedy "
+                             "(kinds: random, greedy, avoid)")
+    parser.add_argument("--headless", type=float, metavar="SECONDS",
+                        help="run without a window for the given number of seconds")
+    parser.add_argument("--players", type=int, default=2,
+                        help="number of players (seats 5+ need --bot)")
+    parser.add_argument("--maze", metavar="GENERATOR",
+                        help="procedural maze generator (binary_tree, sidewinder, "
+                             "braided, backtracker, rooms); backtracker is meant "
+                             "for maps up to about 1000x1000")
+    parser.add_argument("--seed", type=int, help="maze generator seed")
+    args = parser.parse_args()
+    
+    game = GameEngine(headless=args.headless is not None, num_players=args.players,
+                      maze_generator=args.maze, seed=args.seed)
+    for spec in args.bot:
+        player_id, _, kind = spec.partition(":")
+        game.add_bot(int(player_id), kind or "greedy")
+    
+    if args.headless is not None:
+        game.run_headless(args.headless)
+        for player in game.players:
+            print(f"Player {player.player_id}: score={player.score} "
+                  f"pellets={player.pellets_collected} deaths={player.death_count}")
+        pygame.quit()
+        return
+    
     game.run()
 
 if __name__ == "__main__":
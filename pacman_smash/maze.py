@@ -5,10 +5,13 @@ Handles maze generation, rendering, and dynamic modifications.
 
 import pygame
 import random
+import numpy as np
 import time
-from typing import List, Tuple, Set, Dict, Optional
+from collections import deque
+from typing import List, Tuple, Set, Dict, Optional, Callable
 from dataclasses import dataclass
 from enum import Enum
+from connectivity import ConnectivityIndex
 
 class CellType(Enum):
     """Types of cells in the maze grid."""
@@ -29,23 +32,37 @@ class TemporaryModification:
 class Maze:
     """Manages the game maze, including dynamic modifications."""
     
-    def __init__(self, width: int = 25, height: int = 19):
+    # Whole-map flat cell tables (cell_positions, neighbours) are supported
+    flat_cells = True
+    
+    def __init__(self, width: int = 25, height: int = 19,
+                 generator: Optional[str] = None, seed: Optional[int] = None,
+                 layout: Optional[List[List[int]]] = None):
         """
         Initialize the maze.
         
         Args:
             width: Maze width in grid cells
             height: Maze height in grid cells
+            generator: Name of a procedural generator from maze_generators
+                (None = the classic fixed layout)
+            seed: Seed for the generator; the same seed gives the same maze
+            layout: Exact grid of CellType values to use instead of generating
+                one (e.g. a level loaded from disk)
         """
         self.width = width
         self.height = height
+        self.generator = generator
+        self.seed = seed
+        self.layout = layout
         
         # Grid representation
         self.grid: List[List[int]] = []
         self.original_grid: List[List[int]] = []
         
         # Pellet tracking
-        self.pellet_positions: Set[Tuple[int, int]] = set()
+        self._pellet_positions: Optional[Set[Tuple[int, int]]] = set()
+        self._pellet_cells: Optional[np.ndarray] = None  # Flat indices until the set is built
         self.total_pellets = 0
         self.pellet_respawn_timer = 0.0
         self.pellet_respawn_interval = 15.0  # Respawn pellets every 15 seconds
@@ -54,6 +71,25 @@ class Maze:
         # Dynamic modifications
         self.temporary_modifications: Dict[Tuple[int, int], TemporaryModification] = {}
         
+        # Change tracking for incremental consumers (observations, navigation data)
+        self.grid_version = 0  # Bumped on every cell change
+        self.wall_version = 0  # Bumped only when a cell becomes or stops being a wall
+        self._cell_listeners: List[Callable[[int, int, int, int], None]] = []
+        # Recent wall flips as (wall_version after the flip, (x, y)), for incremental repair
+        self.wall_changes: deque = deque(maxlen=256)
+        # Mutation journal of (x, y, old_value, new_value), for rollback and diffs
+        self.journal: List[Tuple[int, int, int, int]] = []
+        self.max_journal = 65536  # Older entries are dropped past this length
+        self._journal_base = 0  # Checkpoint of journal[0]
+        # Original value of every cell that currently differs from it
+        self._original_values: Dict[Tuple[int, int], int] = {}
+        self._connectivity: Optional[ConnectivityIndex] = None  # Built on first use
+        self._chaos_planner = None  # WallChaosPlanner, built on first use
+        self._bitboards = None  # MazeBitboards, built on first use
+        # Flat cell index (y * width + x) tables, built on first use
+        self._cell_positions: Optional[List[Tuple[int, int]]] = None
+        self._neighbours: Optional[List[Tuple[int, ...]]] = None
+        
         # Visual properties
         self.cell_size = 25
         self.wall_color = (0, 0, 255)  # Blue
@@ -65,17 +101,46 @@ class Maze:
         self.generate_maze()
     
     def generate_maze(self) -> None:
-        """Generate a basic maze layout."""
-        # Create a simple maze pattern
-        self.grid = [[CellType.WALL.value for _ in range(self.width)] 
-                     for _ in range(self.height)]
-        
-        # Create paths and add pellets
-        self._create_basic_layout()
-        self._add_pellets()
+        """Generate the maze layout (procedurally if a generator is set)."""
+        if self.layout is not None:
+            # A fixed level keeps its pellets exactly where they were saved
+            self.grid = [row[:] for row in self.layout]
+            self.pellet_positions = {(x, y) for y, row in enumerate(self.grid)
+                                     for x, value in enumerate(row)
+                                     if value == CellType.PELLET.value}
+            self.total_pellets = len(self.pellet_positions)
+        else:
+            if self.generator is not None:
+                from maze_generators import generate
+                cells = generate(self.generator, self.width, self.height, self.seed)
+            else:
+                # Create a simple maze pattern
+                self.grid = [[CellType.WALL.value for _ in range(self.width)] 
+                             for _ in range(self.height)]
+                self._create_basic_layout()
+                cells = np.array(self.grid, dtype=np.uint8)
+            
+            # Add pellets on the array, then convert to lists once
+            self._add_pellets(cells)
+            self.grid = cells.tolist()
         
         # Store original for restoration
         self.original_grid = [row[:] for row in self.grid]
+        self._reset_journal()
+        
+        if self._connectivity is not None:
+            self._connectivity.rebuild()
+        if self._chaos_planner is not None:
+            self._chaos_planner.rebuild_index()
+        if self._bitboards is not None:
+            self._bitboards.rebuild()
+        self._neighbours = None
+    
+    def _reset_journal(self) -> None:
+        """Forget all recorded changes; the current grid becomes the original."""
+        self.journal = []
+        self._journal_base = 0
+        self._original_values = {}
     
     def _create_basic_layout(self) -> None:
         """Create a basic Pacman-style maze layout."""
@@ -131,23 +196,41 @@ class Maze:
             for y in range(1, self.height - 1):
                 self.grid[y][x] = CellType.PATH.value
     
-    def _add_pellets(self) -> None:
-        """Add pellets to path cells."""
-        self.pellet_positions.clear()
+    def _add_pellets(self, cells: np.ndarray) -> None:
+        """
+        Add pellets to the path cells of a (height, width) cell array.
         
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == CellType.PATH.value:
-                    # Don't place pellets at player starting positions
-                    if (x, y) not in [(1, 1), (self.width - 2, self.height - 2)]:
-                        # Don't place pellets in center ghost area
-                        center_x = self.width // 2
-                        center_y = self.height // 2
-                        if not (abs(x - center_x) <= 2 and abs(y - center_y) <= 2):
-                            self.grid[y][x] = CellType.PELLET.value
-                            self.pellet_positions.add((x, y))
-        
-        self.total_pellets = len(self.pellet_positions)
+        Vectorized: one mask over the whole map, with the player starting
+        positions and the center ghost area cut out.
+        """
+        pellets = cells == CellType.PATH.value
+        # Don't place pellets at player starting positions
+        for x, y in [(1, 1), (self.width - 2, self.height - 2)]:
+            if 0 <= x < self.width and 0 <= y < self.height:
+                pellets[y, x] = False
+        # Don't place pellets in center ghost area
+        center_x, center_y = self.width // 2, self.height // 2
+        pellets[max(0, center_y - 2):center_y + 3, max(0, center_x - 2):center_x + 3] = False
+        cells[pellets] = CellType.PELLET.value
+        
+        # The position set is built on first use (millions of tuples on huge maps)
+        self._pellet_cells = np.flatnonzero(pellets)
+        self._pellet_positions = None
+        self.total_pellets = len(self._pellet_cells)
+    
+    @property
+    def pellet_positions(self) -> Set[Tuple[int, int]]:
+        """Positions of the pellets still on the board."""
+        if self._pellet_positions is None:
+            ys, xs = np.divmod(self._pellet_cells, self.width)
+            self._pellet_positions = set(zip(xs.tolist(), ys.tolist()))
+            self._pellet_cells = None
+        return self._pellet_positions
+    
+    @pellet_positions.setter
+    def pellet_positions(self, positions: Set[Tuple[int, int]]) -> None:
+        self._pellet_positions = positions
+        self._pellet_cells = None
     
     def is_valid_position(self, x: int, y: int) -> bool:
         """Check if a position is within bounds and not a wall."""
@@ -167,6 +250,113 @@ class Maze:
             return None
         return CellType(self.grid[y][x])
     
+    def set_cell(self, x: int, y: int, value: int) -> None:
+        """
+        Change a single cell and notify listeners.
+        
+        All runtime grid mutations go through here so that derived data can be
+        updated incrementally instead of being rebuilt from the grid.
+        """
+        old_value = self.grid[y][x]
+        if old_value == value:
+            return
+        
+        self.grid[y][x] = value
+        self.grid_version += 1
+        self.journal.append((x, y, old_value, value))
+        if len(self.journal) > self.max_journal:
+            dropped = len(self.journal) // 2
+            del self.journal[:dropped]
+            self._journal_base += dropped
+        original = self._original_values.setdefault((x, y), old_value)
+        if value == original:
+            del self._original_values[(x, y)]
+        if (old_value == CellType.WALL.value) != (value == CellType.WALL.value):
+            self.wall_version += 1
+            self.wall_changes.append((self.wall_version, (x, y)))
+            if self._neighbours is not None:
+                self._refresh_neighbours(x, y)
+        
+        for listener in self._cell_listeners:
+            listener(x, y, old_value, value)
+    
+    def wall_changes_since(self, version: int) -> Optional[Set[Tuple[int, int]]]:
+        """
+        Get the cells whose wall state flipped after a wall version.
+        
+        Returns:
+            The changed cells (a cell flipped twice is included), or None if
+            the change log no longer reaches back to version
+        """
+        if version == self.wall_version:
+            return set()
+        if not self.wall_changes or self.wall_changes[0][0] > version + 1:
+            return None
+        changed = set()
+        for changed_version, cell in reversed(self.wall_changes):
+            if changed_version <= version:
+                break
+            changed.add(cell)
+        return changed
+    
+    def checkpoint(self) -> int:
+        """Get a journal position to roll back or diff to later."""
+        return self._journal_base + len(self.journal)
+    
+    def _journal_index(self, checkpoint: int) -> int:
+        index = checkpoint - self._journal_base
+        if not 0 <= index <= len(self.journal):
+            raise ValueError(f"Checkpoint {checkpoint} is no longer in the journal")
+        return index
+    
+    def rollback(self, checkpoint: int) -> int:
+        """
+        Undo every cell change made after a checkpoint, newest first.
+        
+        Listeners see each undone change and pellet tracking is restored
+        with it, so derived data stays in sync (e.g. for rolling back a
+        mispredicted network frame). Temporary modification records are
+        not rewound.
+        
+        Returns:
+            Number of changes undone
+        """
+        index = self._journal_index(checkpoint)
+        undone = self.journal[index:]
+        del self.journal[index:]
+        for x, y, old_value, new_value in reversed(undone):
+            if old_value == CellType.PELLET.value:
+                self.pellet_positions.add((x, y))
+            elif new_value == CellType.PELLET.value:
+                self.pellet_positions.discard((x, y))
+            self.set_cell(x, y, old_value)
+        del self.journal[index:]  # Drop the undo writes too
+        return len(undone)
+    
+    def diff(self, checkpoint: int) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """
+        Get the net cell changes since a checkpoint.
+        
+        Returns:
+            Position -> (value at the checkpoint, current value), leaving out
+            cells that changed and changed back
+        """
+        changes: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for x, y, old_value, new_value in self.journal[self._journal_index(checkpoint):]:
+            first = changes[(x, y)][0] if (x, y) in changes else old_value
+            changes[(x, y)] = (first, new_value)
+        return {position: change for position, change in changes.items()
+                if change[0] != change[1]}
+    
+    def add_cell_listener(self, listener: Callable[[int, int, int, int], None]) -> None:
+        """Register a callback invoked as listener(x, y, old_value, new_value)."""
+        self._cell_listeners.append(listener)
+    
+    def remove_cell_listener(self, listener: Callable[[int, int, int, int], None]) -> None:
+        """Unregister a cell change callback."""
+        if listener in self._cell_listeners:
+            self._cell_listeners.remove(listener)
+    
     def collect_pellet(self, x: int, y: int) -> bool:
         """
         Collect a pellet at the given position.
@@ -176,7 +366,7 @@ class Maze:
         """
         if (x, y) in self.pellet_positions:
             self.pellet_positions.remove((x, y))
-            self.grid[y][x] = CellType.EMPTY.value
+            self.set_cell(x, y, CellType.EMPTY.value)
             return True
         return False
     
@@ -188,7 +378,7 @@ class Maze:
             True if power-up was placed, False otherwise
         """
         if self.is_valid_position(x, y) and self.grid[y][x] != CellType.WALL.value:
-            self.grid[y][x] = CellType.POWER_UP.value
+            self.set_cell(x, y, CellType.POWER_UP.value)
             return True
         return False
     
@@ -201,7 +391,7 @@ class Maze:
         """
         if (0 <= x < self.width and 0 <= y < self.height and 
             self.grid[y][x] == CellType.POWER_UP.value):
-            self.grid[y][x] = CellType.EMPTY.value
+            self.set_cell(x, y, CellType.EMPTY.value)
             return True
         return False
     
@@ -217,6 +407,45 @@ class Maze:
         
         return positions
     
+    def cell_index(self, x: int, y: int) -> int:
+        """Get the flat index (y * width + x) of an in-bounds cell."""
+        return y * self.width + x
+    
+    @property
+    def cell_positions(self) -> List[Tuple[int, int]]:
+        """
+        Shared (x, y) tuple of every flat cell index.
+        
+        Converting an index back to a position is a list lookup that reuses
+        the same tuple object, so moves along flat indices allocate nothing.
+        """
+        if self._cell_positions is None:
+            self._cell_positions = [(x, y) for y in range(self.height)
+                                    for x in range(self.width)]
+        return self._cell_positions
+    
+    @property
+    def neighbours(self) -> List[Tuple[int, ...]]:
+        """
+        Flat indices of the open neighbours of every cell.
+        
+        Same cells and order (up, down, left, right) as
+        get_valid_adjacent_positions; kept up to date on wall changes.
+        """
+        if self._neighbours is None:
+            self._neighbours = [self._open_neighbours(x, y) for y in range(self.height)
+                                for x in range(self.width)]
+        return self._neighbours
+    
+    def _open_neighbours(self, x: int, y: int) -> Tuple[int, ...]:
+        return tuple(self.cell_index(nx, ny) for nx, ny in self.get_valid_adjacent_positions(x, y))
+    
+    def _refresh_neighbours(self, x: int, y: int) -> None:
+        """Update the neighbour entries that include a cell whose wall state flipped."""
+        for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                self._neighbours[self.cell_index(nx, ny)] = self._open_neighbours(nx, ny)
+    
     def find_path_positions(self) -> List[Tuple[int, int]]:
         """Find all positions that are not walls."""
         positions = []
@@ -226,34 +455,55 @@ class Maze:
                     positions.append((x, y))
         return positions
     
+    @property
+    def connectivity(self) -> ConnectivityIndex:
+        """Connected components of the open cells, kept up to date on wall changes."""
+        if self._connectivity is None:
+            self._connectivity = ConnectivityIndex(self)
+        return self._connectivity
+    
     def is_area_accessible(self, start_pos: Tuple[int, int], 
                           target_positions: List[Tuple[int, int]]) -> bool:
         """
         Check if all target positions are accessible from start position.
-        Uses simple flood fill algorithm.
+        Uses the connectivity index, so the check is near O(1) per target.
         """
         if not target_positions:
             return True
         
-        visited = set()
-        queue = [start_pos]
-        visited.add(start_pos)
-        
-        while queue:
-            x, y = queue.pop(0)
-            
-            # Check if we've reached all targets
-            if all(pos in visited for pos in target_positions):
-                return True
-            
-            # Add valid adjacent positions
-            for adj_x, adj_y in self.get_valid_adjacent_positions(x, y):
-                if (adj_x, adj_y) not in visited:
-                    visited.add((adj_x, adj_y))
-                    queue.append((adj_x, adj_y))
-        
-        # Check if all targets were reached
-        return all(pos in visited for pos in target_positions)
+        targets = set(target_positions)
+        targets.discard(start_pos)
+        if self.is_valid_position(*start_pos):
+            return self.connectivity.all_connected(start_pos, targets)
+        
+        # Starting inside a wall: flood fill from its open neighbours
+        visited = {start_pos}
+        queue = deque([start_pos])
+        while queue and targets:
+            x, y = queue.popleft()
+            for adjacent in self.get_valid_adjacent_positions(x, y):
+                if adjacent not in visited:
+                    visited.add(adjacent)
+                    targets.discard(adjacent)
+                    queue.append(adjacent)
+        
+        return not targets
+    
+    @property
+    def bitboards(self):
+        """Bitsets of every cell type (MazeBitboards), kept up to date on changes."""
+        if self._bitboards is None:
+            from bitboard import MazeBitboards
+            self._bitboards = MazeBitboards(self)
+        return self._bitboards
+    
+    @property
+    def chaos_planner(self):
+        """Planner that removes and restores walls for chaos events."""
+        if self._chaos_planner is None:
+            from chaos_planner import WallChaosPlanner
+            self._chaos_planner = WallChaosPlanner(self)
+        return self._chaos_planner
     
     def apply_chaos_mode(self, duration: float = 10.0, num_walls_to_remove: int = 5) -> None:
         """
@@ -263,28 +513,7 @@ class Maze:
             duration: How long the chaos lasts in seconds
             num_walls_to_remove: Number of walls to remove
         """
-        current_time = time.time()
-        end_time = current_time + duration
-        
-        # Find wall positions that can be safely removed
-        wall_positions = []
-        for y in range(1, self.height - 1):  # Don't remove border walls
-            for x in range(1, self.width - 1):
-                if self.grid[y][x] == CellType.WALL.value:
-                    wall_positions.append((x, y))
-        
-        # Randomly select walls to remove
-        walls_to_remove = random.sample(wall_positions, 
-                                       min(num_walls_to_remove, len(wall_positions)))
-        
-        for x, y in walls_to_remove:
-            # Create temporary modification
-            mod = TemporaryModification((x, y), CellType.WALL.value, 
-                                      CellType.PATH.value, end_time)
-            self.temporary_modifications[(x, y)] = mod
-            
-            # Apply the change
-            self.grid[y][x] = CellType.PATH.value
+        self.chaos_planner.remove_walls(num_walls_to_remove, duration)
     
     def update_temporary_modifications(self) -> int:
         """Update and remove expired temporary modifications.
@@ -292,23 +521,29 @@ class Maze:
         Returns:
             Number of pellets respawned
         """
-        current_time = time.time()
-        expired_mods = []
-        
-        for pos, mod in self.temporary_modifications.items():
-            if current_time >= mod.end_time:
-                # Restore original value
-                x, y = pos
-                self.grid[y][x] = mod.original_value
-                expired_mods.append(pos)
-        
-        # Remove expired modifications
-        for pos in expired_mods:
-            del self.temporary_modifications[pos]
+        self.restore_expired_modifications()
         
         # Handle pellet respawning
         return self.update_pellet_respawn()
     
+    def next_modification_expiry(self) -> float:
+        """Get when the next temporary modification ends (inf if none)."""
+        if self._chaos_planner is None:
+            return float('inf')
+        return self._chaos_planner.next_restore_time()
+    
+    def restore_expired_modifications(self) -> int:
+        """Restore cells whose temporary modifications have ended.
+        
+        Restorations that would seal a player or ghost in are postponed.
+        
+        Returns:
+            Number of cells restored
+        """
+        if self._chaos_planner is None:
+            return 0
+        return self._chaos_planner.restore_due()
+    
     def update_pellet_respawn(self) -> int:
         """
         Update pellet respawn system.
@@ -331,20 +566,7 @@ class Maze:
         Returns:
             Number of pellets respawned
         """
-        # Find empty path positions where pellets can be respawned
-        empty_positions = []
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                if (self.grid[y][x] == CellType.EMPTY.value and 
-                    (x, y) not in self.pellet_positions):
-                    # Don't respawn near player starting positions
-                    if not ((x, y) in [(1, 1), (self.width - 2, self.height - 2)]):
-                        # Don't respawn in center ghost area
-                        center_x = self.width // 2
-                        center_y = self.height // 2
-                        if not (abs(x - center_x) <= 2 and abs(y - center_y) <= 2):
-                            empty_positions.append((x, y))
+        empty_positions = self._respawn_candidates()
         
         # Randomly select positions to respawn pellets
         import random
@@ -354,22 +576,30 @@ class Maze:
             respawn_positions = random.sample(empty_positions, num_to_respawn)
             
             for x, y in respawn_positions:
-                self.grid[y][x] = CellType.PELLET.value
                 self.pellet_positions.add((x, y))
+                self.set_cell(x, y, CellType.PELLET.value)
         
         return num_to_respawn
     
+    def _respawn_candidates(self) -> List[Tuple[int, int]]:
+        """Find empty path positions where pellets can be respawned."""
+        # Empty cells outside the start cells and the ghost house, in one AND
+        candidates = self.bitboards.positions(self.bitboards.respawn_mask())
+        return [position for position in candidates if position not in self.pellet_positions]
+    
     def restore_original_maze(self) -> None:
-        """Restore the maze to its original state."""
-        self.grid = [row[:] for row in self.original_grid]
+        """Restore the maze to its original state.
+        
+        Only the cells that still differ from the original are visited.
+        """
         self.temporary_modifications.clear()
         
-        # Restore pellet positions (but keep collected ones removed)
-        for y in range(self.height):
-            for x in range(self.width):
-                if (self.original_grid[y][x] == CellType.PELLET.value and 
-                    (x, y) not in self.pellet_positions):
-                    self.grid[y][x] = CellType.EMPTY.value
+        # Restore cell by cell so listeners see each change
+        # (but keep collected pellets removed)
+        for (x, y), value in list(self._original_values.items()):
+            if value == CellType.PELLET.value and (x, y) not in self.pellet_positions:
+                value = CellType.EMPTY.value
+            self.set_cell(x, y, value)
     
     def get_pellet_count(self) -> int:
         """Get the current number of pellets remaining."""
@@ -379,13 +609,18 @@ class Maze:
         """Get the percentage of pellets collected."""
         if self.total_pellets == 0:
             return 100.0
-        collected_pellets = self.total_pellets - len(self.pellet_positions)
+        collected_pellets = self.total_pellets - self.get_pellet_count()
         return (collected_pellets / self.total_pellets) * 100.0
     
     def render(self, screen: pygame.Surface, offset_x: int = 0, offset_y: int = 0) -> None:
-        """Render the maze on the screen."""
-        for y in range(self.height):
-            for x in range(self.width):
+        """Render the part of the maze that falls on the screen."""
+        screen_width, screen_height = screen.get_size()
+        first_x = max(0, -offset_x // self.cell_size)
+        first_y = max(0, -offset_y // self.cell_size)
+        last_x = min(self.width, (screen_width - offset_x) // self.cell_size + 1)
+        last_y = min(self.height, (screen_height - offset_y) // self.cell_size + 1)
+        for y in range(first_y, last_y):
+            for x in range(first_x, last_x):
                 pixel_x = x * self.cell_size + offset_x
                 pixel_y = y * self.cell_size + offset_y
                 
@@ -430,6 +665,32 @@ class Maze:
         """Get the starting positions for both players."""
         return (1, 1), (self.width - 2, self.height - 2)
     
+    def get_spawn_positions(self, num_players: int) -> List[Tuple[int, int]]:
+        """
+        Get starting positions for any number of players.
+        
+        The first two match get_player_starting_positions, then the remaining
+        corners, then path cells spread evenly outside the ghost area.
+        """
+        positions = list(self.get_player_starting_positions())
+        for corner in [(1, self.height - 2), (self.width - 2, 1)]:
+            if self.is_valid_position(*corner):
+                positions.append(corner)
+        
+        if num_players > len(positions):
+            center_x = self.width // 2
+            center_y = self.height // 2
+            candidates = [pos for pos in self.find_path_positions()
+                          if pos not in positions and
+                          not (abs(pos[0] - center_x) <= 2 and abs(pos[1] - center_y) <= 2)]
+            needed = num_players - len(positions)
+            step = max(1, len(candidates) // max(1, needed))
+            positions.extend(candidates[::step][:needed])
+        
+        if num_players > len(positions):
+            raise ValueError(f"Maze has room for at most {len(positions)} players")
+        return positions[:num_players]
+    
     def find_empty_positions_near(self, center: Tuple[int, int], 
                                  radius: int = 3) -> List[Tuple[int, int]]:
         """Find empty positions near a center point."""
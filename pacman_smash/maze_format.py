@@ -0,0 +1,230 @@
+"""
+Compact on-disk maze format for Pacman Smash.
+Levels are stored as bit-packed cell layers and loaded through a memory map.
+Navigation data derived from a level is cached in separate files keyed by a
+hash of its walls, so it is computed once per layout rather than per start.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from maze import Maze, CellType
+from nav_graph import CorridorGraph
+from navigation import DistanceCache
+
+MAZE_MAGIC = b"PSMZ"
+NAV_MAGIC = b"PSNV"
+FORMAT_VERSION = 1
+
+# magic, version, section count, width, height, sha256 digest
+HEADER = struct.Struct("<4sHHII32s")
+# name, dtype, rows, columns (0 for 1-D sections), byte offset
+SECTION = struct.Struct("<16s4sQQQ")
+ALIGNMENT = 8
+
+# Cell layers stored one bit per cell; open cells in none of them are PATH
+LAYERS = {
+    'walls': CellType.WALL.value,
+    'pellets': CellType.PELLET.value,
+    'powerups': CellType.POWER_UP.value,
+    'empty': CellType.EMPTY.value,
+}
+
+# Bits of the adjacency table, in get_valid_adjacent_positions order
+ADJACENT_UP, ADJACENT_DOWN, ADJACENT_LEFT, ADJACENT_RIGHT = 1, 2, 4, 8
+
+def _write_container(path: str, magic: bytes, width: int, height: int, digest: bytes,
+                     sections: Dict[str, np.ndarray]) -> None:
+    """Write named arrays after a header and a section table."""
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    payloads = []
+    for name, array in sections.items():
+        array = np.ascontiguousarray(array)
+        offset += -offset % ALIGNMENT
+        rows, columns = (array.shape[0], 0) if array.ndim == 1 else array.shape
+        table.append(SECTION.pack(name.encode(), array.dtype.str[1:].encode(),
+                                  rows, columns, offset))
+        payloads.append((offset, array.tobytes()))
+        offset += array.nbytes
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(magic, FORMAT_VERSION, len(sections), width, height, digest))
+        file.writelines(table)
+        for start, data in payloads:
+            file.write(b"\0" * (start - file.tell()))
+            file.write(data)
+    os.replace(temporary_path, path)  # Readers never see a half-written file
+
+def _read_container(path: str, magic: bytes) -> Tuple[int, int, bytes, Dict[str, np.ndarray]]:
+    """
+    Memory-map a container and view its sections without copying.
+
+    Returns:
+        (width, height, digest, sections); the arrays are read-only views
+        that keep the mapping alive
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    found_magic, version, count, width, height, digest = HEADER.unpack_from(mapped, 0)
+    if found_magic != magic:
+        raise ValueError(f"{path} is not a {magic.decode()} file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+
+    sections = {}
+    for i in range(count):
+        name, dtype, rows, columns, offset = SECTION.unpack_from(
+            mapped, HEADER.size + i * SECTION.size)
+        dtype = np.dtype("<" + dtype.rstrip(b"\0").decode())
+        shape = (rows,) if columns == 0 else (rows, columns)
+        sections[name.rstrip(b"\0").decode()] = np.frombuffer(
+            mapped, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+    return width, height, digest, sections
+
+def _digest(width: int, height: int, *packed: np.ndarray) -> bytes:
+    sha = hashlib.sha256(struct.pack("<II", width, height))
+    for array in packed:
+        sha.update(array.tobytes())
+    return sha.digest()
+
+def _grid_array(maze: Maze) -> np.ndarray:
+    return np.array(maze.grid, dtype=np.uint8).reshape(maze.height, maze.width)
+
+def walls_hash(maze: Maze) -> str:
+    """Hash of a maze's size and walls, the key of its navigation data."""
+    walls = np.packbits(_grid_array(maze) == CellType.WALL.value)
+    return _digest(maze.width, maze.height, walls).hex()
+
+def save_maze(maze: Maze, path: str) -> str:
+    """
+    Save a maze's current cells as bit-packed layers.
+
+    Returns:
+        The content hash of the saved level
+    """
+    grid = _grid_array(maze)
+    sections = {name: np.packbits(grid == value) for name, value in LAYERS.items()}
+    digest = _digest(maze.width, maze.height, *sections.values())
+    _write_container(path, MAZE_MAGIC, maze.width, maze.height, digest, sections)
+    return digest.hex()
+
+def load_maze(path: str, verify: bool = True) -> Maze:
+    """
+    Load a level saved with save_maze.
+
+    Args:
+        path: Level file
+        verify: Check the content hash (catches truncated or edited files)
+
+    Returns:
+        A maze with exactly the saved cells
+    """
+    width, height, digest, sections = _read_container(path, MAZE_MAGIC)
+    if verify and _digest(width, height, *(sections[name] for name in LAYERS)) != digest:
+        raise ValueError(f"{path} does not match its content hash")
+
+    cells = width * height
+    grid = np.full(cells, CellType.PATH.value, dtype=np.uint8)
+    for name, value in LAYERS.items():
+        grid[np.unpackbits(sections[name], count=cells).astype(bool)] = value
+    return Maze(width, height, layout=grid.reshape(height, width).tolist())
+
+def adjacency_table(maze: Maze) -> np.ndarray:
+    """
+    Get every cell's open neighbours as a bitmask (ADJACENT_* bits).
+
+    Returns:
+        (height, width) uint8 array; walls have no neighbours
+    """
+    open_cells = np.pad(_grid_array(maze) != CellType.WALL.value, 1)
+    center = open_cells[1:-1, 1:-1]
+    table = np.zeros(center.shape, dtype=np.uint8)
+    table |= np.where(center & open_cells[:-2, 1:-1], ADJACENT_UP, 0).astype(np.uint8)
+    table |= np.where(center & open_cells[2:, 1:-1], ADJACENT_DOWN, 0).astype(np.uint8)
+    table |= np.where(center & open_cells[1:-1, :-2], ADJACENT_LEFT, 0).astype(np.uint8)
+    table |= np.where(center & open_cells[1:-1, 2:], ADJACENT_RIGHT, 0).astype(np.uint8)
+    return table
+
+@dataclass
+class NavData:
+    """Navigation data restored from the cache for one maze."""
+    adjacency: np.ndarray  # Read-only view into the cache file
+    nav_graph: Optional[CorridorGraph]
+    distance_sources: int  # Number of distance fields loaded
+
+def nav_cache_path(maze: Maze, cache_dir: str) -> str:
+    """Get the cache file for a maze's current walls."""
+    return os.path.join(cache_dir, walls_hash(maze) + ".nav")
+
+def save_nav_data(maze: Maze, cache_dir: str, nav_graph: Optional[CorridorGraph] = None,
+                  distance_cache: Optional[DistanceCache] = None) -> str:
+    """
+    Cache navigation data derived from a maze's current walls.
+
+    Args:
+        maze: Maze the data belongs to
+        cache_dir: Directory of cache files
+        nav_graph: Corridor graph to store
+        distance_cache: Cache whose distance fields are stored
+
+    Returns:
+        Path of the cache file
+    """
+    sections = {'adjacent': adjacency_table(maze)}
+    if nav_graph is not None:
+        for name, array in nav_graph.to_arrays().items():
+            sections['g_' + name] = array
+    if distance_cache is not None:
+        sources = distance_cache.cached_sources()
+        fields = np.full((len(sources), maze.width * maze.height), -1, dtype=np.int32)
+        for row, source in enumerate(sources):
+            for (x, y), distance in distance_cache.distances_from(source).items():
+                fields[row, y * maze.width + x] = distance
+        sections['d_source'] = np.array(sources, dtype=np.int32).reshape(-1, 2)
+        sections['d_fields'] = fields
+
+    os.makedirs(cache_dir, exist_ok=True)
+    path = nav_cache_path(maze, cache_dir)
+    _write_container(path, NAV_MAGIC, maze.width, maze.height,
+                     bytes.fromhex(walls_hash(maze)), sections)
+    return path
+
+def load_nav_data(maze: Maze, cache_dir: str,
+                  distance_cache: Optional[DistanceCache] = None) -> Optional[NavData]:
+    """
+    Restore cached navigation data for a maze's current walls.
+
+    Args:
+        maze: Maze to restore data for
+        cache_dir: Directory of cache files
+        distance_cache: Cache to seed with the stored distance fields
+
+    Returns:
+        The restored data, or None if nothing is cached for these walls
+    """
+    path = nav_cache_path(maze, cache_dir)
+    if not os.path.exists(path):
+        return None
+    width, height, digest, sections = _read_container(path, NAV_MAGIC)
+    if digest.hex() != walls_hash(maze):
+        return None
+
+    nav_graph = None
+    graph_arrays = {name[2:]: array for name, array in sections.items() if name.startswith('g_')}
+    if graph_arrays:
+        nav_graph = CorridorGraph(maze, arrays=graph_arrays)
+
+    loaded = 0
+    if distance_cache is not None and 'd_source' in sections:
+        for (x, y), field in zip(sections['d_source'].tolist(), sections['d_fields']):
+            reachable = np.flatnonzero(field >= 0)
+            cells = zip((reachable % width).tolist(), (reachable // width).tolist())
+            distance_cache.store_field((x, y), dict(zip(cells, field[reachable].tolist())))
+            loaded += 1
+    return NavData(sections['adjacent'], nav_graph, loaded)
@@ -0,0 +1,301 @@
+"""
+Seeded procedural maze generators for Pacman Smash.
+Every generator returns a (height, width) array of CellType values and is
+vectorized with NumPy or linear in the number of cells, so huge maps can be
+generated quickly. The same seed always produces the same maze.
+
+Generators carve a lattice: cells at odd coordinates, with the cells in
+between acting as the walls that get knocked through. The player starts at
+(1, 1) and (width - 2, height - 2) and the 5x5 ghost house in the centre are
+always open and connected to each other.
+"""
+
+import itertools
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+from maze import CellType
+
+WALL = CellType.WALL.value
+PATH = CellType.PATH.value
+
+# Smallest maze with a border, a ghost house and two start cells
+MIN_SIZE = 7
+
+def _empty_grid(width: int, height: int) -> np.ndarray:
+    if width < MIN_SIZE or height < MIN_SIZE:
+        raise ValueError(f"Mazes must be at least {MIN_SIZE}x{MIN_SIZE}, got {width}x{height}")
+    return np.full((height, width), WALL, dtype=np.uint8)
+
+def _lattice_shape(width: int, height: int) -> Tuple[int, int]:
+    """Number of lattice cells as (rows, columns)."""
+    return (height - 1) // 2, (width - 1) // 2
+
+def _carve_required_areas(grid: np.ndarray) -> None:
+    """Open the ghost house and the start cells and tie them into the lattice."""
+    height, width = grid.shape
+    center_x, center_y = width // 2, height // 2
+    # The 5x5 house always covers lattice cells, so it joins the lattice
+    grid[center_y - 2:center_y + 3, center_x - 2:center_x + 3] = PATH
+
+    for x, y in ((1, 1), (width - 2, height - 2)):
+        # A start on an even coordinate is one step from the lattice cell before it
+        lattice_x = x if x % 2 == 1 else x - 1
+        lattice_y = y if y % 2 == 1 else y - 1
+        grid[lattice_y:y + 1, lattice_x:x + 1] = PATH
+
+def binary_tree(width: int, height: int, seed: Optional[int] = None,
+                north_bias: float = 0.5) -> np.ndarray:
+    """
+    Generate a perfect maze where every cell opens north or east.
+
+    Fully vectorized: one random draw per lattice cell.
+
+    Args:
+        width: Maze width in cells
+        height: Maze height in cells
+        seed: Random seed
+        north_bias: Chance that a cell opens north rather than east
+    """
+    rng = np.random.default_rng(seed)
+    grid = _empty_grid(width, height)
+    rows, columns = _lattice_shape(width, height)
+    cells = grid[1:2 * rows:2, 1:2 * columns:2]
+    cells[:] = PATH
+
+    north = rng.random((rows, columns)) < north_bias
+    north[0, :] = False  # The top row can only go east
+    north[:, -1] = True  # The right column can only go north
+    north[0, -1] = False  # The top-right corner is the root
+    east = ~north
+    east[0, -1] = False
+
+    # Wall cells north of and east of each lattice cell
+    grid[0:2 * rows - 1:2, 1:2 * columns:2][north] = PATH
+    grid[1:2 * rows:2, 2:2 * columns + 1:2][east] = PATH
+
+    _carve_required_areas(grid)
+    return grid
+
+def sidewinder(width: int, height: int, seed: Optional[int] = None,
+               close_chance: float = 0.5) -> np.ndarray:
+    """
+    Generate a perfect maze of horizontal runs, each joined north once.
+
+    Vectorized over the whole lattice: runs are split at the cells that close
+    them and each run picks its north exit with one random draw.
+
+    Args:
+        width: Maze width in cells
+        height: Maze height in cells
+        seed: Random seed
+        close_chance: Chance that a run ends at each cell
+    """
+    rng = np.random.default_rng(seed)
+    grid = _empty_grid(width, height)
+    rows, columns = _lattice_shape(width, height)
+    grid[1:2 * rows:2, 1:2 * columns:2] = PATH
+
+    # The top row is a single open corridor
+    grid[1, 1:2 * columns] = PATH
+
+    if rows > 1:
+        closes = rng.random((rows - 1, columns)) < close_chance
+        closes[:, -1] = True  # Runs never continue past the row
+        # Cells that keep the run going open their east wall
+        grid[3:2 * rows:2, 2:2 * columns:2][~closes[:, :-1]] = PATH
+
+        flat_closes = closes.ravel()
+        run_ends = np.flatnonzero(flat_closes)
+        run_starts = np.concatenate(([0], run_ends[:-1] + 1))
+        lengths = run_ends - run_starts + 1
+        picks = run_starts + (rng.random(len(lengths)) * lengths).astype(np.int64)
+        pick_rows = picks // columns + 1  # Lattice row (offset past the top row)
+        pick_columns = picks % columns
+        grid[2 * pick_rows, 2 * pick_columns + 1] = PATH
+
+    _carve_required_areas(grid)
+    return grid
+
+def recursive_backtracker(width: int, height: int, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Generate a perfect maze of long winding corridors.
+
+    Iterative depth-first search with an explicit stack, linear in the number
+    of cells. The walk is inherently sequential, so it is kept as lean as
+    possible: flat lattice indices with a border of visited sentinels (no
+    bounds checks), one pre-drawn direction order per cell, and only each
+    cell's parent recorded. The walls are knocked through afterwards with a
+    single NumPy assignment.
+
+    Args:
+        width: Maze width in cells
+        height: Maze height in cells
+        seed: Random seed
+    """
+    rng = np.random.default_rng(seed)
+    grid = _empty_grid(width, height)
+    rows, columns = _lattice_shape(width, height)
+
+    # Lattice cell (row, column) is flat index (row + 1) * stride + column + 1
+    stride = columns + 2
+    size = stride * (rows + 2)
+    visited = bytearray(b'\x01') * size
+    for row in range(1, rows + 1):
+        visited[row * stride + 1:row * stride + 1 + columns] = bytes(columns)
+    orders = list(itertools.permutations((-stride, stride, -1, 1)))
+    order_of = rng.integers(0, len(orders), size).tolist()
+    parent = [0] * size  # 0 is a border sentinel, so it never names a real parent
+
+    root = stride + 1
+    visited[root] = 1
+    stack = [root]
+    push, pop = stack.append, stack.pop
+    while stack:
+        cell = stack[-1]
+        for step in orders[order_of[cell]]:
+            next_cell = cell + step
+            if not visited[next_cell]:
+                visited[next_cell] = 1
+                parent[next_cell] = cell
+                push(next_cell)
+                break
+        else:
+            pop()
+
+    grid[1:2 * rows:2, 1:2 * columns:2] = PATH
+    parents = np.array(parent)
+    children = np.flatnonzero(parents)
+    child_rows, child_columns = np.divmod(children, stride)
+    parent_rows, parent_columns = np.divmod(parents[children], stride)
+    # The wall between two lattice cells sits halfway between them
+    grid[child_rows + parent_rows - 1, child_columns + parent_columns - 1] = PATH
+
+    _carve_required_areas(grid)
+    return grid
+
+def braid(grid: np.ndarray, fraction: float = 1.0, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Remove dead ends from a lattice maze by knocking through one more wall.
+
+    Vectorized: dead ends are found from the open-wall counts of every cell
+    and each picks a random closed direction. Only walls are removed, so the
+    maze stays connected.
+
+    Args:
+        grid: Maze from one of the lattice generators
+        fraction: Share of dead ends to remove (1.0 = a fully braided maze)
+        seed: Random seed
+
+    Returns:
+        A new braided grid
+    """
+    rng = np.random.default_rng(seed)
+    grid = grid.copy()
+    height, width = grid.shape
+    rows, columns = _lattice_shape(width, height)
+    cell_y = np.arange(rows) * 2 + 1
+    cell_x = np.arange(columns) * 2 + 1
+
+    # Wall cells around every lattice cell: north, south, west, east
+    neighbours = np.stack([
+        grid[cell_y - 1][:, cell_x],
+        grid[cell_y + 1][:, cell_x],
+        grid[cell_y][:, cell_x - 1],
+        grid[cell_y][:, cell_x + 1],
+    ], axis=-1)
+    is_open = neighbours != WALL
+    # Knocking through the border is not allowed
+    can_open = ~is_open
+    can_open[0, :, 0] = False
+    can_open[-1, :, 1] = False
+    can_open[:, 0, 2] = False
+    can_open[:, -1, 3] = False
+
+    dead_ends = (is_open.sum(axis=-1) == 1) & can_open.any(axis=-1)
+    dead_ends &= rng.random((rows, columns)) < fraction
+    scores = np.where(can_open, rng.random(can_open.shape), -1.0)
+    direction = scores.argmax(axis=-1)
+
+    d_y = np.array([-1, 1, 0, 0])[direction]
+    d_x = np.array([0, 0, -1, 1])[direction]
+    rows_index, columns_index = np.nonzero(dead_ends)
+    grid[cell_y[rows_index] + d_y[dead_ends], cell_x[columns_index] + d_x[dead_ends]] = PATH
+    return grid
+
+def braided(width: int, height: int, seed: Optional[int] = None,
+            fraction: float = 0.8) -> np.ndarray:
+    """Generate a sidewinder maze and braid away most of its dead ends."""
+    return braid(sidewinder(width, height, seed), fraction, seed)
+
+def rooms_and_corridors(width: int, height: int, seed: Optional[int] = None,
+                        room_density: float = 0.3, min_room: int = 3,
+                        max_room: int = 9) -> np.ndarray:
+    """
+    Generate rectangular rooms joined by L-shaped corridors.
+
+    Rooms are carved with array slices and chained in a snake order over
+    horizontal bands, so corridors stay short; the ghost house and the start
+    cells are part of the chain, which keeps everything connected. Linear in
+    the number of rooms plus the cells carved.
+
+    Args:
+        width: Maze width in cells
+        height: Maze height in cells
+        seed: Random seed
+        room_density: Rough share of the map covered by rooms
+        min_room: Smallest room side
+        max_room: Largest room side
+    """
+    rng = np.random.default_rng(seed)
+    grid = _empty_grid(width, height)
+    max_room = max(min_room, min(max_room, width - 2, height - 2))
+    count = max(1, int(width * height * room_density / ((min_room + max_room) / 2) ** 2))
+
+    room_w = rng.integers(min_room, max_room + 1, count)
+    room_h = rng.integers(min_room, max_room + 1, count)
+    left = (rng.random(count) * (width - 1 - room_w)).astype(np.int64) + 1
+    top = (rng.random(count) * (height - 1 - room_h)).astype(np.int64) + 1
+    for x, y, w, h in zip(left.tolist(), top.tolist(), room_w.tolist(), room_h.tolist()):
+        grid[y:y + h, x:x + w] = PATH
+
+    # Chain room centres with the required areas in a snake order
+    centers: List[Tuple[int, int]] = list(zip((left + room_w // 2).tolist(),
+                                              (top + room_h // 2).tolist()))
+    centers += [(1, 1), (width - 2, height - 2), (width // 2, height // 2)]
+    band = 2 * max_room
+    centers.sort(key=lambda c: (c[1] // band, c[0] if (c[1] // band) % 2 == 0 else -c[0]))
+    for (x0, y0), (x1, y1) in zip(centers, centers[1:]):
+        grid[y0, min(x0, x1):max(x0, x1) + 1] = PATH
+        grid[min(y0, y1):max(y0, y1) + 1, x1] = PATH
+
+    center_x, center_y = width // 2, height // 2
+    grid[center_y - 2:center_y + 3, center_x - 2:center_x + 3] = PATH
+    return grid
+
+# Generators available by name (e.g. Maze(generator="braided"))
+GENERATORS: Dict[str, Callable[..., np.ndarray]] = {
+    'binary_tree': binary_tree,
+    'sidewinder': sidewinder,
+    'braided': braided,
+    'backtracker': recursive_backtracker,  # Sequential walk: for maps up to ~1000x1000
+    'rooms': rooms_and_corridors,
+}
+
+def generate(name: str, width: int, height: int, seed: Optional[int] = None,
+             **options) -> np.ndarray:
+    """
+    Generate a maze with a named generator.
+
+    Args:
+        name: One of the GENERATORS keys
+        width: Maze width in cells
+        height: Maze height in cells
+        seed: Random seed
+        **options: Generator-specific options
+
+    Returns:
+        (height, width) array of CellType values
+    """
+    if name not in GENERATORS:
+        raise ValueError(f"Unknown maze generator '{name}', expected one of {sorted(GENERATORS)}")
+    return GENERATORS[name](width, height, seed, **options)
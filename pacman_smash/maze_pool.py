@@ -0,0 +1,138 @@
+"""
+Background maze pre-generation for Pacman Smash.
+Worker processes build mazes and their navigation data ahead of demand so a
+new match can start on a ready maze instantly.
+"""
+
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Optional
+from maze import Maze
+from hpa import create_route_planner
+
+@dataclass
+class PreparedMaze:
+    """A generated maze with its derived navigation data already built."""
+    maze: Maze
+    nav_graph: Any  # CorridorGraph or HierarchicalPathfinder, kept in sync with maze
+    seed: Optional[int]
+
+def prepare_maze(width: int, height: int, generator: Optional[str] = None,
+                 seed: Optional[int] = None, precompute: bool = True) -> PreparedMaze:
+    """
+    Build a maze and, optionally, everything a match derives from it.
+
+    Runs in a worker process; the result is pickled back whole, including the
+    cell listeners that keep the derived data in sync with the maze.
+
+    Args:
+        width: Maze width in cells
+        height: Maze height in cells
+        generator: Procedural generator name (None = classic layout)
+        seed: Generator seed
+        precompute: Also build the connectivity index, chaos wall index and
+            route planner
+    """
+    maze = Maze(width, height, generator=generator, seed=seed)
+    nav_graph = None
+    if precompute:
+        # Touch the lazily built indexes so they ship with the maze
+        maze.connectivity
+        maze.chaos_planner
+        nav_graph = create_route_planner(maze)
+    return PreparedMaze(maze, nav_graph, seed)
+
+class MazePool:
+    """
+    Bounded queue of mazes being prepared in worker processes.
+
+    The pool keeps up to size mazes submitted at all times. take() hands out
+    the oldest one, which has usually finished long before it is needed, and
+    immediately submits a replacement. Seeds advance from base_seed so the
+    sequence of mazes is reproducible.
+    """
+
+    def __init__(self, width: int, height: int, generator: Optional[str] = "braided",
+                 size: int = 2, workers: int = 1, base_seed: Optional[int] = None,
+                 precompute: bool = True,
+                 executor_factory: Optional[Callable[[int], Executor]] = None):
+        """
+        Initialize the pool and start preparing mazes.
+
+        Args:
+            width: Maze width in cells
+            height: Maze height in cells
+            generator: Procedural generator name (None = classic layout)
+            size: Number of mazes kept ready or in progress
+            workers: Number of worker processes
+            base_seed: Seed of the first maze (None = random mazes)
+            precompute: Build navigation data in the workers too
+            executor_factory: Creates the executor from a worker count
+                (defaults to a ProcessPoolExecutor)
+        """
+        self.width = width
+        self.height = height
+        self.generator = generator
+        self.size = max(1, size)
+        self.precompute = precompute
+        self._next_seed = base_seed
+        factory = executor_factory or (lambda count: ProcessPoolExecutor(max_workers=count))
+        self._executor: Optional[Executor] = factory(workers)
+        self._pending: Deque[Future] = deque()
+
+        # Statistics
+        self.taken = 0
+        self.waited = 0  # take() calls that had to wait for a maze
+
+        self._fill()
+
+    def _fill(self) -> None:
+        """Submit mazes until the pool is full."""
+        while len(self._pending) < self.size:
+            seed = self._next_seed
+            if seed is not None:
+                self._next_seed = seed + 1
+            self._pending.append(self._executor.submit(
+                prepare_maze, self.width, self.height, self.generator, seed, self.precompute))
+
+    def ready_count(self) -> int:
+        """Number of mazes that can be taken without waiting."""
+        return sum(1 for future in self._pending if future.done())
+
+    def take(self, timeout: Optional[float] = None) -> PreparedMaze:
+        """
+        Take the oldest prepared maze and queue a replacement.
+
+        Args:
+            timeout: Most seconds to wait if the maze is still being built
+
+        Returns:
+            The prepared maze
+        """
+        if self._executor is None:
+            raise RuntimeError("MazePool is closed")
+        future = self._pending[0]
+        if not future.done():
+            self.waited += 1
+        prepared = future.result(timeout)  # On timeout the maze stays queued
+        self._pending.popleft()
+        self._fill()
+        self.taken += 1
+        return prepared
+
+    def close(self) -> None:
+        """Stop the workers and drop mazes still being prepared."""
+        if self._executor is None:
+            return
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def __enter__(self) -> 'MazePool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,153 @@
+"""
+Columnar performance history for Pacman Smash.
+Stores every player's metrics in a (players x time x metric) ring buffer so
+trends and comparisons are computed for all players at once.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+# Metrics sampled for every player at each tracking tick (score velocity is
+# derived from the score column by velocity())
+METRIC_NAMES = ('score', 'avg_speed', 'pellet_rate', 'death_rate')
+
+class MetricsStore:
+    """
+    Fixed-size ring buffer of metric samples for all players.
+
+    Each record() writes one time slice for every registered player; the oldest
+    slice is overwritten once the buffer is full. Queries return arrays indexed
+    by player row, in registration order.
+    """
+
+    def __init__(self, capacity: int = 64, metric_names: Iterable[str] = METRIC_NAMES,
+                 initial_players: int = 4):
+        """
+        Initialize the store.
+
+        Args:
+            capacity: Number of time slices kept
+            metric_names: Names of the metric columns
+            initial_players: Player rows to allocate up front (grows on demand)
+        """
+        self.capacity = capacity
+        self.metric_names = tuple(metric_names)
+        self.metric_index = {name: i for i, name in enumerate(self.metric_names)}
+
+        self._data = np.zeros((initial_players, capacity, len(self.metric_names)))
+        self._times = np.zeros(capacity)
+        self._head = 0  # Slot the next slice is written to
+        self._count = 0
+
+        self.player_ids: List[int] = []
+        self.rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def num_players(self) -> int:
+        return len(self.player_ids)
+
+    def add_player(self, player_id: int) -> int:
+        """Register a player and return its row (existing rows are reused)."""
+        if player_id in self.rows:
+            return self.rows[player_id]
+
+        row = len(self.player_ids)
+        if row == self._data.shape[0]:
+            grown = np.zeros((row * 2, self.capacity, len(self.metric_names)))
+            grown[:row] = self._data
+            self._data = grown
+        self.player_ids.append(player_id)
+        self.rows[player_id] = row
+        return row
+
+    def record(self, current_time: float, values: np.ndarray) -> None:
+        """
+        Append one time slice.
+
+        Args:
+            current_time: Sample timestamp
+            values: (num_players, num_metrics) array in row order
+        """
+        self._data[:self.num_players, self._head] = values
+        self._times[self._head] = current_time
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _slots(self, samples: Optional[int]) -> np.ndarray:
+        """Ring slots of the most recent samples, oldest first."""
+        count = self._count if samples is None else min(samples, self._count)
+        return (self._head - count + np.arange(count)) % self.capacity
+
+    def history(self, metric: str,
+                samples: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get recent samples of one metric for all players.
+
+        Returns:
+            (times, values) with shapes (T,) and (num_players, T), oldest first
+        """
+        slots = self._slots(samples)
+        column = self.metric_index[metric]
+        return self._times[slots], self._data[:self.num_players, slots, column]
+
+    def latest(self, metric: str) -> np.ndarray:
+        """Get the newest value of a metric for every player."""
+        if not self._count:
+            return np.zeros(self.num_players)
+        return self._data[:self.num_players, (self._head - 1) % self.capacity,
+                          self.metric_index[metric]]
+
+    def velocity(self, metric: str = 'score', samples: Optional[int] = 5) -> np.ndarray:
+        """Get each player's change per second across the last samples."""
+        times, values = self.history(metric, samples)
+        if len(times) < 2:
+            return np.zeros(self.num_players)
+        return (values[:, -1] - values[:, 0]) / max(0.001, times[-1] - times[0])
+
+    def trend_slopes(self, metric: str = 'score',
+                     samples: Optional[int] = None) -> np.ndarray:
+        """Get each player's least-squares slope (per second) over the last samples."""
+        times, values = self.history(metric, samples)
+        if len(times) < 2:
+            return np.zeros(self.num_players)
+        centered = times - times.mean()
+        denominator = float(centered @ centered)
+        if denominator == 0.0:
+            return np.zeros(self.num_players)
+        return (values - values.mean(axis=1, keepdims=True)) @ centered / denominator
+
+    def imbalance(self, metric: str = 'score') -> Optional[Tuple[int, int, float]]:
+        """
+        Compare the best and worst players on the newest sample.
+
+        Returns:
+            (leader_id, trailer_id, ratio) or None with fewer than two players
+        """
+        if self.num_players < 2 or not self._count:
+            return None
+        values = self.latest(metric)
+        leader = int(np.argmax(values))
+        trailer = int(np.argmin(values))
+        low = values[trailer]
+        if low == 0:
+            ratio = float('inf') if values[leader] > 0 else 0.0
+        else:
+            ratio = float(values[leader] / low)
+        return self.player_ids[leader], self.player_ids[trailer], ratio
+
+    def relative(self, metric: str = 'score') -> np.ndarray:
+        """Get each player's newest value divided by the field average."""
+        values = self.latest(metric)
+        mean = values.mean() if len(values) else 0.0
+        if mean == 0:
+            return np.ones(self.num_players)
+        return values / mean
+
+    def clear(self) -> None:
+        """Drop all samples (player rows are kept)."""
+        self._data[:] = 0.0
+        self._head = 0
+        self._count = 0
@@ -0,0 +1,337 @@
+"""
+Corridor-compressed navigation graph for Pacman Smash.
+Junctions and dead ends become nodes and the corridors between them become
+weighted edges, so route searches visit a small fraction of the maze cells.
+"""
+
+import heapq
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from maze import Maze, CellType
+
+Position = Tuple[int, int]
+Path = Tuple[Position, ...]
+
+@dataclass
+class Corridor:
+    """An edge of the graph: the cells strictly between two nodes."""
+    start: Position
+    end: Position
+    cells: Tuple[Position, ...]  # Ordered from start to end
+
+    @property
+    def length(self) -> int:
+        return len(self.cells) + 1
+
+class CorridorGraph:
+    """
+    Graph of junctions and dead ends joined by corridors.
+
+    Built once from the grid and kept up to date through the maze's cell
+    listener: a wall change marks its neighbourhood dirty, and the next query
+    re-traces only the corridors that ran through it.
+    """
+
+    def __init__(self, maze: Maze, arrays: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Initialize the graph and start listening for wall changes.
+
+        Args:
+            maze: Maze to compress
+            arrays: Graph saved with to_arrays() for this maze's walls; used
+                instead of tracing the grid
+        """
+        self.maze = maze
+        self.nodes: Set[Position] = set()
+        self.corridors: Dict[int, Corridor] = {}
+        self._adjacency: Dict[Position, Set[int]] = {}
+        self._cell_corridor: Dict[Position, int] = {}  # Interior cell -> corridor
+        self._forced_nodes: Set[Position] = set()  # Anchors for cycles with no junction
+        self._next_id = 0
+        self._dirty: Set[Position] = set()
+
+        if arrays is not None:
+            self._load_arrays(arrays)
+        else:
+            self.rebuild()
+        maze.add_cell_listener(self._on_cell_changed)
+
+    def detach(self) -> None:
+        """Stop following maze changes."""
+        self.maze.remove_cell_listener(self._on_cell_changed)
+
+    def _on_cell_changed(self, x: int, y: int, old_value: int, new_value: int) -> None:
+        wall = CellType.WALL.value
+        if (old_value == wall) != (new_value == wall):  # Pellets do not change the graph
+            self._dirty.add((x, y))
+
+    def _degree(self, cell: Position) -> int:
+        return len(self.maze.get_valid_adjacent_positions(*cell))
+
+    def _is_node(self, cell: Position) -> bool:
+        return cell in self._forced_nodes or self._degree(cell) != 2
+
+    def _add_corridor(self, start: Position, end: Position, cells: List[Position]) -> None:
+        corridor_id = self._next_id
+        self._next_id += 1
+        self.corridors[corridor_id] = Corridor(start, end, tuple(cells))
+        self._adjacency.setdefault(start, set()).add(corridor_id)
+        self._adjacency.setdefault(end, set()).add(corridor_id)
+        for cell in cells:
+            self._cell_corridor[cell] = corridor_id
+
+    def _remove_corridor(self, corridor_id: int) -> Corridor:
+        corridor = self.corridors.pop(corridor_id)
+        for node in (corridor.start, corridor.end):
+            if node in self._adjacency:
+                self._adjacency[node].discard(corridor_id)
+        for cell in corridor.cells:
+            if self._cell_corridor.get(cell) == corridor_id:
+                del self._cell_corridor[cell]
+        return corridor
+
+    def _has_corridor_via(self, node: Position, step: Position) -> bool:
+        """Check if a corridor already leaves node through the adjacent cell step."""
+        if step in self.nodes:
+            return any(
+                {self.corridors[c].start, self.corridors[c].end} == {node, step}
+                and not self.corridors[c].cells
+                for c in self._adjacency.get(node, ())
+            )
+        return step in self._cell_corridor
+
+    def _trace_from(self, node: Position) -> None:
+        """Trace every untraced corridor leaving a node."""
+        get_adjacent = self.maze.get_valid_adjacent_positions
+        for step in get_adjacent(*node):
+            if self._has_corridor_via(node, step):
+                continue
+            cells = []
+            previous, current = node, step
+            while current not in self.nodes:
+                cells.append(current)
+                following = [cell for cell in get_adjacent(*current) if cell != previous]
+                previous, current = current, following[0]
+            self._add_corridor(node, current, cells)
+
+    def _cover_cycles(self, cells: Set[Position]) -> None:
+        """Anchor node-less loops among cells so every open cell is covered."""
+        for cell in cells:
+            if (self.maze.is_valid_position(*cell) and cell not in self.nodes and
+                    cell not in self._cell_corridor):
+                self._forced_nodes.add(cell)
+                self.nodes.add(cell)
+                self._trace_from(cell)
+
+    def rebuild(self) -> None:
+        """Build the whole graph from the grid."""
+        self.nodes.clear()
+        self.corridors.clear()
+        self._adjacency.clear()
+        self._cell_corridor.clear()
+        self._forced_nodes.clear()
+        self._dirty.clear()
+
+        open_cells = set(self.maze.find_path_positions())
+        self.nodes = {cell for cell in open_cells if self._degree(cell) != 2}
+        for node in list(self.nodes):
+            self._trace_from(node)
+        self._cover_cycles(open_cells)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Flatten the graph into integer arrays (e.g. for saving to disk).
+
+        Corridor cells are concatenated; corridor i owns
+        cells[offsets[i]:offsets[i + 1]].
+        """
+        self._sync()
+        corridors = list(self.corridors.values())
+        lengths = [len(corridor.cells) for corridor in corridors]
+        cells = [cell for corridor in corridors for cell in corridor.cells]
+        return {
+            'nodes': np.array(sorted(self.nodes), dtype=np.int32).reshape(-1, 2),
+            'forced': np.array(sorted(self._forced_nodes), dtype=np.int32).reshape(-1, 2),
+            'ends': np.array([corridor.start + corridor.end for corridor in corridors],
+                             dtype=np.int32).reshape(-1, 4),
+            'offsets': np.concatenate(([0], np.cumsum(lengths))).astype(np.int32),
+            'cells': np.array(cells, dtype=np.int32).reshape(-1, 2),
+        }
+
+    def _load_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        """Restore a graph flattened by to_arrays()."""
+        self.nodes = {tuple(node) for node in arrays['nodes'].tolist()}
+        self._forced_nodes = {tuple(node) for node in arrays['forced'].tolist()}
+        cells = [tuple(cell) for cell in arrays['cells'].tolist()]
+        offsets = arrays['offsets'].tolist()
+        for i, (x0, y0, x1, y1) in enumerate(arrays['ends'].tolist()):
+            self._add_corridor((x0, y0), (x1, y1), cells[offsets[i]:offsets[i + 1]])
+        for node in self.nodes:
+            self._adjacency.setdefault(node, set())
+
+    def _repair(self) -> None:
+        """Re-trace the corridors around changed walls."""
+        region: Set[Position] = set()
+        for x, y in self._dirty:
+            region.update(((x, y), (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)))
+        self._dirty.clear()
+
+        # Drop every corridor touching the region and remember what it covered
+        doomed: Set[int] = set()
+        for cell in region:
+            if cell in self.nodes:
+                doomed.update(self._adjacency.get(cell, ()))
+            elif cell in self._cell_corridor:
+                doomed.add(self._cell_corridor[cell])
+        seeds: Set[Position] = set()
+        uncovered: Set[Position] = set()
+        for corridor_id in doomed:
+            corridor = self._remove_corridor(corridor_id)
+            seeds.update((corridor.start, corridor.end))
+            uncovered.update(corridor.cells)
+
+        # Node status can only change where a neighbouring wall changed
+        for cell in region:
+            self._forced_nodes.discard(cell)
+            if self.maze.is_valid_position(*cell) and self._is_node(cell):
+                self.nodes.add(cell)
+                seeds.add(cell)
+            elif cell in self.nodes:
+                self.nodes.discard(cell)
+                self._adjacency.pop(cell, None)
+                uncovered.add(cell)
+            if self.maze.is_valid_position(*cell):
+                uncovered.add(cell)
+
+        for node in seeds:
+            if node in self.nodes:
+                self._trace_from(node)
+        self._cover_cycles(uncovered)
+
+    def _sync(self) -> None:
+        if self._dirty:
+            self._repair()
+
+    def _anchors(self, cell: Position) -> Optional[List[Tuple[Position, int]]]:
+        """Get the nodes a cell connects to, with the distance to each."""
+        if cell in self.nodes:
+            return [(cell, 0)]
+        corridor_id = self._cell_corridor.get(cell)
+        if corridor_id is None:
+            return None
+        corridor = self.corridors[corridor_id]
+        index = corridor.cells.index(cell)
+        return [(corridor.start, index + 1), (corridor.end, len(corridor.cells) - index)]
+
+    def _expand(self, corridor: Corridor, from_node: Position) -> Tuple[Position, ...]:
+        """Get a corridor's cells plus its far node, walking away from from_node."""
+        if corridor.start == from_node:
+            return corridor.cells + (corridor.end,)
+        return tuple(reversed(corridor.cells)) + (corridor.start,)
+
+    def route(self, start: Position, goal: Position) -> Optional[Path]:
+        """
+        Find a shortest route with Dijkstra over the corridor graph.
+
+        Returns:
+            Cells from start to goal inclusive, or None if unreachable
+        """
+        self._sync()
+        if start == goal:
+            return (start,) if self.maze.is_valid_position(*start) else None
+        start_anchors = self._anchors(start)
+        goal_anchors = self._anchors(goal)
+        if start_anchors is None or goal_anchors is None:
+            return None
+
+        best_length = None
+        best_path: Optional[Path] = None
+
+        # Both cells inside the same corridor: walking straight along it is a candidate
+        start_corridor = self._cell_corridor.get(start)
+        if start_corridor is not None and start_corridor == self._cell_corridor.get(goal):
+            cells = self.corridors[start_corridor].cells
+            i, j = cells.index(start), cells.index(goal)
+            step = 1 if j > i else -1
+            best_path = tuple(cells[i:j + step:step]) if j + step >= 0 else tuple(cells[i::step])
+            best_length = abs(j - i)
+
+        goal_offsets: Dict[Position, int] = {}
+        for node, offset in goal_anchors:  # A looping corridor anchors to one node twice
+            goal_offsets[node] = min(offset, goal_offsets.get(node, offset))
+
+        # Dijkstra over nodes, seeded from the start's anchors
+        distances: Dict[Position, int] = {}
+        came_from: Dict[Position, Optional[Tuple[Position, int]]] = {}
+        heap = []  # (distance, sequence, node, (previous node, corridor) or None)
+        sequence = 0
+        for node, offset in start_anchors:
+            sequence += 1
+            heapq.heappush(heap, (offset, sequence, node, None))
+        while heap:
+            distance, _, node, via = heapq.heappop(heap)
+            if node in distances:
+                continue
+            if best_length is not None and distance >= best_length:
+                break
+            distances[node] = distance
+            came_from[node] = via
+            if node in goal_offsets and (best_length is None or
+                                         distance + goal_offsets[node] < best_length):
+                best_length = distance + goal_offsets[node]
+                best_path = self._build_path(start, goal, node, came_from)
+            for corridor_id in self._adjacency.get(node, ()):
+                corridor = self.corridors[corridor_id]
+                for end in {corridor.start, corridor.end} - {node} or {node}:
+                    if end not in distances:
+                        sequence += 1
+                        heapq.heappush(heap, (distance + corridor.length, sequence, end,
+                                              (node, corridor_id)))
+
+        return best_path
+
+    def _build_path(self, start: Position, goal: Position, last_node: Position,
+                    came_from: Dict[Position, Optional[Tuple[Position, int]]]) -> Path:
+        """Expand a node route into cells, including the partial start and goal corridors."""
+        legs = []
+        node = last_node
+        while came_from[node] is not None:
+            previous, corridor_id = came_from[node]
+            legs.append(self._expand(self.corridors[corridor_id], previous))
+            node = previous
+        first_node = node
+
+        cells: List[Position] = [start]
+        if start != first_node:
+            # Walk from start along its corridor to the first node
+            corridor = self.corridors[self._cell_corridor[start]]
+            index = corridor.cells.index(start)
+            if first_node == corridor.start and \
+                    (first_node != corridor.end or index + 1 <= len(corridor.cells) - index):
+                cells.extend(reversed(corridor.cells[:index]))
+            else:
+                cells.extend(corridor.cells[index + 1:])
+            cells.append(first_node)
+        for leg in reversed(legs):
+            cells.extend(leg)
+        if goal != last_node:
+            corridor = self.corridors[self._cell_corridor[goal]]
+            index = corridor.cells.index(goal)
+            if last_node == corridor.start and \
+                    (last_node != corridor.end or index + 1 <= len(corridor.cells) - index):
+                cells.extend(corridor.cells[:index + 1])
+            else:
+                cells.extend(reversed(corridor.cells[index:]))
+        return tuple(cells)
+
+    def distance(self, start: Position, goal: Position) -> Optional[int]:
+        """Get the route length between two cells, or None if unreachable."""
+        path = self.route(start, goal)
+        return None if path is None else len(path) - 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the size of the graph."""
+        self._sync()
+        return {'nodes': len(self.nodes), 'corridors': len(self.corridors),
+                'corridor_cells': len(self._cell_corridor)}
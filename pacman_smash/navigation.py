@@ -0,0 +1,234 @@
+"""
+Navigation helpers for Pacman Smash.
+Provides cached maze distance queries shared by bots and ghosts.
+"""
+
+import heapq
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+from maze import Maze
+
+Position = Tuple[int, int]
+
+class DistanceCache:
+    """
+    LRU cache of breadth-first distance fields.
+
+    Fields depend only on walls. When walls change, a cached field is repaired
+    on its next use by re-deriving only the cells whose distance depended on
+    the changed cells (or that can now be reached through them), so a chaos
+    event does not force every field to be rebuilt at once. Pellet collection
+    and power-up changes never touch the fields.
+    """
+
+    def __init__(self, maze: Maze, max_entries: int = 256, max_repair_changes: int = 64):
+        """
+        Initialize the cache.
+
+        Args:
+            maze: Maze to compute distances on
+            max_entries: Maximum number of distance fields kept
+            max_repair_changes: Above this many changed walls a field is
+                recomputed instead of repaired
+        """
+        self.maze = maze
+        self.max_entries = max_entries
+        self.max_repair_changes = max_repair_changes
+        self._fields: 'OrderedDict[Position, Dict[Position, int]]' = OrderedDict()
+        self._versions: Dict[Position, int] = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.repairs = 0
+
+    def _compute_field(self, source: Position) -> Dict[Position, int]:
+        """Compute BFS distances from source to every reachable cell."""
+        maze = self.maze
+        x, y = source
+        if maze.flat_cells and 0 <= x < maze.width and 0 <= y < maze.height:
+            # Walk flat cell indices and convert to positions once at the end
+            neighbours = maze.neighbours
+            positions = maze.cell_positions
+            start = maze.cell_index(x, y)
+            depth = [-1] * len(neighbours)
+            depth[start] = 0
+            order = [start]
+            for cell in order:
+                next_distance = depth[cell] + 1
+                for adjacent in neighbours[cell]:
+                    if depth[adjacent] < 0:
+                        depth[adjacent] = next_distance
+                        order.append(adjacent)
+            return {positions[cell]: depth[cell] for cell in order}
+
+        distances = {source: 0}
+        queue = deque([source])
+        get_adjacent = self.maze.get_valid_adjacent_positions
+
+        while queue:
+            x, y = queue.popleft()
+            next_distance = distances[(x, y)] + 1
+            for adjacent in get_adjacent(x, y):
+                if adjacent not in distances:
+                    distances[adjacent] = next_distance
+                    queue.append(adjacent)
+
+        return distances
+
+    def _raise_distances(self, field: Dict[Position, int], blocked: List[Position]) -> None:
+        """Repair a field after cells on it became walls."""
+        get_adjacent = self.maze.get_valid_adjacent_positions
+
+        # Find cells that lost every shortest route, in order of distance, so a
+        # cell's parents are always settled before the cell itself
+        affected = set(blocked)
+        decided = set(blocked)
+        heap = []
+        for cell in blocked:
+            for adjacent in get_adjacent(*cell):
+                if field.get(adjacent) == field[cell] + 1:
+                    heapq.heappush(heap, (field[adjacent], adjacent))
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if cell in decided:
+                continue
+            decided.add(cell)
+            if any(field.get(adjacent) == distance - 1 and adjacent not in affected
+                   for adjacent in get_adjacent(*cell)):
+                continue  # Still has an intact route one step closer
+            affected.add(cell)
+            for adjacent in get_adjacent(*cell):
+                if field.get(adjacent) == distance + 1 and adjacent not in decided:
+                    heapq.heappush(heap, (distance + 1, adjacent))
+
+        # Re-derive the affected cells from the intact boundary around them
+        for cell in affected:
+            del field[cell]
+        heap = []
+        for cell in affected:
+            if self.maze.is_wall(*cell):
+                continue
+            best = min((field[adjacent] for adjacent in get_adjacent(*cell)
+                        if adjacent in field), default=None)
+            if best is not None:
+                heapq.heappush(heap, (best + 1, cell))
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if cell in field:
+                continue
+            field[cell] = distance
+            for adjacent in get_adjacent(*cell):
+                if adjacent in affected and adjacent not in field:
+                    heapq.heappush(heap, (distance + 1, adjacent))
+
+    def _lower_distances(self, field: Dict[Position, int], opened: List[Position]) -> None:
+        """Repair a field after walls became open cells."""
+        get_adjacent = self.maze.get_valid_adjacent_positions
+        unreached = float('inf')
+
+        heap = []
+        for cell in opened:
+            best = min((field[adjacent] for adjacent in get_adjacent(*cell)
+                        if adjacent in field), default=None)
+            if best is not None:
+                heapq.heappush(heap, (best + 1, cell))
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if field.get(cell, unreached) <= distance:
+                continue
+            field[cell] = distance
+            for adjacent in get_adjacent(*cell):
+                if field.get(adjacent, unreached) > distance + 1:
+                    heapq.heappush(heap, (distance + 1, adjacent))
+
+    def _repair_field(self, source: Position, field: Dict[Position, int]) -> bool:
+        """
+        Bring a cached field up to date with the current walls.
+
+        Returns:
+            False if the field has to be recomputed instead
+        """
+        maze = self.maze
+        changed = maze.wall_changes_since(self._versions[source])
+        if changed is None or len(changed) > self.max_repair_changes or maze.is_wall(*source):
+            return False
+
+        # A cell that flipped and flipped back needs no work
+        blocked = [cell for cell in changed if cell in field and maze.is_wall(*cell)]
+        opened = [cell for cell in changed if cell not in field and not maze.is_wall(*cell)]
+        if blocked:
+            self._raise_distances(field, blocked)
+        if opened:
+            self._lower_distances(field, opened)
+        return True
+
+    def distances_from(self, source: Position) -> Dict[Position, int]:
+        """Get the distance field from source (cached, repaired after wall changes)."""
+        field = self._fields.get(source)
+        if field is not None:
+            if self._versions[source] != self.maze.wall_version:
+                if self._repair_field(source, field):
+                    self.repairs += 1
+                    self._versions[source] = self.maze.wall_version
+                else:
+                    field = None
+        if field is not None:
+            self.hits += 1
+            self._fields.move_to_end(source)
+            return field
+
+        self.misses += 1
+        field = self._compute_field(source)
+        self._fields[source] = field
+        self._versions[source] = self.maze.wall_version
+        if len(self._fields) > self.max_entries:
+            evicted, _ = self._fields.popitem(last=False)
+            del self._versions[evicted]
+        return field
+
+    def store_field(self, source: Position, field: Dict[Position, int]) -> None:
+        """Seed the cache with a field computed elsewhere (e.g. loaded from disk)."""
+        self._fields[source] = field
+        self._fields.move_to_end(source)
+        self._versions[source] = self.maze.wall_version
+        if len(self._fields) > self.max_entries:
+            evicted, _ = self._fields.popitem(last=False)
+            del self._versions[evicted]
+
+    def cached_sources(self) -> List[Position]:
+        """Get the sources of the cached fields, least recently used first."""
+        return list(self._fields)
+
+    def distance(self, start: Position, goal: Position) -> Optional[int]:
+        """Get the path distance between two cells, or None if unreachable."""
+        return self.distances_from(goal).get(start)
+
+    def next_step_towards(self, start: Position, goal: Position) -> Optional[Position]:
+        """
+        Get the adjacent cell that lies on a shortest path from start to goal.
+
+        Returns:
+            The next cell, or None if already at the goal or it is unreachable
+        """
+        if start == goal:
+            return None
+
+        field = self.distances_from(goal)
+        best_step = None
+        best_distance = field.get(start)
+        if best_distance is None:
+            return None
+
+        for adjacent in self.maze.get_valid_adjacent_positions(*start):
+            distance = field.get(adjacent)
+            if distance is not None and distance < best_distance:
+                best_distance = distance
+                best_step = adjacent
+
+        return best_step
+
+    def clear(self) -> None:
+        """Drop all cached fields."""
+        self._fields.clear()
+        self._versions.clear()
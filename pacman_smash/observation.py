@@ -0,0 +1,113 @@
+"""
+Observation encoding for Pacman Smash.
+Maintains a multi-channel C x H x W view of the game state for bots and analytics.
+"""
+
+import numpy as np
+from typing import List, Optional, Tuple
+from maze import Maze, CellType
+
+# Static channels, followed by one channel per player, one per ghost and
+# finally the temporarily removed walls
+CHANNEL_WALLS = 0
+CHANNEL_PELLETS = 1
+CHANNEL_POWERUPS = 2
+NUM_STATIC_CHANNELS = 3
+
+class ObservationEncoder:
+    """
+    Incrementally updated observation tensor.
+
+    Cell channels are patched from maze change notifications and entity channels
+    only touch the cells an entity left and entered, so no part of the tensor is
+    rebuilt from Maze.grid after construction.
+    """
+
+    def __init__(self, maze: Maze, num_players: int = 2, num_ghosts: int = 4,
+                 dtype=np.uint8):
+        """
+        Initialize the encoder and attach it to the maze.
+
+        Args:
+            maze: Maze to observe
+            num_players: Number of player channels
+            num_ghosts: Number of ghost channels
+            dtype: Element type of the observation buffer
+        """
+        self.maze = maze
+        self.num_players = num_players
+        self.num_ghosts = num_ghosts
+
+        self.player_channel_start = NUM_STATIC_CHANNELS
+        self.ghost_channel_start = self.player_channel_start + num_players
+        self.removed_walls_channel = self.ghost_channel_start + num_ghosts
+        self.num_channels = self.removed_walls_channel + 1
+
+        self.buffer = np.zeros((self.num_channels, maze.height, maze.width), dtype=dtype)
+
+        # Last cell written per entity channel so moves only touch two cells
+        self._entity_cells: List[Optional[Tuple[int, int]]] = \
+            [None] * (num_players + num_ghosts)
+
+        self.rebuild()
+        maze.add_cell_listener(self._on_cell_changed)
+
+    def rebuild(self) -> None:
+        """Rebuild the cell channels from scratch (only needed after detaching)."""
+        grid = np.asarray(self.maze.grid)
+        self.buffer[CHANNEL_WALLS] = grid == CellType.WALL.value
+        self.buffer[CHANNEL_PELLETS] = grid == CellType.PELLET.value
+        self.buffer[CHANNEL_POWERUPS] = grid == CellType.POWER_UP.value
+
+        self.buffer[self.removed_walls_channel] = 0
+        for x, y in self.maze.temporary_modifications:
+            self.buffer[self.removed_walls_channel, y, x] = 1
+
+    def _on_cell_changed(self, x: int, y: int, old_value: int, new_value: int) -> None:
+        """Patch the cell channels for a single changed cell."""
+        buffer = self.buffer
+        buffer[CHANNEL_WALLS, y, x] = new_value == CellType.WALL.value
+        buffer[CHANNEL_PELLETS, y, x] = new_value == CellType.PELLET.value
+        buffer[CHANNEL_POWERUPS, y, x] = new_value == CellType.POWER_UP.value
+        buffer[self.removed_walls_channel, y, x] = \
+            (x, y) in self.maze.temporary_modifications
+
+    def _move_entity(self, slot: int, channel: int, position: Tuple[int, int]) -> None:
+        """Move an entity marker, clearing only its previous cell."""
+        previous = self._entity_cells[slot]
+        if previous == position:
+            return
+        if previous is not None:
+            self.buffer[channel, previous[1], previous[0]] = 0
+        self.buffer[channel, position[1], position[0]] = 1
+        self._entity_cells[slot] = position
+
+    def update_entities(self, players: List, ghosts: List) -> None:
+        """
+        Update player and ghost channels.
+
+        Args:
+            players: Players in channel order
+            ghosts: Ghosts in channel order
+        """
+        if len(players) > self.num_players or len(ghosts) > self.num_ghosts:
+            raise ValueError(
+                f"Encoder has {self.num_players} player and {self.num_ghosts} ghost "
+                f"channels, got {len(players)} players and {len(ghosts)} ghosts")
+
+        for i, player in enumerate(players):
+            self._move_entity(i, self.player_channel_start + i, player.position)
+
+        for i, ghost in enumerate(ghosts):
+            self._move_entity(self.num_players + i, self.ghost_channel_start + i,
+                              ghost.position)
+
+    def observe(self) -> np.ndarray:
+        """Get a read-only view of the observation tensor (no copy)."""
+        view = self.buffer.view()
+        view.flags.writeable = False
+        return view
+
+    def detach(self) -> None:
+        """Stop receiving maze updates."""
+        self.maze.remove_cell_listener(self._on_cell_changed)
@@ -0,0 +1,204 @@
+"""
+Path planning for Pacman Smash.
+A* search over the maze grid with a shared cache of planned paths that is
+repaired locally when walls change.
+"""
+
+import heapq
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from maze import Maze
+
+Position = Tuple[int, int]
+Path = Tuple[Position, ...]
+
+def manhattan(a: Position, b: Position) -> int:
+    """Manhattan distance between two cells (admissible on a 4-connected grid)."""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def astar(maze: Maze, start: Position, goal: Position) -> Optional[Path]:
+    """
+    Find a shortest path with A*.
+
+    Args:
+        maze: Maze to search
+        start: Starting cell
+        goal: Target cell
+
+    Returns:
+        Cells from start to goal inclusive, or None if the goal is unreachable
+    """
+    if start == goal:
+        return (start,)
+    if not maze.is_valid_position(*goal):
+        return None
+
+    get_adjacent = maze.get_valid_adjacent_positions
+    came_from: Dict[Position, Optional[Position]] = {start: None}
+    cost: Dict[Position, int] = {start: 0}
+    # (f, h, sequence, cell): ties prefer cells closer to the goal
+    open_heap = [(manhattan(start, goal), manhattan(start, goal), 0, start)]
+    sequence = 0
+
+    while open_heap:
+        _, _, _, current = heapq.heappop(open_heap)
+        if current == goal:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = came_from[current]
+            return tuple(reversed(path))
+
+        next_cost = cost[current] + 1
+        for adjacent in get_adjacent(*current):
+            if next_cost < cost.get(adjacent, next_cost + 1):
+                cost[adjacent] = next_cost
+                came_from[adjacent] = current
+                h = manhattan(adjacent, goal)
+                sequence += 1
+                heapq.heappush(open_heap, (next_cost + h, h, sequence, adjacent))
+
+    return None
+
+def _remove_loops(path: List[Position]) -> Path:
+    """Cut out any cycles a detour introduced."""
+    result: List[Position] = []
+    index: Dict[Position, int] = {}
+    for cell in path:
+        if cell in index:
+            cut = index[cell] + 1
+            for removed in result[cut:]:
+                del index[removed]
+            del result[cut:]
+        else:
+            index[cell] = len(result)
+            result.append(cell)
+    return tuple(result)
+
+def repair_path(maze: Maze, path: Path, changed: Set[Position]) -> Optional[Path]:
+    """
+    Patch a path after walls changed, touching only the blocked stretches.
+
+    Opened walls never invalidate a path, so only cells that became walls are
+    considered. Each blocked run is replaced by a local A* detour from the cell
+    before it to the cell after it. The result is valid but, unlike a fresh
+    plan, not guaranteed to be shortest.
+
+    Args:
+        maze: Maze with the current walls
+        path: Previously planned path
+        changed: Cells whose wall state flipped since the path was planned
+
+    Returns:
+        The path itself if unaffected, a repaired path, or None if the goal is
+        now unreachable
+    """
+    blocked = {cell for cell in changed if maze.is_wall(*cell)}
+    if blocked.isdisjoint(path):
+        return path
+    if path[0] in blocked or path[-1] in blocked:
+        return None
+
+    repaired: List[Position] = []
+    i = 0
+    while i < len(path):
+        if path[i] not in blocked:
+            repaired.append(path[i])
+            i += 1
+            continue
+        # Skip the blocked run and detour to the first open cell after it
+        j = i
+        while path[j] in blocked:
+            j += 1
+        detour = astar(maze, repaired[-1], path[j])
+        if detour is None:
+            return None
+        repaired.extend(detour[1:])
+        i = j + 1
+
+    return _remove_loops(repaired)
+
+class PathCache:
+    """
+    LRU cache of shortest paths keyed by start and goal.
+
+    Each entry remembers the wall version it is valid for. When walls change
+    an entry is re-checked on its next use: unaffected paths are kept as they
+    are and blocked ones are patched with local detours (see repair_path), so
+    a chaos event does not make every ghost replan from scratch at once.
+    """
+
+    def __init__(self, maze: Maze, max_entries: int = 512, max_repair_changes: int = 64,
+                 graph=None):
+        """
+        Initialize the cache.
+
+        Args:
+            maze: Maze to plan on
+            max_entries: Maximum number of paths kept
+            max_repair_changes: Above this many changed walls paths are
+                replanned instead of repaired
+            graph: Optional CorridorGraph of the maze; misses are planned on
+                it instead of running A* over every cell
+        """
+        self.maze = maze
+        self.graph = graph
+        self.max_entries = max_entries
+        self.max_repair_changes = max_repair_changes
+        self._paths: 'OrderedDict[Tuple[Position, Position], Tuple[int, Optional[Path]]]' = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.repairs = 0
+
+    def update_path(self, path: Optional[Path], version: int) -> Optional[Path]:
+        """
+        Bring a path planned at a wall version up to date.
+
+        Returns:
+            A path valid for the current walls, or None if it must be replanned
+        """
+        if version == self.maze.wall_version:
+            return path
+        if path is None:
+            return None  # Opened walls may have connected the goal
+        changed = self.maze.wall_changes_since(version)
+        if changed is None or len(changed) > self.max_repair_changes:
+            return None
+        repaired = repair_path(self.maze, path, changed)
+        if repaired is not None and repaired is not path:
+            self.repairs += 1
+        return repaired
+
+    def find_path(self, start: Position, goal: Position) -> Optional[Path]:
+        """Get a shortest path from start to goal (cached)."""
+        key = (start, goal)
+        version = self.maze.wall_version
+        entry = self._paths.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            self._paths.move_to_end(key)
+            return entry[1]
+        if entry is not None:
+            path = self.update_path(entry[1], entry[0])
+            if path is not None:
+                self.hits += 1
+                self._paths[key] = (version, path)
+                self._paths.move_to_end(key)
+                return path
+
+        self.misses += 1
+        if self.graph is not None:
+            path = self.graph.route(start, goal)
+        else:
+            path = astar(self.maze, start, goal)
+        self._paths[key] = (version, path)
+        self._paths.move_to_end(key)
+        if len(self._paths) > self.max_entries:
+            self._paths.popitem(last=False)
+        return path
+
+    def clear(self) -> None:
+        """Drop all cached paths."""
+        self._paths.clear()
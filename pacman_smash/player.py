@@ -5,9 +5,10 @@ Handles player state, movement, controls, and interactions.
 
 import pygame
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, field
 from enum import Enum
 import time
+from tracking import MovementHistory, SlidingWindowCounter
+from effects import ActiveEffect, EffectRule, EffectTracker
 
 class PowerUpType(Enum):
     """Types of power-ups available in the game."""
@@ -15,16 +16,20 @@ class PowerUpType(Enum):
     FREEZE_OPPONENT = "freeze_opponent"
     GHOST_CONFUSION = "ghost_confusion"
 
-@dataclass
-class PowerUp:
-    """Represents an active power-up effect."""
-    type: PowerUpType
-    duration: float
-    start_time: float
-    
-    def is_expired(self) -> bool:
-        """Check if the power-up has expired."""
-        return time.time() - self.start_time >= self.duration
+class StatusEffect(Enum):
+    """Effects applied to a player by others rather than collected."""
+    FROZEN = "frozen"
+
+# Active power-ups are tracked as timed effects
+PowerUp = ActiveEffect
+
+# Stat modifiers and stacking rules per effect kind
+EFFECT_RULES = {
+    PowerUpType.SPEED_BOOST: EffectRule(speed_multiplier=1.5, max_stacks=3),
+    PowerUpType.FREEZE_OPPONENT: EffectRule(),
+    PowerUpType.GHOST_CONFUSION: EffectRule(),
+    StatusEffect.FROZEN: EffectRule(freezes=True, max_stacks=1),
+}
 
 class Player:
     """Represents a player in the game with position, state, and controls."""
@@ -48,38 +53,52 @@ class Player:
         self.death_count = 0
         self.controls = controls
         self.color = color
+        self.controller = None  # Bot controller; None means keyboard input
         
         # Power-up management
-        self.active_powerups: List[PowerUp] = []
+        self.effects = EffectTracker(EFFECT_RULES)
         
         # Performance tracking
-        self.movement_history: List[Tuple[int, int, float]] = []
+        self.movement_history = MovementHistory(window=10.0)
         self.pellets_collected = 0
         self.last_pellet_time = 0.0
         
+        # Windowed event counters (up to a minute back, half-second resolution)
+        self.pellet_counter = SlidingWindowCounter(window=60.0, num_buckets=120)
+        self.death_counter = SlidingWindowCounter(window=60.0, num_buckets=120)
+        self.score_counter = SlidingWindowCounter(window=60.0, num_buckets=120)
+        
         # Movement state
         self.last_move_time = 0.0
         self.move_cooldown = 0.15  # Minimum time between moves (seconds)
-        self.is_frozen = False
-        self.freeze_end_time = 0.0
+    
+    @property
+    def active_powerups(self) -> List[PowerUp]:
+        """Get the running power-up effects."""
+        return [effect for effect in self.effects.active()
+                if isinstance(effect.type, PowerUpType)]
+    
+    @property
+    def is_frozen(self) -> bool:
+        """Check if a freeze is currently applied."""
+        return self.effects.frozen
+    
+    @property
+    def freeze_end_time(self) -> float:
+        """Get when the current freeze ends (0.0 if not frozen)."""
+        return self.effects.end_time(StatusEffect.FROZEN)
     
     def get_current_speed(self) -> float:
         """Get the current movement speed including power-up modifiers."""
-        base_speed = self.speed
-        
-        # Apply speed boost if active
-        for powerup in self.active_powerups:
-            if powerup.type == PowerUpType.SPEED_BOOST and not powerup.is_expired():
-                base_speed *= 1.5
-        
-        return base_speed
+        return self.speed * self.effects.speed_multiplier
     
     def is_movement_allowed(self) -> bool:
         """Check if the player can currently move."""
         current_time = time.time()
         
-        # Check if frozen
-        if self.is_frozen and current_time < self.freeze_end_time:
+        # Expire due effects (O(1) when nothing is due) and check freeze
+        self.effects.update(current_time)
+        if self.effects.frozen:
             return False
         
         # Check movement cooldown (affected by speed)
@@ -90,21 +109,15 @@ class Player:
     
     def add_powerup(self, powerup_type: PowerUpType, duration: float = 5.0) -> None:
         """Add a power-up effect to the player."""
-        powerup = PowerUp(powerup_type, duration, time.time())
-        self.active_powerups.append(powerup)
+        self.effects.add(powerup_type, duration, time.time())
     
     def freeze(self, duration: float = 3.0) -> None:
         """Freeze the player for the specified duration."""
-        self.is_frozen = True
-        self.freeze_end_time = time.time() + duration
+        self.effects.add(StatusEffect.FROZEN, duration, time.time())
     
     def update_powerups(self) -> None:
-        """Remove expired power-ups."""
-        self.active_powerups = [p for p in self.active_powerups if not p.is_expired()]
-        
-        # Update freeze state
-        if self.is_frozen and time.time() >= self.freeze_end_time:
-            self.is_frozen = False
+        """Remove expired power-ups and freezes."""
+        self.effects.update(time.time())
     
     def move(self, new_position: Tuple[int, int]) -> None:
         """Move the player to a new position."""
@@ -112,56 +125,44 @@ class Player:
             return
             
         current_time = time.time()
-        self.movement_history.append((self.position[0], self.position[1], current_time))
+        self.movement_history.append(self.position[0], self.position[1], current_time)
         self.position = new_position
         self.last_move_time = current_time
     
     def collect_pellet(self, points: int = 10) -> None:
         """Handle pellet collection."""
+        current_time = time.time()
         self.score += points
         self.pellets_collected += 1
-        self.last_pellet_time = time.time()
+        self.last_pellet_time = current_time
+        self.pellet_counter.add(current_time)
+        self.score_counter.add(current_time, points)
     
     def die(self, score_penalty: int = 50) -> None:
         """Handle player death (collision with ghost)."""
-        self.score = max(0, self.score - score_penalty)
+        current_time = time.time()
+        new_score = max(0, self.score - score_penalty)
+        self.score_counter.add(current_time, new_score - self.score)
+        self.score = new_score
         self.death_count += 1
+        self.death_counter.add(current_time)
         self.position = self.start_position
     
     def get_pellet_collection_rate(self, time_window: float = 10.0) -> float:
         """Calculate pellets collected per second over the time window."""
-        current_time = time.time()
-        if current_time - self.last_pellet_time > time_window:
-            return 0.0
-        
-        # Simple rate calculation - can be enhanced with more sophisticated tracking
-        return self.pellets_collected / max(1.0, current_time - (current_time - time_window))
+        return self.pellet_counter.rate(time.time(), time_window)
+    
+    def get_death_rate(self, time_window: float = 60.0) -> float:
+        """Calculate deaths per minute over the time window."""
+        return self.death_counter.rate(time.time(), time_window) * 60.0
+    
+    def get_score_velocity(self, time_window: float = 10.0) -> float:
+        """Calculate net score change per second over the time window."""
+        return self.score_counter.rate(time.time(), time_window)
     
     def get_average_speed(self, time_window: float = 10.0) -> float:
         """Calculate average movement speed over the time window."""
-        current_time = time.time()
-        recent_moves = [
-            move for move in self.movement_history 
-            if current_time - move[2] <= time_window
-        ]
-        
-        if len(recent_moves) < 2:
-            return 0.0
-        
-        total_distance = 0.0
-        total_time = 0.0
-        
-        for i in range(1, len(recent_moves)):
-            prev_x, prev_y, prev_time = recent_moves[i-1]
-            curr_x, curr_y, curr_time = recent_moves[i]
-            
-            distance = abs(curr_x - prev_x) + abs(curr_y - prev_y)  # Manhattan distance
-            time_diff = curr_time - prev_time
-            
-            total_distance += distance
-            total_time += time_diff
-        
-        return total_distance / max(0.001, total_time)
+        return self.movement_history.average_speed(time.time(), time_window)
     
     def render(self, screen: pygame.Surface, cell_size: int, offset_x: int = 0, offset_y: int = 0) -> None:
         """Render the player on the screen."""
@@ -181,6 +182,14 @@ class Player:
                     pygame.draw.circle(screen, indicator_color, 
                                      (pixel_x + i * 8 - 8, indicator_y), 3)
 
+# Grid offsets for each movement direction
+DIRECTION_VECTORS = {
+    'up': (0, -1),
+    'down': (0, 1),
+    'left': (-1, 0),
+    'right': (1, 0)
+}
+
 # Player control configurations
 PLAYER_1_CONTROLS = {
     'up': pygame.K_w,
@@ -196,6 +205,41 @@ PLAYER_2_CONTROLS = {
     'right': pygame.K_RIGHT
 }
 
+PLAYER_3_CONTROLS = {
+    'up': pygame.K_i,
+    'down': pygame.K_k,
+    'left': pygame.K_j,
+    'right': pygame.K_l
+}
+
+PLAYER_4_CONTROLS = {
+    'up': pygame.K_KP8,
+    'down': pygame.K_KP5,
+    'left': pygame.K_KP4,
+    'right': pygame.K_KP6
+}
+
+# Keyboard layouts by seat; further players have no keys and are bot-driven
+PLAYER_CONTROLS = [PLAYER_1_CONTROLS, PLAYER_2_CONTROLS, PLAYER_3_CONTROLS, PLAYER_4_CONTROLS]
+
 # Player colors
 PLAYER_1_COLOR = (255, 255, 0)  # Yellow
-PLAYER_2_COLOR = (255, 0, 255)  # Magenta
\ No newline at end of file
+PLAYER_2_COLOR = (255, 0, 255)  # Magenta
+
+def get_player_controls(index: int) -> Dict[str, int]:
+    """Get the keyboard layout for the player in seat index (0-based)."""
+    if index < len(PLAYER_CONTROLS):
+        return PLAYER_CONTROLS[index]
+    return {}
+
+def get_player_color(index: int) -> Tuple[int, int, int]:
+    """Get a distinct color for the player in seat index (0-based)."""
+    if index == 0:
+        return PLAYER_1_COLOR
+    if index == 1:
+        return PLAYER_2_COLOR
+    
+    # Spread further players around the hue wheel
+    color = pygame.Color(0)
+    color.hsva = ((index * 137.5) % 360, 70, 100, 100)
+    return (color.r, color.g, color.b)
\ No newline at end of file
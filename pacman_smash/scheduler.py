@@ -0,0 +1,151 @@
+"""
+Multi-rate subsystem scheduler for Pacman Smash.
+Runs each game subsystem only when it is due instead of every frame.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# callback(current_time) -> optional absolute time of the next run
+SubsystemCallback = Callable[[float], Optional[float]]
+
+@dataclass
+class SubsystemStats:
+    """Run count and time spent in a subsystem."""
+    runs: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    last_run: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.runs if self.runs else 0.0
+
+@dataclass
+class Subsystem:
+    """A periodic or self-scheduling unit of game work."""
+    name: str
+    callback: SubsystemCallback
+    interval: float = 0.0  # 0 = every tick, unless the callback returns a due time
+    min_interval: float = 0.0  # Guard against callbacks asking to run again immediately
+    next_due: float = 0.0
+    stats: SubsystemStats = field(default_factory=SubsystemStats)
+
+class Scheduler:
+    """
+    Min-heap of subsystems keyed by their next due time.
+
+    A subsystem either declares a fixed interval or returns its own next due
+    time from the callback. run_due() only touches subsystems that are due, so
+    a frame with nothing to do costs a single heap peek.
+    """
+
+    def __init__(self):
+        """Initialize an empty scheduler."""
+        self.subsystems: Dict[str, Subsystem] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._entry: Dict[str, int] = {}  # name -> sequence of its live queue entry
+
+    def _schedule(self, subsystem: Subsystem, due: float) -> None:
+        """Queue a subsystem (any older entry for it becomes stale)."""
+        self._sequence += 1
+        subsystem.next_due = due
+        self._entry[subsystem.name] = self._sequence
+        heapq.heappush(self._queue, (due, self._sequence, subsystem.name))
+
+    def add(self, name: str, callback: SubsystemCallback, interval: float = 0.0,
+            min_interval: float = 0.0, start_time: float = 0.0) -> Subsystem:
+        """
+        Register a subsystem.
+
+        Args:
+            name: Unique subsystem name
+            callback: Work to run; may return the absolute time it wants to run next
+            interval: Seconds between runs when the callback returns None
+            min_interval: Shortest allowed gap between two runs
+            start_time: Time of the first run (0.0 = the first tick)
+
+        Returns:
+            The registered subsystem
+        """
+        if name in self.subsystems:
+            raise ValueError(f"Subsystem '{name}' is already registered")
+        subsystem = Subsystem(name, callback, interval, min_interval)
+        self.subsystems[name] = subsystem
+        self._schedule(subsystem, start_time)
+        return subsystem
+
+    def remove(self, name: str) -> None:
+        """Unregister a subsystem (its queue entry is dropped lazily)."""
+        self.subsystems.pop(name, None)
+        self._entry.pop(name, None)
+
+    def wake(self, name: str, due: float = 0.0) -> None:
+        """Pull a subsystem's next run forward to due (never pushes it back)."""
+        subsystem = self.subsystems[name]
+        if due < subsystem.next_due:
+            self._schedule(subsystem, due)
+
+    def next_due(self) -> float:
+        """Get the earliest due time of any subsystem."""
+        queue = self._queue
+        while queue and self._entry.get(queue[0][2]) != queue[0][1]:
+            heapq.heappop(queue)  # Drop stale entries left by wake() and remove()
+        return queue[0][0] if queue else float('inf')
+
+    def run_due(self, current_time: Optional[float] = None) -> List[str]:
+        """
+        Run every subsystem that is due.
+
+        Returns:
+            Names of the subsystems that ran, in run order
+        """
+        if current_time is None:
+            current_time = time.time()
+
+        due_entries = []
+        queue = self._queue
+        while queue and queue[0][0] <= current_time:
+            due, sequence, name = heapq.heappop(queue)
+            if self._entry.get(name) == sequence:
+                due_entries.append((due, name))
+
+        ran = []
+        for due, name in due_entries:
+            subsystem = self.subsystems.get(name)
+            if subsystem is None or subsystem.next_due != due:
+                continue  # Removed or rescheduled by an earlier callback this tick
+            started = time.perf_counter()
+            requested = subsystem.callback(current_time)
+            elapsed = time.perf_counter() - started
+
+            stats = subsystem.stats
+            stats.runs += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            stats.last_run = current_time
+            ran.append(name)
+
+            if requested is None:
+                requested = due + subsystem.interval
+                if requested <= current_time and subsystem.interval:
+                    # Fell behind: skip missed runs instead of bursting to catch up
+                    requested = current_time + subsystem.interval
+            # Due entries were collected up front, so a subsystem runs at most once per tick
+            self._schedule(subsystem, max(requested, current_time + subsystem.min_interval))
+        return ran
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get per-subsystem run statistics."""
+        return {
+            name: {
+                'runs': subsystem.stats.runs,
+                'average_ms': subsystem.stats.average_time * 1000.0,
+                'max_ms': subsystem.stats.max_time * 1000.0,
+                'next_due': subsystem.next_due,
+            }
+            for name, subsystem in self.subsystems.items()
+        }
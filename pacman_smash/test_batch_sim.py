@@ -0,0 +1,106 @@
+"""
+Test the batched multi-environment simulator.
+"""
+
+import numpy as np
+from batch_sim import BatchSimulator, ACTION_STAY, ACTION_RIGHT, ACTION_UP
+from maze import Maze, CellType
+
+def test_batch_creation():
+    """Test that all environments start from the template layout."""
+    sim = BatchSimulator(8, seed=1)
+
+    assert sim.grids.shape == (8, 19, 25)
+    assert sim.player_positions.shape == (8, 2, 2)
+    assert sim.ghost_positions.shape == (8, 4, 2)
+    assert (sim.scores == 0).all()
+    assert (sim.grids == sim.template_grid).all()
+
+def test_players_blocked_by_walls():
+    """Test that moves into walls leave players in place."""
+    sim = BatchSimulator(4, seed=1)
+
+    # Player 1 starts at (1, 1); up leads into the border wall
+    actions = np.full((4, 2), ACTION_STAY)
+    actions[:, 0] = ACTION_UP
+    sim.step(actions)
+
+    assert (sim.player_positions[:, 0] == (1, 1)).all()
+
+def test_pellet_collection_is_vectorized():
+    """Test that pellets are collected and scored in every environment."""
+    maze = Maze(10, 10)
+    sim = BatchSimulator(6, template=maze, seed=2, ghost_move_interval=1000)
+
+    # (2, 1) holds a pellet in the default layout
+    assert maze.grid[1][2] == CellType.PELLET.value
+    initial_remaining = sim.pellets_remaining.copy()
+
+    actions = np.full((6, 2), ACTION_STAY)
+    actions[:, 0] = ACTION_RIGHT
+    result = sim.step(actions)
+
+    assert result.pellets_collected[:, 0].all()
+    assert (sim.scores[:, 0] == 10).all()
+    assert (sim.grids[:, 1, 2] == CellType.EMPTY.value).all()
+    assert (sim.pellets_remaining == initial_remaining - 1).all()
+
+def test_ghost_collision_penalty():
+    """Test that a player sharing a cell with a ghost is penalised and respawned."""
+    sim = BatchSimulator(3, seed=3, ghost_move_interval=1000)
+    sim.scores[:] = 100
+
+    # Drop a ghost onto player 2's position in environment 1 only
+    sim.ghost_positions[1, 0] = sim.player_positions[1, 1]
+    result = sim.step(np.full((3, 2), ACTION_STAY))
+
+    assert result.caught[1, 1]
+    assert not result.caught[0].any() and not result.caught[2].any()
+    assert sim.scores[1, 1] == 50
+    assert sim.deaths[1, 1] == 1
+
+def test_ghosts_never_enter_walls():
+    """Test that vectorized ghost moves stay on open cells."""
+    sim = BatchSimulator(16, seed=4, ghost_move_interval=1)
+
+    for _ in range(50):
+        sim.step(sim.random_actions())
+        x = sim.ghost_positions[..., 0]
+        y = sim.ghost_positions[..., 1]
+        cells = sim.grids[np.arange(16)[:, None], y, x]
+        assert (cells != CellType.WALL.value).all()
+
+def test_partial_reset():
+    """Test that reset only touches the selected environments."""
+    sim = BatchSimulator(4, seed=5)
+    for _ in range(10):
+        sim.step(sim.random_actions())
+    sim.scores[:] = 30
+
+    mask = np.array([True, False, True, False])
+    sim.reset(mask)
+
+    assert (sim.scores[mask] == 0).all()
+    assert (sim.scores[~mask] == 30).all()
+    assert (sim.grids[mask] == sim.template_grid).all()
+
+if __name__ == "__main__":
+    test_batch_creation()
+    print("✓ Batch creation test passed")
+
+    test_players_blocked_by_walls()
+    print("✓ Wall blocking test passed")
+
+    test_pellet_collection_is_vectorized()
+    print("✓ Vectorized pellet collection test passed")
+
+    test_ghost_collision_penalty()
+    print("✓ Ghost collision penalty test passed")
+
+    test_ghosts_never_enter_walls()
+    print("✓ Ghost wall avoidance test passed")
+
+    test_partial_reset()
+    print("✓ Partial reset test passed")
+
+    print("\nAll batch simulator tests passed!")
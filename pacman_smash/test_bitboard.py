@@ -0,0 +1,106 @@
+"""
+Test the bitboard cell store.
+"""
+
+import random
+from maze import Maze, CellType
+from bitboard import MazeBitboards, popcount
+
+def _grid_positions(maze, value):
+    return [(x, y) for y in range(maze.height) for x in range(maze.width)
+            if maze.grid[y][x] == value]
+
+def test_boards_match_grid():
+    """Test that every board holds exactly the cells of its type."""
+    maze = Maze(31, 25, generator="rooms", seed=6)
+    bitboards = MazeBitboards(maze)
+    for cell_type in CellType:
+        assert bitboards.positions(bitboards.board(cell_type)) == \
+            _grid_positions(maze, cell_type.value)
+    assert bitboards.pellet_count() == len(maze.pellet_positions)
+    assert popcount(bitboards.open) == len(maze.find_path_positions())
+
+def test_boards_follow_cell_changes():
+    """Test that queued changes are applied before the next query."""
+    maze = Maze()
+    bitboards = maze.bitboards
+    rng = random.Random(3)
+    values = [cell_type.value for cell_type in CellType]
+    for _ in range(500):
+        x, y = rng.randrange(1, maze.width - 1), rng.randrange(1, maze.height - 1)
+        maze.set_cell(x, y, rng.choice(values))
+        if rng.random() < 0.05:
+            assert bitboards.positions(bitboards.walls) == \
+                _grid_positions(maze, CellType.WALL.value)
+    for cell_type in CellType:
+        assert bitboards.positions(bitboards.board(cell_type)) == \
+            _grid_positions(maze, cell_type.value)
+
+    # Even without queries the queue stays bounded
+    for _ in range(bitboards.max_pending * 3):
+        maze.set_cell(1, 1, CellType.EMPTY.value)
+        maze.set_cell(1, 1, CellType.PATH.value)
+    assert len(bitboards._pending) <= bitboards.max_pending
+
+def test_moves_match_adjacent_positions():
+    """Test move generation against get_valid_adjacent_positions."""
+    maze = Maze(41, 33, generator="braided", seed=1)
+    bitboards = maze.bitboards
+    for y in range(maze.height):
+        for x in range(maze.width):
+            assert bitboards.moves(x, y) == maze.get_valid_adjacent_positions(x, y)
+
+def test_respawn_mask_and_candidates():
+    """Test that respawn eligibility skips the ghost house and start cells."""
+    maze = Maze()
+    center_x, center_y = maze.width // 2, maze.height // 2
+    for x, y in [(1, 1), (center_x, center_y), (3, 1), (1, 3)]:
+        maze.set_cell(x, y, CellType.EMPTY.value)
+    maze.pellet_positions.discard((3, 1))
+    maze.pellet_positions.discard((1, 3))
+
+    assert maze._respawn_candidates() == [(3, 1), (1, 3)]
+    random.seed(0)
+    assert maze.respawn_pellets() == 2
+    assert maze.grid[1][3] == CellType.PELLET.value
+    assert maze.bitboards.respawn_mask() == 0
+
+def test_reachable_matches_connectivity():
+    """Test the shift-based flood fill."""
+    maze = Maze(41, 33, generator="backtracker", seed=2)
+    bitboards = maze.bitboards
+    reached = bitboards.positions(bitboards.reachable((1, 1)))
+    assert reached == [cell for cell in maze.find_path_positions()
+                       if maze.connectivity.connected((1, 1), cell)]
+    assert bitboards.spread(1 << bitboards.bit(1, 1)) == \
+        sum(1 << bitboards.bit(*cell) for cell in maze.get_valid_adjacent_positions(1, 1))
+    assert bitboards.reachable((0, 0)) == 0
+
+def test_chaos_walls_indexed_from_bitboards():
+    """Test that the chaos planner indexes exactly the interior walls."""
+    maze = Maze()
+    walls = [(x, y) for x, y in _grid_positions(maze, CellType.WALL.value)
+             if 0 < x < maze.width - 1 and 0 < y < maze.height - 1]
+    assert sorted(maze.chaos_planner._walls) == sorted(walls)
+    assert popcount(maze.bitboards.interior_walls()) == len(walls)
+
+if __name__ == "__main__":
+    test_boards_match_grid()
+    print("✓ Board contents test passed")
+
+    test_boards_follow_cell_changes()
+    print("✓ Cell change sync test passed")
+
+    test_moves_match_adjacent_positions()
+    print("✓ Move generation test passed")
+
+    test_respawn_mask_and_candidates()
+    print("✓ Respawn eligibility test passed")
+
+    test_reachable_matches_connectivity()
+    print("✓ Flood fill test passed")
+
+    test_chaos_walls_indexed_from_bitboards()
+    print("✓ Chaos wall index test passed")
+
+    print("\nAll bitboard tests passed!")
@@ -0,0 +1,188 @@
+"""
+Test bot controllers and cached distance queries.
+"""
+
+import random
+import pygame
+from maze import Maze, CellType
+from ghost_ai import Ghost
+from navigation import DistanceCache
+from nav_graph import CorridorGraph
+from player import Player, PLAYER_1_CONTROLS, PLAYER_1_COLOR, DIRECTION_VECTORS
+from bots import BotController, RandomBot, GreedyPelletBot, GhostAvoidingBot, create_bot
+from main import GameEngine
+
+def _step(player, direction):
+    """Apply a bot direction to a player position directly."""
+    dx, dy = DIRECTION_VECTORS[direction]
+    player.position = (player.position[0] + dx, player.position[1] + dy)
+
+def test_distance_cache():
+    """Test distance queries and cache upkeep on wall changes."""
+    maze = Maze(15, 15)
+    cache = DistanceCache(maze)
+
+    assert cache.distance((1, 1), (1, 1)) == 0
+    assert cache.distance((1, 1), (2, 1)) == 1
+    cache.distance((1, 1), (2, 1))
+    assert cache.hits >= 1
+
+    # Collecting a pellet does not touch walls, so the field stays cached
+    pellet = next(iter(maze.pellet_positions))
+    maze.collect_pellet(*pellet)
+    misses = cache.misses
+    cache.distance((1, 1), (2, 1))
+    assert cache.misses == misses
+
+    # Wall changes repair cached fields instead of dropping them
+    maze.apply_chaos_mode(10.0, 3)
+    cache.distance((1, 1), (2, 1))
+    assert cache.misses == misses
+    assert cache.repairs == 1
+
+def test_distance_cache_repair_matches_recompute():
+    """Test that repaired fields equal freshly computed ones."""
+    rng = random.Random(7)
+    maze = Maze(21, 21)
+    cache = DistanceCache(maze)
+    sources = [(1, 1), (19, 19), (10, 9)]
+    sources = [s for s in sources if maze.is_valid_position(*s)]
+
+    for _ in range(30):
+        for source in sources:
+            cache.distances_from(source)
+        # Flip a few interior cells, including ones that open and close
+        for _ in range(rng.randint(1, 4)):
+            x, y = rng.randint(1, 19), rng.randint(1, 19)
+            if (x, y) in sources:
+                continue
+            wall = maze.is_wall(x, y)
+            maze.set_cell(x, y, CellType.PATH.value if wall else CellType.WALL.value)
+        for source in sources:
+            assert cache.distances_from(source) == cache._compute_field(source)
+
+    assert cache.repairs > 0
+
+def test_random_bot_only_picks_open_cells():
+    """Test that the random bot never walks into walls."""
+    maze = Maze(15, 15)
+    bot = RandomBot(seed=1)
+    player = Player(1, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+
+    for _ in range(100):
+        direction = bot.choose_direction(player, maze, [])
+        _step(player, direction)
+        assert maze.is_valid_position(*player.position)
+
+def test_greedy_bot_reaches_pellet():
+    """Test that the greedy bot walks to and eats pellets."""
+    maze = Maze(15, 15)
+    bot = GreedyPelletBot(DistanceCache(maze))
+    player = Player(1, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+    initial_pellets = maze.get_pellet_count()
+
+    for _ in range(30):
+        direction = bot.choose_direction(player, maze, [])
+        if direction is None:
+            break
+        _step(player, direction)
+        maze.collect_pellet(*player.position)
+
+    assert maze.get_pellet_count() < initial_pellets - 5
+
+def test_greedy_bot_follows_graph_routes():
+    """Test that a greedy bot with a corridor graph eats pellets along routes."""
+    maze = Maze(15, 15)
+    bot = GreedyPelletBot(DistanceCache(maze), CorridorGraph(maze))
+    player = Player(1, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+    initial_pellets = maze.get_pellet_count()
+
+    for _ in range(30):
+        direction = bot.choose_direction(player, maze, [])
+        if direction is None:
+            break
+        _step(player, direction)
+        assert maze.is_valid_position(*player.position)
+        maze.collect_pellet(*player.position)
+
+    assert maze.get_pellet_count() < initial_pellets - 5
+
+def test_avoiding_bot_flees_ghost():
+    """Test that the ghost-avoiding bot moves away from a nearby ghost."""
+    maze = Maze(15, 15)
+    cache = DistanceCache(maze)
+    bot = GhostAvoidingBot(cache, danger_distance=4)
+    player = Player(1, (5, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+    ghost = Ghost(0, (3, 1), (255, 0, 0))
+
+    before = cache.distance(player.position, ghost.position)
+    direction = bot.choose_direction(player, maze, [ghost])
+    _step(player, direction)
+
+    assert cache.distance(player.position, ghost.position) > before
+
+def test_bots_drive_headless_game():
+    """Test that bots plug into the game engine without a window."""
+    pygame.init()
+    game = GameEngine(headless=True)
+    game.add_bot(1, "greedy")
+    game.add_bot(2, "avoid")
+
+    start_positions = [player.position for player in game.players]
+    game.run_headless(0.5)
+
+    moved = [p.position != s for p, s in zip(game.players, start_positions)]
+    assert any(moved) or any(p.pellets_collected for p in game.players)
+    pygame.quit()
+
+def test_create_bot_rejects_unknown_kind():
+    """Test the bot factory."""
+    cache = DistanceCache(Maze(10, 10))
+    assert isinstance(create_bot("random", cache, seed=3), RandomBot)
+    try:
+        create_bot("psychic", cache)
+        assert False, "Unknown bot kinds should be rejected"
+    except ValueError:
+        pass
+
+def test_unfinished_bots_fail_when_built():
+    """Test that a bot without choose_direction cannot be created."""
+    class Unfinished(BotController):
+        name = "unfinished"
+
+    for bot_class in (BotController, Unfinished):
+        try:
+            bot_class()
+            assert False, "Bots must implement choose_direction"
+        except TypeError:
+            pass
+
+if __name__ == "__main__":
+    test_distance_cache()
+    print("✓ Distance cache test passed")
+
+    test_distance_cache_repair_matches_recompute()
+    print("✓ Distance cache repair test passed")
+
+    test_random_bot_only_picks_open_cells()
+    print("✓ Random bot test passed")
+
+    test_greedy_bot_reaches_pellet()
+    print("✓ Greedy bot test passed")
+
+    test_greedy_bot_follows_graph_routes()
+    print("✓ Graph-routed greedy bot test passed")
+
+    test_avoiding_bot_flees_ghost()
+    print("✓ Ghost-avoiding bot test passed")
+
+    test_bots_drive_headless_game()
+    print("✓ Headless bot game test passed")
+
+    test_create_bot_rejects_unknown_kind()
+    print("✓ Bot factory test passed")
+
+    test_unfinished_bots_fail_when_built()
+    print("✓ Abstract bot test passed")
+
+    print("\nAll bot tests passed!")
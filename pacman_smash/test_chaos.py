@@ -0,0 +1,86 @@
+"""
+Test the timed chaos effect engine.
+"""
+
+from ai_controller import AIController, ChaosEvent
+from chaos import ChaosEffectEngine
+from ghost_ai import GhostManager
+from maze import Maze
+from player import Player, PLAYER_1_CONTROLS, PLAYER_1_COLOR, PowerUpType
+
+def _setup(num_players=2):
+    maze = Maze(25, 19)
+    ghost_manager = GhostManager()
+    ghost_manager.create_default_ghosts(maze.width, maze.height)
+    players = [Player(i, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+               for i in range(1, num_players + 1)]
+    return maze, ghost_manager, players
+
+def test_ghost_speed_boost_reverts():
+    """Test that repeated boosts neither compound nor outlive their duration."""
+    maze, ghost_manager, players = _setup()
+    ai = AIController()
+    event = ChaosEvent("Ghost Speed Boost", "Increases all ghost speeds", 8.0, 25.0)
+
+    for t in (0.0, 1.0, 2.0):
+        ai.chaos_engine.trigger(event, maze, ghost_manager, players, current_time=t)
+    assert all(ghost.speed_multiplier == 1.5 for ghost in ghost_manager.ghosts)
+
+    # The earlier triggers' timers are stale and must not revert the latest one
+    assert ai.chaos_engine.update(maze, ghost_manager, players, current_time=9.0) == []
+    assert ai.chaos_engine.update(maze, ghost_manager, players,
+                                  current_time=10.0) == ["Ghost Speed Boost"]
+    assert all(ghost.speed_multiplier == 1.0 for ghost in ghost_manager.ghosts)
+
+    # Balancing changes made during the boost survive the revert
+    ai.chaos_engine.trigger(event, maze, ghost_manager, players, current_time=20.0)
+    ghost_manager.ghosts[0].set_speed_multiplier(2.0)
+    ai.chaos_engine.update(maze, ghost_manager, players, current_time=30.0)
+    assert ghost_manager.ghosts[0].speed_multiplier == 2.0
+
+def test_speed_reversal_swaps_and_restores():
+    """Test that the leader and trailer trade speeds until the revert."""
+    maze, ghost_manager, players = _setup(3)
+    leader, middle, trailer = players
+    leader.score, middle.score, trailer.score = 300, 200, 100
+    trailer.add_powerup(PowerUpType.SPEED_BOOST, 60.0)
+
+    engine = AIController().chaos_engine
+    event = ChaosEvent("Speed Reversal", "Swaps player speeds temporarily", 5.0, 35.0)
+    engine.trigger(event, maze, ghost_manager, players, current_time=0.0)
+
+    assert abs(leader.get_current_speed() - 1.5) < 1e-9
+    assert abs(trailer.get_current_speed() - 1.0) < 1e-9
+    assert middle.get_current_speed() == 1.0
+
+    engine.update(maze, ghost_manager, players, current_time=5.0)
+    assert [p.speed for p in players] == [1.0, 1.0, 1.0]
+    assert not engine.is_active("Speed Reversal")
+
+def test_update_only_touches_due_events():
+    """Test that unrelated registrations cost nothing per tick."""
+    engine = ChaosEffectEngine()
+    calls = []
+    for i in range(100):
+        engine.register(f"event{i}", lambda *args: None,
+                        lambda state, *args, i=i: calls.append(i))
+
+    event = ChaosEvent("event42", "", 1.0, 0.0)
+    assert engine.trigger(event, None, None, [], current_time=0.0)
+    assert not engine.trigger(ChaosEvent("unknown", "", 1.0, 0.0), None, None, [])
+
+    assert engine.update(None, None, [], current_time=0.5) == []
+    assert engine.update(None, None, [], current_time=1.0) == ["event42"]
+    assert calls == [42]
+
+if __name__ == "__main__":
+    test_ghost_speed_boost_reverts()
+    print("✓ Ghost speed boost revert test passed")
+
+    test_speed_reversal_swaps_and_restores()
+    print("✓ Speed reversal test passed")
+
+    test_update_only_touches_due_events()
+    print("✓ Due-event update test passed")
+
+    print("\nAll chaos tests passed!")
@@ -0,0 +1,100 @@
+"""
+Test chaos wall selection and connectivity-checked restoration.
+"""
+
+import random
+from maze import Maze, CellType
+from chaos_planner import WallChaosPlanner
+from test_pathfinding import make_maze
+
+def _interior_walls(maze):
+    return {(x, y) for y in range(1, maze.height - 1) for x in range(1, maze.width - 1)
+            if maze.is_wall(x, y)}
+
+def test_wall_index_follows_grid():
+    """Test that the maintained wall index always matches the grid."""
+    rng = random.Random(2)
+    maze = Maze(21, 17)
+    planner = maze.chaos_planner
+    assert set(planner._walls) == _interior_walls(maze)
+
+    for _ in range(100):
+        x, y = rng.randint(0, 20), rng.randint(0, 16)
+        maze.set_cell(x, y, CellType.PATH.value if maze.is_wall(x, y) else CellType.WALL.value)
+    planner.sample_walls(10, rng)
+    assert set(planner._walls) == _interior_walls(maze)
+    assert all(planner._walls[slot] == wall for wall, slot in planner._slot.items())
+
+def test_remove_and_restore_round_trip():
+    """Test that removed walls come back and the maze matches its original."""
+    maze = Maze(25, 19)
+    walls = _interior_walls(maze)
+    removed = maze.chaos_planner.remove_walls(8, 0.0, rng=random.Random(4))
+
+    assert len(set(removed)) == 8 and set(removed) <= walls
+    assert all(not maze.is_wall(*pos) for pos in removed)
+    assert maze.next_modification_expiry() <= maze.chaos_planner.next_restore_time()
+
+    assert maze.restore_expired_modifications() == 8
+    assert _interior_walls(maze) == walls
+    assert not maze.temporary_modifications
+
+def test_restore_never_seals_occupants_in():
+    """Test that a wall is held open while closing it would trap someone."""
+    maze = make_maze([
+        "#######",
+        "#.....#",
+        "###.###",
+        "#.#.#.#",
+        "#######",
+    ])
+    planner = WallChaosPlanner(maze, retry_delay=1.0)
+    occupants = [(1, 3)]
+    planner.occupants = lambda: occupants
+
+    # Open the wall at (1, 2) so the pocket at (1, 3) joins the corridor
+    planner._walls = [(1, 2)]
+    planner._slot = {(1, 2): 0}
+    planner.remove_walls(1, 0.0, current_time=100.0)
+
+    assert planner.restore_due(100.0) == 0
+    assert planner.restores_postponed == 1
+    assert planner.next_restore_time() == 101.0
+
+    # Standing on the opened cell blocks it too
+    occupants[0] = (1, 2)
+    assert planner.restore_due(101.0) == 0
+
+    occupants[0] = (3, 1)
+    assert planner.restore_due(102.0) == 1
+    assert maze.is_wall(1, 2)
+
+def test_large_events_spread_over_updates():
+    """Test removing thousands of walls and restoring them in bounded batches."""
+    maze = Maze(120, 100)
+    planner = WallChaosPlanner(maze, max_restores_per_update=500)
+    walls = _interior_walls(maze)
+
+    removed = planner.remove_walls(2000, 0.0, current_time=0.0, rng=random.Random(1))
+    assert len(removed) == 2000
+
+    batches = []
+    while maze.temporary_modifications:
+        batches.append(planner.restore_due(1.0))
+    assert max(batches) <= 500 and sum(batches) == 2000
+    assert _interior_walls(maze) == walls
+
+if __name__ == "__main__":
+    test_wall_index_follows_grid()
+    print("✓ Wall index test passed")
+
+    test_remove_and_restore_round_trip()
+    print("✓ Chaos round trip test passed")
+
+    test_restore_never_seals_occupants_in()
+    print("✓ Occupant protection test passed")
+
+    test_large_events_spread_over_updates()
+    print("✓ Large event batching test passed")
+
+    print("\nAll chaos planner tests passed!")
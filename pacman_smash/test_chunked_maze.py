@@ -0,0 +1,137 @@
+"""
+Test chunked, lazily generated maze storage.
+"""
+
+import os
+import tempfile
+import pygame
+from collections import deque
+from maze import CellType
+from chunked_maze import ChunkedMaze, TiledMazeSource
+from pathfinding import astar
+
+def test_chunks_load_lazily_and_stay_bounded():
+    """Test that only touched chunks are generated and residency is capped."""
+    maze = ChunkedMaze(2001, 2001, seed=1, chunk_size=32, max_resident_chunks=4)
+    assert maze.store.resident_count == 0
+    assert maze.is_valid_position(1, 1)
+    assert maze.store.resident_count == 1
+
+    for i in range(10):
+        maze.is_wall(i * 150, i * 150)
+    assert maze.store.resident_count == 4
+    assert maze.store.generated == 10  # (0, 0) shares the first chunk
+    assert maze.store.spills == 0  # Untouched chunks are regenerated, not written
+    maze.close()
+
+def test_modified_chunks_spill_and_reload():
+    """Test that edits survive eviction through the spill directory."""
+    with tempfile.TemporaryDirectory() as directory:
+        maze = ChunkedMaze(513, 513, seed=2, chunk_size=32, max_resident_chunks=2,
+                           spill_dir=directory)
+        maze.set_cell(40, 40, CellType.POWER_UP.value)
+        maze.is_wall(200, 200)
+        maze.is_wall(400, 400)
+        assert maze.store.spills == 1
+        assert os.listdir(directory) == ["1_1.chunk"]
+
+        assert maze.get_cell_type(40, 40) == CellType.POWER_UP
+        assert maze.store.loaded_from_disk == 1
+        maze.close()
+
+def test_chunks_are_deterministic_and_joined():
+    """Test that regenerated chunks match and neighbouring chunks connect."""
+    source = TiledMazeSource(257, 257, seed=4)
+    assert source(1, 2, 32) == source(1, 2, 32)
+
+    maze = ChunkedMaze(257, 257, seed=4, chunk_size=32, max_resident_chunks=8)
+    path = astar(maze, (1, 1), (255, 255))
+    assert path is not None
+    # The path crosses chunk borders and never goes through a wall
+    assert len({(x // 32, y // 32) for x, y in path}) > 8
+    assert all(maze.is_valid_position(x, y) for x, y in path)
+    assert maze.store.resident_count <= 8
+    maze.close()
+
+def _reachable_from_start(maze):
+    seen = {(1, 1)}
+    queue = deque([(1, 1)])
+    while queue:
+        for adjacent in maze.get_valid_adjacent_positions(*queue.popleft()):
+            if adjacent not in seen:
+                seen.add(adjacent)
+                queue.append(adjacent)
+    return seen
+
+def test_partial_edge_chunks_stay_joined():
+    """Test chunks on the world border, partial or a whole chunk wide."""
+    for width, height, chunk_size in [(200, 200, 64), (300, 250, 64), (70, 70, 64),
+                                      (100, 45, 32), (66, 130, 64), (64, 64, 16),
+                                      (128, 64, 32), (64, 39, 16), (65, 64, 32)]:
+        for generator in ("braided", "binary_tree", "sidewinder", "backtracker"):
+            maze = ChunkedMaze(width, height, generator=generator, seed=1,
+                               chunk_size=chunk_size, max_resident_chunks=64)
+            reached = _reachable_from_start(maze)
+            assert (width - 2, height - 2) in reached, (width, height, generator)
+            assert (width // 2, height // 2) in reached
+            # Every open cell is connected; nothing is cut off by the crop
+            assert len(reached) == sum(1 for y in range(height) for x in range(width)
+                                       if maze.is_valid_position(x, y))
+            maze.close()
+
+    try:
+        ChunkedMaze(200, 200, generator="rooms")
+        assert False, "Rooms do not keep a lattice for the doorways"
+    except ValueError:
+        pass
+
+def test_pellets_follow_resident_chunks():
+    """Test pellet tracking and counts across evictions."""
+    maze = ChunkedMaze(129, 129, seed=3, chunk_size=32, max_resident_chunks=1)
+    maze.is_wall(5, 5)
+    first_chunk_pellets = maze.get_pellet_count()
+    x, y = next(iter(maze.pellet_positions))
+    assert maze.collect_pellet(x, y)
+    assert not maze.collect_pellet(x, y)
+
+    maze.is_wall(100, 100)  # Evicts the first chunk
+    assert all((px // 32, py // 32) == (3, 3) for px, py in maze.pellet_positions)
+    assert maze.get_pellet_count() == maze.total_pellets - 1
+    assert maze.get_pellet_count() > first_chunk_pellets
+
+    maze.restore_original_maze()
+    assert maze.get_cell_type(x, y) == CellType.EMPTY  # Eaten pellets stay eaten
+    maze.close()
+
+def test_rendering_touches_visible_chunks_only():
+    """Test that rendering a window only loads the chunks on screen."""
+    pygame.init()
+    screen = pygame.Surface((320, 320))
+    maze = ChunkedMaze(4001, 4001, seed=5, chunk_size=16, max_resident_chunks=16)
+    maze.cell_size = 10
+    maze.render(screen, offset_x=-1000 * 10, offset_y=-1000 * 10)
+    assert maze.store.generated <= 9
+    assert maze.store.resident_count == maze.store.generated
+    maze.close()
+    pygame.quit()
+
+if __name__ == "__main__":
+    test_chunks_load_lazily_and_stay_bounded()
+    print("✓ Lazy loading test passed")
+
+    test_modified_chunks_spill_and_reload()
+    print("✓ Spill test passed")
+
+    test_chunks_are_deterministic_and_joined()
+    print("✓ Chunk join test passed")
+
+    test_partial_edge_chunks_stay_joined()
+    print("✓ Partial chunk join test passed")
+
+    test_pellets_follow_resident_chunks()
+    print("✓ Pellet tracking test passed")
+
+    test_rendering_touches_visible_chunks_only()
+    print("✓ Windowed rendering test passed")
+
+    print("\nAll chunked maze tests passed!")
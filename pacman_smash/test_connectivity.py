@@ -0,0 +1,114 @@
+"""
+Test the disjoint-set connectivity index and maze reachability checks.
+"""
+
+import random
+from collections import deque
+from maze import Maze, CellType
+from test_pathfinding import make_maze
+
+def _flood_components(maze):
+    """Label components with a plain BFS for comparison."""
+    labels = {}
+    for start in maze.find_path_positions():
+        if start in labels:
+            continue
+        labels[start] = start
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for adjacent in maze.get_valid_adjacent_positions(*cell):
+                if adjacent not in labels:
+                    labels[adjacent] = start
+                    queue.append(adjacent)
+    return labels
+
+def _assert_matches_flood(maze):
+    """Check that two cells share a component exactly when BFS says so."""
+    index = maze.connectivity
+    labels = _flood_components(maze)
+    by_component = {}
+    for cell, flood_label in labels.items():
+        component = index.component(cell)
+        assert component is not None
+        assert by_component.setdefault(component, flood_label) == flood_label
+    assert len(by_component) == index.component_count == len(set(labels.values()))
+    for cell in labels:
+        assert index.component_size(cell) == sum(1 for other in labels.values()
+                                                 if other == labels[cell])
+
+def test_index_matches_flood_fill():
+    """Test the index on a generated maze."""
+    maze = Maze(25, 19)
+    _assert_matches_flood(maze)
+    assert maze.connectivity.connected((1, 1), (23, 17))
+    assert maze.connectivity.component((0, 0)) is None
+
+def test_index_follows_wall_changes():
+    """Test merges and splits against a fresh flood fill after random flips."""
+    rng = random.Random(3)
+    maze = Maze(21, 17)
+    index = maze.connectivity
+    for _ in range(150):
+        x, y = rng.randint(1, 19), rng.randint(1, 15)
+        maze.set_cell(x, y, CellType.PATH.value if maze.is_wall(x, y) else CellType.WALL.value)
+        _assert_matches_flood(maze)
+    assert index.merges > 0 and index.splits > 0
+
+def test_closing_a_loop_cell_relabels_nothing():
+    """Test that closing a cell on a loop does not split its component."""
+    maze = make_maze([
+        "#######",
+        "#.....#",
+        "#.###.#",
+        "#.....#",
+        "#######",
+    ])
+    index = maze.connectivity
+    maze.set_cell(3, 1, CellType.WALL.value)
+    assert index.splits == 0 and index.component_count == 1
+
+    # Closing the other side cuts the ring in two
+    maze.set_cell(3, 3, CellType.WALL.value)
+    assert index.splits == 1 and index.component_count == 2
+    assert not maze.is_area_accessible((2, 1), [(4, 1)])
+    maze.set_cell(3, 1, CellType.PATH.value)
+    assert maze.is_area_accessible((2, 1), [(4, 1), (2, 3)])
+
+def test_chaos_round_trip_preserves_connectivity():
+    """Test the connectivity preservation property through a chaos round trip."""
+    maze = Maze(25, 19)
+    index = maze.connectivity
+    components = index.component_count
+    open_cells = maze.find_path_positions()
+
+    maze.apply_chaos_mode(0.0, 7)
+    assert index.component_count <= components
+    maze.restore_expired_modifications()
+    assert index.component_count == components
+    assert maze.is_area_accessible(open_cells[0], open_cells)
+
+def test_accessible_from_inside_wall():
+    """Test the flood-fill fallback for starts on walls."""
+    maze = Maze(15, 15)
+    assert maze.is_area_accessible((0, 1), [(1, 1), (2, 1)])
+    assert not maze.is_area_accessible((0, 1), [(0, 0)])
+    assert maze.is_area_accessible((0, 0), [])
+
+if __name__ == "__main__":
+    test_index_matches_flood_fill()
+    print("✓ Flood fill comparison test passed")
+
+    test_index_follows_wall_changes()
+    print("✓ Incremental merge/split test passed")
+
+    test_closing_a_loop_cell_relabels_nothing()
+    print("✓ Loop closing test passed")
+
+    test_chaos_round_trip_preserves_connectivity()
+    print("✓ Chaos connectivity preservation test passed")
+
+    test_accessible_from_inside_wall()
+    print("✓ Wall start fallback test passed")
+
+    print("\nAll connectivity tests passed!")
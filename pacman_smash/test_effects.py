@@ -0,0 +1,109 @@
+"""
+Test expiry-ordered effect tracking.
+"""
+
+from effects import EffectRule, EffectTracker
+from player import Player, PLAYER_1_CONTROLS, PLAYER_1_COLOR, PowerUpType, StatusEffect
+
+RULES = {
+    'boost': EffectRule(speed_multiplier=2.0, max_stacks=2),
+    'slow': EffectRule(speed_multiplier=0.5),
+    'freeze': EffectRule(freezes=True, max_stacks=1),
+    'once': EffectRule(max_stacks=1, refresh=False),
+}
+
+def test_cached_stats_follow_expiry():
+    """Test that stats change only as effects start and end."""
+    tracker = EffectTracker(RULES)
+    tracker.add('boost', 5.0, 0.0)
+    tracker.add('slow', 2.0, 1.0)
+    tracker.add('freeze', 1.0, 1.0)
+
+    assert tracker.speed_multiplier == 1.0
+    assert tracker.frozen
+    assert tracker.next_expiry == 2.0
+
+    # Nothing due yet
+    assert tracker.update(1.5) == []
+    assert tracker.frozen
+
+    expired = tracker.update(3.0)
+    assert sorted(effect.type for effect in expired) == ['freeze', 'slow']
+    assert tracker.speed_multiplier == 2.0
+    assert not tracker.frozen
+    assert tracker.next_expiry == 5.0
+
+    tracker.update(5.0)
+    assert tracker.speed_multiplier == 1.0
+    assert len(tracker) == 0
+
+def test_stacking_rules():
+    """Test max stacks, refresh and non-refreshing kinds."""
+    tracker = EffectTracker(RULES)
+    tracker.add('boost', 2.0, 0.0)
+    tracker.add('boost', 4.0, 0.0)
+    assert tracker.speed_multiplier == 4.0
+
+    # A third boost refreshes the earliest-ending stack instead of stacking
+    refreshed = tracker.add('boost', 5.0, 1.0)
+    assert tracker.count('boost') == 2
+    assert refreshed.end_time == 6.0
+    assert tracker.speed_multiplier == 4.0
+
+    # The stale expiry at t=2 must not end the refreshed stack
+    assert tracker.update(2.5) == []
+    assert tracker.count('boost') == 2
+    tracker.update(4.0)
+    assert tracker.speed_multiplier == 2.0
+    tracker.update(6.0)
+    assert tracker.speed_multiplier == 1.0
+
+    tracker.add('once', 5.0, 0.0)
+    tracker.add('once', 10.0, 1.0)
+    assert tracker.end_time('once') == 5.0
+
+def test_many_concurrent_effects():
+    """Test that lots of effects expire in order."""
+    tracker = EffectTracker(RULES)
+    for i in range(500):
+        tracker.add('slow' if i % 2 else 'other', 1.0 + i * 0.01, 0.0)
+
+    tracker.update(1.995)
+    assert len(tracker) == 400
+    assert tracker.count('slow') == 200
+    assert abs(tracker.speed_multiplier - 0.5 ** 200) < 1e-12
+
+def test_player_effects():
+    """Test that players read speed and freeze from cached stats."""
+    player = Player(1, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+    for _ in range(5):
+        player.add_powerup(PowerUpType.SPEED_BOOST, 10.0)
+    player.add_powerup(PowerUpType.GHOST_CONFUSION, 10.0)
+
+    # Speed boosts cap at three stacks
+    assert abs(player.get_current_speed() - 1.5 ** 3) < 1e-9
+    assert len(player.active_powerups) == 4
+
+    player.freeze(10.0)
+    assert player.is_frozen
+    assert player.freeze_end_time > 0
+    assert not player.is_movement_allowed()
+
+    player.effects.remove(StatusEffect.FROZEN)
+    assert not player.is_frozen
+    assert player.freeze_end_time == 0.0
+
+if __name__ == "__main__":
+    test_cached_stats_follow_expiry()
+    print("✓ Cached stat expiry test passed")
+
+    test_stacking_rules()
+    print("✓ Stacking rule test passed")
+
+    test_many_concurrent_effects()
+    print("✓ Concurrent effect test passed")
+
+    test_player_effects()
+    print("✓ Player effect test passed")
+
+    print("\nAll effect tests passed!")
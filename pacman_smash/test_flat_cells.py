@@ -0,0 +1,101 @@
+"""
+Test flat cell indices and the neighbour table.
+"""
+
+import pygame
+from collections import deque
+from maze import Maze, CellType
+from navigation import DistanceCache
+from ghost_ai import Ghost, GhostManager
+from main import GameEngine
+
+def _neighbour_positions(maze):
+    positions = maze.cell_positions
+    return [[positions[cell] for cell in cells] for cells in maze.neighbours]
+
+def _expected_neighbours(maze):
+    return [maze.get_valid_adjacent_positions(x, y)
+            for y in range(maze.height) for x in range(maze.width)]
+
+def test_neighbour_table_follows_walls():
+    """Test the table against get_valid_adjacent_positions through wall changes."""
+    maze = Maze(31, 25, generator="braided", seed=7)
+    assert _neighbour_positions(maze) == _expected_neighbours(maze)
+
+    checkpoint = maze.checkpoint()
+    maze.apply_chaos_mode(num_walls_to_remove=10)
+    maze.set_cell(1, 1, CellType.WALL.value)
+    assert _neighbour_positions(maze) == _expected_neighbours(maze)
+    maze.rollback(checkpoint)
+    assert _neighbour_positions(maze) == _expected_neighbours(maze)
+
+    maze.generate_maze()
+    assert _neighbour_positions(maze) == _expected_neighbours(maze)
+
+def test_cell_positions_are_shared():
+    """Test that index <-> position conversion reuses one tuple per cell."""
+    maze = Maze()
+    index = maze.cell_index(3, 5)
+    assert index == 5 * maze.width + 3
+    assert maze.cell_positions[index] == (3, 5)
+    assert maze.cell_positions[index] is maze.cell_positions[index]
+
+def test_distance_field_matches_tuple_bfs():
+    """Test the flat-index BFS against a plain tuple BFS."""
+    maze = Maze(41, 33, generator="rooms", seed=4)
+    expected = {(1, 1): 0}
+    queue = deque([(1, 1)])
+    while queue:
+        cell = queue.popleft()
+        for adjacent in maze.get_valid_adjacent_positions(*cell):
+            if adjacent not in expected:
+                expected[adjacent] = expected[cell] + 1
+                queue.append(adjacent)
+    field = DistanceCache(maze).distances_from((1, 1))
+    assert field == expected
+    assert list(field) == list(expected)  # Same BFS order
+
+def test_ghost_moves_use_neighbour_table():
+    """Test that managed ghosts get the same moves without scanning the grid."""
+    maze = Maze()
+    manager = GhostManager(maze)
+    for ghost in manager.ghosts:
+        unmanaged = Ghost(ghost.ghost_id, ghost.position, ghost.color)
+        assert ghost.get_valid_moves(maze.grid) == unmanaged.get_valid_moves(maze.grid)
+
+def test_player_moves_stay_on_the_grid():
+    """Test that flat-index steps never wrap across a row edge."""
+    game = GameEngine(headless=True)
+    maze = game.maze
+    player = game.players[0]
+    last = maze.width - 1
+    maze.set_cell(last, 1, CellType.PATH.value)
+    maze.set_cell(0, 2, CellType.PATH.value)
+
+    player.position = (last, 1)
+    game.resolve_moves([(player, (1, 0))])
+    assert player.position == (last, 1)
+
+    player.position = (1, 1)
+    game.resolve_moves([(player, (0, 1))])
+    assert player.position == (1, 2)
+    assert player.position is maze.cell_positions[maze.cell_index(1, 2)]
+    pygame.quit()
+
+if __name__ == "__main__":
+    test_neighbour_table_follows_walls()
+    print("✓ Neighbour table test passed")
+
+    test_cell_positions_are_shared()
+    print("✓ Shared positions test passed")
+
+    test_distance_field_matches_tuple_bfs()
+    print("✓ Flat BFS test passed")
+
+    test_ghost_moves_use_neighbour_table()
+    print("✓ Ghost move test passed")
+
+    test_player_moves_stay_on_the_grid()
+    print("✓ Player step test passed")
+
+    print("\nAll flat cell tests passed!")
@@ -3,7 +3,7 @@ Test ghost AI system functionality.
 """
 
 import time
-from ghost_ai import Ghost, GhostManager, GhostBehavior
+from ghost_ai import Ghost, GhostManager, GhostBehavior, lod_distance_for
 from player import Player, PLAYER_1_CONTROLS, PLAYER_1_COLOR
 from maze import Maze
 
@@ -194,6 +194,102 @@ def test_ghost_confusion_effect():
     for ghost in manager.ghosts:
         assert ghost.is_confused()
 
+def test_ghost_move_queue():
+    """Test that only due ghosts are processed and speed changes re-key the queue."""
+    maze = Maze(25, 19)
+    manager = GhostManager()
+    manager.create_default_ghosts(25, 19)
+    for i in range(40):
+        manager.add_ghost(Ghost(10 + i, (1 + i % 23, 1), (255, 0, 0)))
+    
+    # Everyone is due at first
+    assert manager.update_all(maze.grid, []) == len(manager.ghosts)
+    
+    # Right after moving, nobody is due
+    now = time.time()
+    assert manager.update_all(maze.grid, [], now) == 0
+    assert manager.next_move_time() > now
+    
+    # Speeding one ghost up brings just that ghost forward
+    fast = manager.ghosts[0]
+    old_due = manager.next_move_time()
+    fast.last_move_time = now - 1.0
+    fast.set_speed_multiplier(3.0)
+    assert manager.next_move_time() <= now
+    assert manager.next_move_time() < old_due
+    assert manager.update_all(maze.grid, [], now) == 1
+    
+    # Re-applying the same speed (e.g. every balancing pass) queues nothing
+    manager.set_target_priorities([(1, 1.0)])
+    queued = len(manager._move_queue)
+    for _ in range(20):
+        manager.set_target_priorities([(1, 1.0)])
+    assert len(manager._move_queue) == queued
+    
+    # Superseded entries are compacted away instead of piling up
+    for step in range(500):
+        fast.set_speed_multiplier(1.0 + (step % 2))
+    assert len(manager._move_queue) <= 2 * len(manager.ghosts)
+    assert manager.next_move_time() == min(ghost.next_move_time() for ghost in manager.ghosts)
+
+def test_ghost_level_of_detail():
+    """Test that far ghosts use the coarse update and near ghosts the full AI."""
+    maze = Maze(41, 41)
+    manager = GhostManager(maze, lod_distance=6, coarse_steps=3)
+    player = Player(1, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+    
+    path_cells = maze.find_path_positions()
+    near_start = min(path_cells, key=lambda p: abs(p[0] - 2) + abs(p[1] - 1))
+    far_start = max(path_cells, key=lambda p: p[0] + p[1])
+    near_ghost = Ghost(0, near_start, (255, 0, 0))
+    far_ghost = Ghost(1, far_start, (0, 255, 0))
+    manager.add_ghost(near_ghost)
+    manager.add_ghost(far_ghost)
+    
+    near_cells = manager.get_near_cells(maze.grid, [player])
+    assert near_start in near_cells
+    assert far_start not in near_cells
+    assert manager.get_near_cells(maze.grid, [player]) is near_cells  # Cached
+    
+    manager.update_all(maze.grid, [player])
+    assert manager.full_updates == 1
+    assert manager.coarse_updates == 1
+    
+    # A coarse tick covers several cells and waits proportionally longer
+    moved = abs(far_ghost.position[0] - far_start[0]) + abs(far_ghost.position[1] - far_start[1])
+    assert 0 < moved <= 3
+    assert maze.is_valid_position(*far_ghost.position)
+    manager.update_all(maze.grid, [player],
+                       far_ghost.last_move_time + 2 * far_ghost.move_cooldown)
+    assert manager.coarse_updates == 1
+    
+    # Disabling level of detail gives every ghost the full AI
+    manager.lod_distance = None
+    assert manager.get_near_cells(maze.grid, [player]) is None
+
+def test_level_of_detail_only_on_large_maps():
+    """Test that the classic map keeps the full AI for every ghost."""
+    small = Maze()
+    assert GhostManager(small).lod_distance is None
+    assert lod_distance_for(small) is None
+    assert lod_distance_for(Maze(101, 101, generator="binary_tree", seed=1)) == 12
+
+def test_coarse_chaser_follows_path():
+    """Test that a far chasing ghost steps along its wall-correct path."""
+    maze = Maze(41, 41, generator="backtracker", seed=3)
+    manager = GhostManager(maze, lod_distance=4, coarse_steps=3)
+    player = Player(1, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+    start = (maze.width - 2, maze.height - 2)
+    ghost = Ghost(0, start, (255, 0, 0))
+    ghost.set_behavior(GhostBehavior.CHASE)
+    ghost.set_target_player(1)
+    manager.add_ghost(ghost)
+    
+    path = manager.path_cache.find_path(start, player.position)
+    manager.update_all(maze.grid, [player])
+    assert manager.coarse_updates == 1
+    assert ghost.position == path[3]
+
 if __name__ == "__main__":
     test_ghost_creation()
     print("✓ Ghost creation test passed")
@@ -222,4 +318,16 @@ if __name__ == "__main__":
     test_ghost_confusion_effect()
     print("✓ Ghost confusion effect test passed")
     
-    print("\nAll ghost AI tests passed!")
\ No newline at end of file
+    test_ghost_move_queue()
+    print("✓ Ghost move queue test passed")
+    
+    test_ghost_level_of_detail()
+    print("✓ Ghost level of detail test passed")
+    
+    test_level_of_detail_only_on_large_maps()
+    print("✓ Level of detail default test passed")
+    
+    test_coarse_chaser_follows_path()
+    print("✓ Coarse chase path test passed")
+    
+    print("\nAll ghost AI tests passed!")
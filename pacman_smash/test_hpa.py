@@ -0,0 +1,141 @@
+"""
+Test hierarchical pathfinding over clustered mazes.
+"""
+
+import random
+from maze import Maze, CellType
+from navigation import DistanceCache
+from nav_graph import CorridorGraph
+from hpa import HierarchicalPathfinder, LazyPath, create_route_planner
+from ghost_ai import Ghost, GhostManager, GhostBehavior
+from player import Player, PLAYER_1_CONTROLS, PLAYER_1_COLOR
+
+def _check_route(maze, path, start, goal, expected):
+    """Check that a route is walkable and reaches the goal when BFS does."""
+    if expected is None:
+        assert path is None
+        return
+    assert path is not None and path[0] == start and path[-1] == goal
+    assert len(path) - 1 >= expected
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        assert maze.is_valid_position(*b)
+
+def test_routes_are_walkable():
+    """Test routes across many clusters against BFS reachability."""
+    maze = Maze(45, 37)
+    planner = HierarchicalPathfinder(maze, cluster_size=8)
+    distances = DistanceCache(maze)
+    cells = maze.find_path_positions()
+    for start, goal in zip(cells[::13], cells[5::17]):
+        path = planner.route(start, goal)
+        _check_route(maze, path, start, goal, distances.distance(start, goal))
+
+    assert planner.get_stats()['clusters'] == 6 * 5
+
+def test_route_refines_lazily():
+    """Test that route() only expands the hops that are read."""
+    maze = Maze(45, 37)
+    planner = HierarchicalPathfinder(maze, cluster_size=8)
+    route = planner.route((1, 1), (43, 35))
+    assert route.refined == 1
+    assert route[-1] == (43, 35) and route.refined == 1  # The goal needs no refinement
+    length = len(route)
+    assert route[1] != (1, 1) and route.refined < length
+
+    # Step-1 slices are views that share the refinement
+    rest = route[1:]
+    assert len(rest) == length - 1 and rest[0] == route[1]
+    assert rest[-1] == (43, 35)
+
+    walk = planner.iter_route((1, 1), (43, 35))
+    assert next(walk) == (1, 1)
+    assert ((1, 1),) + tuple(walk) == route
+    assert len(route) == length == route.refined
+    assert planner.distance((1, 1), (43, 35)) == length - 1
+    assert planner.waypoints((1, 1), (43, 35))[-1] == (43, 35)
+
+def test_lazy_route_follows_wall_changes():
+    """Test that hops refined after a wall change still give a walkable route."""
+    maze = Maze(45, 37)
+    planner = HierarchicalPathfinder(maze, cluster_size=8)
+    route = planner.route((1, 1), (43, 35))
+    eager = tuple(planner.iter_route((1, 1), (43, 35)))
+    # Wall off a cell inside a hop in the middle of the route before it is refined
+    waypoints = set(planner.waypoints((1, 1), (43, 35)))
+    x, y = next(cell for cell in eager[len(eager) // 2:] if cell not in waypoints)
+    maze.set_cell(x, y, CellType.WALL.value)
+    cells = tuple(route)
+    assert len(cells) == len(route)
+    assert cells[0] == (1, 1) and cells[-1] == (43, 35)
+    assert (x, y) not in cells
+    for a, b in zip(cells, cells[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+
+def test_ghosts_chase_along_lazy_routes():
+    """Test that ghost chase paths from the path cache stay lazily refined."""
+    maze = Maze(45, 37)
+    planner = HierarchicalPathfinder(maze, cluster_size=8)
+    manager = GhostManager(maze, nav_graph=planner)
+    ghost = Ghost(0, (43, 35), (255, 0, 0))
+    ghost.set_behavior(GhostBehavior.CHASE)
+    ghost.set_target_player(1)
+    manager.add_ghost(ghost)
+    player = Player(1, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+
+    manager.update_all(maze.grid, [player])
+    assert isinstance(ghost.path, LazyPath)
+    assert ghost.position == ghost.path[1]
+    assert ghost.path.refined < len(ghost.path)
+
+def test_wall_changes_rebuild_touched_clusters():
+    """Test that only dirty clusters are recomputed and match a fresh build."""
+    rng = random.Random(5)
+    maze = Maze(45, 37)
+    planner = HierarchicalPathfinder(maze, cluster_size=8)
+
+    # One interior flip rebuilds its own cluster only
+    maze.set_cell(12, 12, CellType.PATH.value if maze.is_wall(12, 12) else CellType.WALL.value)
+    planner.route((1, 1), (43, 35))
+    assert planner.clusters_rebuilt == 1
+
+    for _ in range(20):
+        for _ in range(rng.randint(1, 5)):
+            x, y = rng.randint(1, 43), rng.randint(1, 35)
+            maze.set_cell(x, y, CellType.PATH.value if maze.is_wall(x, y) else CellType.WALL.value)
+        distances = DistanceCache(maze)
+        cells = maze.find_path_positions()
+        for start, goal in zip(rng.sample(cells, 6), rng.sample(cells, 6)):
+            path = planner.route(start, goal)
+            _check_route(maze, path, start, goal, distances.distance(start, goal))
+
+        fresh = HierarchicalPathfinder(maze, cluster_size=8)
+        assert planner._borders == fresh._borders
+        assert planner._intra == fresh._intra
+
+def test_planner_factory_picks_by_size():
+    """Test that only large mazes get the hierarchical planner."""
+    assert isinstance(create_route_planner(Maze(25, 19)), CorridorGraph)
+    assert isinstance(create_route_planner(Maze(25, 19), hierarchical_cells=100),
+                      HierarchicalPathfinder)
+
+if __name__ == "__main__":
+    test_routes_are_walkable()
+    print("✓ Walkable route test passed")
+
+    test_route_refines_lazily()
+    print("✓ Lazy refinement test passed")
+
+    test_lazy_route_follows_wall_changes()
+    print("✓ Lazy refinement wall change test passed")
+
+    test_ghosts_chase_along_lazy_routes()
+    print("✓ Lazy ghost chase test passed")
+
+    test_wall_changes_rebuild_touched_clusters()
+    print("✓ Dirty cluster rebuild test passed")
+
+    test_planner_factory_picks_by_size()
+    print("✓ Planner factory test passed")
+
+    print("\nAll hierarchical pathfinding tests passed!")
@@ -0,0 +1,121 @@
+"""
+Test the on-disk maze format and the navigation data cache.
+"""
+
+import os
+import tempfile
+import numpy as np
+from maze import Maze, CellType
+from maze_format import (save_maze, load_maze, walls_hash, adjacency_table,
+                         save_nav_data, load_nav_data)
+from nav_graph import CorridorGraph
+from navigation import DistanceCache
+
+def test_round_trip_keeps_every_cell():
+    """Test that a saved level loads back cell for cell."""
+    maze = Maze(41, 33, generator="braided", seed=5)
+    maze.set_cell(1, 1, CellType.EMPTY.value)
+    maze.set_cell(3, 1, CellType.POWER_UP.value)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "level.psmz")
+        digest = save_maze(maze, path)
+        # One bit per cell per layer, plus a small header
+        assert os.path.getsize(path) < 41 * 33 // 2 + 512
+
+        loaded = load_maze(path)
+        assert loaded.grid == maze.grid
+        pellets = {(x, y) for y, row in enumerate(maze.grid)
+                   for x, value in enumerate(row) if value == CellType.PELLET.value}
+        assert loaded.pellet_positions == pellets
+        assert loaded.total_pellets == len(pellets)
+        assert save_maze(loaded, os.path.join(directory, "copy.psmz")) == digest
+
+def test_corrupted_level_is_rejected():
+    """Test that the content hash catches edited files."""
+    maze = Maze()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "level.psmz")
+        save_maze(maze, path)
+        with open(path, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            last = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last[0] ^ 0xFF]))
+        try:
+            load_maze(path)
+            assert False, "A corrupted level should not load"
+        except ValueError:
+            pass
+        load_maze(path, verify=False)
+
+def test_walls_hash_ignores_pellets():
+    """Test that eating pellets keeps the navigation cache key."""
+    maze = Maze()
+    key = walls_hash(maze)
+    x, y = next(iter(maze.pellet_positions))
+    maze.set_cell(x, y, CellType.EMPTY.value)
+    assert walls_hash(maze) == key
+    maze.set_cell(x, y, CellType.WALL.value)
+    assert walls_hash(maze) != key
+
+def test_adjacency_table():
+    """Test the neighbour bitmasks against the maze."""
+    maze = Maze(31, 25, generator="rooms", seed=2)
+    table = adjacency_table(maze)
+    for y in range(maze.height):
+        for x in range(maze.width):
+            expected = 0
+            for bit, (dx, dy) in zip((1, 2, 4, 8), ((0, -1), (0, 1), (-1, 0), (1, 0))):
+                if maze.is_valid_position(x, y) and maze.is_valid_position(x + dx, y + dy):
+                    expected |= bit
+            assert table[y, x] == expected
+
+def test_nav_cache_round_trip():
+    """Test that cached graphs and distance fields match freshly built ones."""
+    maze = Maze(41, 33, generator="braided", seed=9)
+    graph = CorridorGraph(maze)
+    cache = DistanceCache(maze)
+    cache.distances_from((1, 1))
+    cache.distances_from((39, 31))
+
+    with tempfile.TemporaryDirectory() as directory:
+        assert load_nav_data(maze, directory) is None
+        save_nav_data(maze, directory, nav_graph=graph, distance_cache=cache)
+
+        fresh_cache = DistanceCache(maze)
+        data = load_nav_data(maze, directory, distance_cache=fresh_cache)
+        assert data is not None
+        assert data.distance_sources == 2
+        assert np.array_equal(data.adjacency, adjacency_table(maze))
+        assert fresh_cache._fields[(1, 1)] == cache.distances_from((1, 1))
+
+        loaded = data.nav_graph
+        assert loaded.nodes == graph.nodes
+        for start, goal in [((1, 1), (39, 31)), ((5, 3), (21, 17)), ((1, 31), (39, 1))]:
+            assert loaded.distance(start, goal) == graph.distance(start, goal)
+
+        # The loaded graph follows wall changes like a traced one
+        maze.set_cell(2, 1, CellType.WALL.value)
+        assert loaded.distance((1, 1), (39, 31)) == CorridorGraph(maze).distance((1, 1), (39, 31))
+
+        # Other walls mean another cache entry
+        assert load_nav_data(maze, directory) is None
+
+if __name__ == "__main__":
+    test_round_trip_keeps_every_cell()
+    print("✓ Round trip test passed")
+
+    test_corrupted_level_is_rejected()
+    print("✓ Corruption test passed")
+
+    test_walls_hash_ignores_pellets()
+    print("✓ Walls hash test passed")
+
+    test_adjacency_table()
+    print("✓ Adjacency table test passed")
+
+    test_nav_cache_round_trip()
+    print("✓ Navigation cache test passed")
+
+    print("\nAll maze format tests passed!")
@@ -0,0 +1,120 @@
+"""
+Test the seeded procedural maze generators.
+"""
+
+import time
+from collections import deque
+import numpy as np
+from maze import Maze, CellType
+from maze_generators import GENERATORS, generate, braid, sidewinder
+
+WALL = CellType.WALL.value
+
+def _reachable(grid, start):
+    """Flood fill the open cells reachable from start."""
+    height, width = grid.shape
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (0 <= nx < width and 0 <= ny < height and grid[ny, nx] != WALL and
+                    (nx, ny) not in seen):
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return seen
+
+def test_generators_are_seeded():
+    """Test that a seed always gives the same maze and seeds differ."""
+    for name in GENERATORS:
+        first = generate(name, 41, 31, seed=12)
+        assert np.array_equal(first, generate(name, 41, 31, seed=12))
+        assert not np.array_equal(first, generate(name, 41, 31, seed=13))
+
+def test_starts_and_ghost_house_connected():
+    """Test borders, start cells and ghost house for odd and even sizes."""
+    for name in GENERATORS:
+        for width, height in ((7, 7), (24, 18), (41, 31)):
+            for seed in range(3):
+                grid = generate(name, width, height, seed)
+                assert grid.shape == (height, width)
+                assert (grid[0] == WALL).all() and (grid[-1] == WALL).all()
+                assert (grid[:, 0] == WALL).all() and (grid[:, -1] == WALL).all()
+
+                reachable = _reachable(grid, (1, 1))
+                assert (width - 2, height - 2) in reachable
+                assert (width // 2, height // 2) in reachable
+
+def test_lattice_generators_are_fully_connected():
+    """Test that the lattice mazes leave no sealed-off cells."""
+    for name in ('binary_tree', 'sidewinder', 'braided', 'backtracker'):
+        grid = generate(name, 41, 31, seed=5)
+        assert len(_reachable(grid, (1, 1))) == int((grid != WALL).sum())
+
+def test_braiding_removes_dead_ends():
+    """Test that full braiding leaves no dead-end lattice cells."""
+    grid = braid(sidewinder(41, 31, seed=2), fraction=1.0, seed=2)
+    cells = grid[1:-1:2, 1:-1:2] != WALL
+    open_sides = ((grid[0:-2:2, 1:-1:2] != WALL).astype(int) + (grid[2::2, 1:-1:2] != WALL) +
+                  (grid[1:-1:2, 0:-2:2] != WALL) + (grid[1:-1:2, 2::2] != WALL))
+    assert not (cells & (open_sides == 1)).any()
+
+def test_maze_uses_generator():
+    """Test that Maze builds pellets and spawn data on a generated layout."""
+    maze = Maze(41, 31, generator="braided", seed=9)
+    again = Maze(41, 31, generator="braided", seed=9)
+    assert maze.grid == again.grid
+    assert maze.get_pellet_count() > 0
+    assert maze.is_area_accessible((1, 1), [(39, 29), (20, 15)])
+    try:
+        Maze(41, 31, generator="spiral")
+        assert False, "Unknown generators should be rejected"
+    except ValueError:
+        pass
+
+def test_maze_pellets_match_cell_scan():
+    """Test vectorized pellet placement against a per-cell scan."""
+    for generator in (None, "braided", "rooms"):
+        maze = Maze(41, 31, generator=generator, seed=4)
+        center_x, center_y = maze.width // 2, maze.height // 2
+        expected = {(x, y) for y in range(maze.height) for x in range(maze.width)
+                    if maze.original_grid[y][x] in (CellType.PATH.value, CellType.PELLET.value)
+                    and (x, y) not in ((1, 1), (maze.width - 2, maze.height - 2))
+                    and not (abs(x - center_x) <= 2 and abs(y - center_y) <= 2)}
+        assert maze.pellet_positions == expected
+        assert maze.total_pellets == len(expected)
+        assert all(maze.grid[y][x] == CellType.PELLET.value for x, y in expected)
+
+def test_huge_maze_builds_quickly():
+    """Test that a whole 2000x2000 Maze (not just the raw generator) is fast."""
+    started = time.perf_counter()
+    maze = Maze(2000, 2000, generator="braided", seed=1)
+    elapsed = time.perf_counter() - started
+    assert elapsed < 2.0, f"Maze(2000, 2000) took {elapsed:.2f}s"
+    assert len(maze.grid) == 2000 and len(maze.grid[0]) == 2000
+    assert maze.total_pellets == sum(row.count(CellType.PELLET.value) for row in maze.grid)
+    assert len(maze.pellet_positions) == maze.total_pellets
+
+if __name__ == "__main__":
+    test_generators_are_seeded()
+    print("✓ Seeded generation test passed")
+
+    test_starts_and_ghost_house_connected()
+    print("✓ Required area connectivity test passed")
+
+    test_lattice_generators_are_fully_connected()
+    print("✓ Full connectivity test passed")
+
+    test_braiding_removes_dead_ends()
+    print("✓ Braiding test passed")
+
+    test_maze_uses_generator()
+    print("✓ Maze generator option test passed")
+
+    test_maze_pellets_match_cell_scan()
+    print("✓ Pellet placement test passed")
+
+    test_huge_maze_builds_quickly()
+    print("✓ Huge maze build time test passed")
+
+    print("\nAll maze generator tests passed!")
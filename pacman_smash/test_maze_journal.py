@@ -0,0 +1,116 @@
+"""
+Test the maze mutation journal: restore, rollback and diffs.
+"""
+
+import random
+from maze import Maze, CellType
+from chunked_maze import ChunkedMaze
+
+def _snapshot(maze):
+    return [row[:] for row in maze.grid], set(maze.pellet_positions)
+
+def test_rollback_to_checkpoint():
+    """Test that rollback undoes cells and pellet tracking exactly."""
+    maze = Maze()
+    maze.set_cell(3, 1, CellType.POWER_UP.value)
+    checkpoint = maze.checkpoint()
+    before = _snapshot(maze)
+    seen = []
+    maze.add_cell_listener(lambda x, y, old, new: seen.append((x, y)))
+
+    x, y = sorted(maze.pellet_positions)[5]
+    assert maze.collect_pellet(x, y)
+    maze.set_cell(5, 5, CellType.WALL.value)
+    maze.apply_chaos_mode(num_walls_to_remove=4)
+    maze.set_cell(5, 5, CellType.PATH.value)
+    changes = maze.checkpoint() - checkpoint
+
+    assert maze.rollback(checkpoint) == changes
+    assert _snapshot(maze) == before
+    assert maze.checkpoint() == checkpoint  # Undo writes are not journaled
+    assert len(seen) == 2 * changes  # Listeners saw every change and its undo
+    assert maze.rollback(checkpoint) == 0
+
+def test_diff_reports_net_changes():
+    """Test diffs between a checkpoint and now."""
+    maze = Maze()
+    checkpoint = maze.checkpoint()
+    maze.set_cell(1, 1, CellType.POWER_UP.value)
+    maze.set_cell(1, 1, CellType.EMPTY.value)
+    maze.set_cell(3, 1, CellType.WALL.value)
+    maze.set_cell(3, 1, maze.original_grid[1][3])
+
+    assert maze.diff(checkpoint) == {(1, 1): (CellType.PATH.value, CellType.EMPTY.value)}
+    assert maze.diff(maze.checkpoint()) == {}
+
+def test_restore_visits_only_changed_cells():
+    """Test that restore touches just the changed cells and keeps eaten pellets."""
+    maze = Maze(41, 33, generator="braided", seed=3)
+    x, y = sorted(maze.pellet_positions)[0]
+    maze.collect_pellet(x, y)
+    maze.apply_chaos_mode(num_walls_to_remove=6)
+    maze.place_powerup(1, 1)
+
+    restored = []
+    maze.add_cell_listener(lambda cx, cy, old, new: restored.append((cx, cy)))
+    maze.restore_original_maze()
+    assert len(restored) == 7  # 6 walls and the power-up; the eaten pellet stays eaten
+
+    expected = [row[:] for row in maze.original_grid]
+    expected[y][x] = CellType.EMPTY.value
+    assert maze.grid == expected
+    assert not maze.temporary_modifications
+
+def test_old_checkpoints_expire():
+    """Test that checkpoints dropped from a bounded journal are refused."""
+    maze = Maze()
+    maze.max_journal = 100
+    checkpoint = maze.checkpoint()
+    rng = random.Random(1)
+    for _ in range(300):
+        maze.set_cell(rng.randrange(1, 24), rng.randrange(1, 18), rng.choice([0, 2, 3, 4]))
+    assert len(maze.journal) <= 100
+    try:
+        maze.rollback(checkpoint)
+        assert False, "An expired checkpoint should be refused"
+    except ValueError:
+        pass
+
+    recent = maze.checkpoint()
+    before = _snapshot(maze)
+    maze.set_cell(1, 1, CellType.WALL.value)
+    maze.rollback(recent)
+    assert _snapshot(maze)[0] == before[0]
+
+def test_chunked_maze_restore_and_rollback():
+    """Test the journal on a chunked maze."""
+    maze = ChunkedMaze(257, 257, seed=1, chunk_size=32, max_resident_chunks=2)
+    checkpoint = maze.checkpoint()
+    maze.set_cell(200, 201, CellType.POWER_UP.value)
+    maze.set_cell(1, 1, CellType.WALL.value)
+    maze.rollback(checkpoint)
+    assert maze.get_cell_type(1, 1) != CellType.WALL
+    assert maze.diff(checkpoint) == {}
+
+    maze.set_cell(100, 100, CellType.WALL.value)
+    maze.restore_original_maze()
+    assert maze.grid[100][100] == maze.original_grid[100][100]
+    maze.close()
+
+if __name__ == "__main__":
+    test_rollback_to_checkpoint()
+    print("✓ Rollback test passed")
+
+    test_diff_reports_net_changes()
+    print("✓ Diff test passed")
+
+    test_restore_visits_only_changed_cells()
+    print("✓ Restore test passed")
+
+    test_old_checkpoints_expire()
+    print("✓ Journal bound test passed")
+
+    test_chunked_maze_restore_and_rollback()
+    print("✓ Chunked maze journal test passed")
+
+    print("\nAll maze journal tests passed!")
@@ -0,0 +1,78 @@
+"""
+Test background maze preparation.
+"""
+
+import time
+import pygame
+from maze import Maze, CellType
+from maze_pool import MazePool, prepare_maze
+from nav_graph import CorridorGraph
+from main import GameEngine
+
+def test_prepared_maze_keeps_derived_data_in_sync():
+    """Test that a pickled prepared maze still updates its indexes."""
+    with MazePool(31, 25, generator="braided", size=1, base_seed=3) as pool:
+        prepared = pool.take(timeout=30)
+
+    assert prepared.seed == 3
+    assert prepared.maze.grid == Maze(31, 25, generator="braided", seed=3).grid
+    assert isinstance(prepared.nav_graph, CorridorGraph)
+
+    # The listeners travelled with the maze, so wall changes still reach the indexes
+    maze = prepared.maze
+    components = maze.connectivity.component_count
+    maze.set_cell(1, 1, CellType.WALL.value)
+    maze.set_cell(1, 2, CellType.WALL.value)
+    maze.set_cell(2, 1, CellType.WALL.value)
+    assert maze.connectivity.component_count >= components
+    assert prepared.nav_graph.route((1, 3), (1, 1)) is None
+
+def test_pool_refills_and_advances_seeds():
+    """Test that take() hands out mazes in seed order and keeps the pool full."""
+    with MazePool(25, 19, generator="sidewinder", size=2, base_seed=10) as pool:
+        deadline = time.time() + 30
+        while pool.ready_count() < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert pool.ready_count() == 2
+
+        seeds = [pool.take(timeout=30).seed for _ in range(3)]
+        assert seeds == [10, 11, 12]
+        assert len(pool._pending) == 2
+        assert pool.taken == 3
+
+    try:
+        pool.take()
+        assert False, "A closed pool should refuse to hand out mazes"
+    except RuntimeError:
+        pass
+
+def test_prepare_without_precompute():
+    """Test preparing a bare maze."""
+    prepared = prepare_maze(25, 19, precompute=False)
+    assert prepared.nav_graph is None
+    assert prepared.maze._connectivity is None
+
+def test_game_starts_from_pool():
+    """Test that the game engine can start on a pooled maze."""
+    pygame.init()
+    with MazePool(25, 19, generator="braided", size=1, base_seed=1) as pool:
+        game = GameEngine(headless=True, maze_pool=pool)
+    assert game.maze.grid == Maze(25, 19, generator="braided", seed=1).grid
+    assert game.ghost_manager.nav_graph is game.nav_graph
+    game.run_headless(0.2)
+    pygame.quit()
+
+if __name__ == "__main__":
+    test_prepared_maze_keeps_derived_data_in_sync()
+    print("✓ Prepared maze sync test passed")
+
+    test_pool_refills_and_advances_seeds()
+    print("✓ Pool refill test passed")
+
+    test_prepare_without_precompute()
+    print("✓ Bare preparation test passed")
+
+    test_game_starts_from_pool()
+    print("✓ Pooled game start test passed")
+
+    print("\nAll maze pool tests passed!")
@@ -0,0 +1,75 @@
+"""
+Test the columnar performance metrics store.
+"""
+
+import numpy as np
+from metrics_store import MetricsStore
+from ai_controller import AIController
+from player import Player, PLAYER_1_CONTROLS, PLAYER_1_COLOR
+
+def test_ring_buffer_keeps_newest_samples():
+    """Test that old slices are overwritten in order."""
+    store = MetricsStore(capacity=4, metric_names=('score',), initial_players=1)
+    store.add_player(7)
+    store.add_player(9)  # Grows past the initial allocation
+    for t in range(10):
+        store.record(float(t), np.array([[t], [2 * t]]))
+
+    times, values = store.history('score')
+    assert len(store) == 4
+    assert list(times) == [6.0, 7.0, 8.0, 9.0]
+    assert values.tolist() == [[6, 7, 8, 9], [12, 14, 16, 18]]
+    assert store.latest('score').tolist() == [9, 18]
+
+def test_vectorized_trends():
+    """Test velocity, slope and imbalance across all players."""
+    store = MetricsStore(capacity=16, metric_names=('score',))
+    for player_id in (1, 2, 3):
+        store.add_player(player_id)
+    for t in range(8):
+        store.record(t * 0.5, np.array([[10 * t], [5 * t], [100]]))
+
+    assert np.allclose(store.velocity('score', samples=5), [20.0, 10.0, 0.0])
+    assert np.allclose(store.trend_slopes('score'), [20.0, 10.0, 0.0])
+
+    leader, trailer, ratio = store.imbalance('score')
+    assert (leader, trailer) == (3, 2)
+    assert ratio == 100 / 35
+
+def test_controller_uses_store():
+    """Test that the AI controller samples at its configured interval."""
+    ai = AIController(tracking_interval=0.0, history_length=8)
+    players = [Player(i, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR) for i in range(1, 6)]
+    for step in range(12):
+        for i, player in enumerate(players):
+            player.score = step * i * 10
+        ai.update_player_metrics(players)
+
+    assert len(ai.metrics_store) == 8
+    summary = ai.get_performance_summary()
+    assert set(summary) == {1, 2, 3, 4, 5}
+    assert summary[1]['score_slope'] == 0.0
+    assert summary[5]['score_slope'] >= summary[2]['score_slope'] >= 0
+    assert summary[5]['relative_score'] == 2.0
+
+    # Score velocity comes from the stored score history
+    velocities = ai.metrics_store.velocity('score', ai.velocity_samples)
+    assert [summary[i]['score_velocity'] for i in range(1, 6)] == velocities.tolist()
+    assert summary[5]['score_velocity'] > summary[2]['score_velocity'] > 0
+
+    # The per-player score history keeps its list form
+    metrics = ai.player_metrics[5]
+    assert metrics.score_trend == [step * 40 for step in range(2, 12)]
+    assert metrics.get_score_velocity() == summary[5]['score_velocity']
+
+if __name__ == "__main__":
+    test_ring_buffer_keeps_newest_samples()
+    print("✓ Ring buffer test passed")
+
+    test_vectorized_trends()
+    print("✓ Vectorized trend test passed")
+
+    test_controller_uses_store()
+    print("✓ Controller store test passed")
+
+    print("\nAll metrics store tests passed!")
@@ -0,0 +1,89 @@
+"""
+Test the corridor-compressed navigation graph.
+"""
+
+import random
+from maze import Maze, CellType
+from navigation import DistanceCache
+from nav_graph import CorridorGraph
+from test_pathfinding import POCKET_LAYOUT, make_maze
+
+def _check_route(maze, graph, start, goal, expected):
+    """Check a graph route against a BFS distance."""
+    path = graph.route(start, goal)
+    if expected is None:
+        assert path is None
+        return
+    assert path is not None and path[0] == start and path[-1] == goal
+    assert len(path) - 1 == expected
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        assert maze.is_valid_position(*b)
+
+def test_graph_compresses_corridors():
+    """Test that the graph has far fewer nodes than open cells."""
+    maze = Maze(25, 19)
+    graph = CorridorGraph(maze)
+    stats = graph.get_stats()
+    open_cells = len(maze.find_path_positions())
+
+    assert stats['nodes'] < open_cells
+    assert stats['nodes'] + stats['corridor_cells'] == open_cells
+
+def test_routes_are_shortest():
+    """Test that graph routes match BFS distances."""
+    maze = Maze(25, 19)
+    graph = CorridorGraph(maze)
+    distances = DistanceCache(maze)
+    cells = maze.find_path_positions()
+    for start, goal in zip(cells[::5], cells[2::9]):
+        _check_route(maze, graph, start, goal, distances.distance(start, goal))
+
+def test_routes_around_loops():
+    """Test a maze whose outer ring has no junction on one side."""
+    maze = make_maze(POCKET_LAYOUT)
+    graph = CorridorGraph(maze)
+    distances = DistanceCache(maze)
+    cells = maze.find_path_positions()
+    for start in cells:
+        for goal in cells:
+            _check_route(maze, graph, start, goal, distances.distance(start, goal))
+
+def test_graph_follows_wall_changes():
+    """Test that repaired graphs route like a fresh rebuild."""
+    rng = random.Random(11)
+    maze = Maze(21, 21)
+    graph = CorridorGraph(maze)
+
+    for _ in range(25):
+        for _ in range(rng.randint(1, 4)):
+            x, y = rng.randint(1, 19), rng.randint(1, 19)
+            wall = maze.is_wall(x, y)
+            maze.set_cell(x, y, CellType.PATH.value if wall else CellType.WALL.value)
+
+        distances = DistanceCache(maze)
+        cells = maze.find_path_positions()
+        for start, goal in zip(rng.sample(cells, 8), rng.sample(cells, 8)):
+            _check_route(maze, graph, start, goal, distances.distance(start, goal))
+        stats = graph.get_stats()
+        assert stats['nodes'] + stats['corridor_cells'] == len(cells)
+
+    # Pellet pickups leave the graph alone
+    pellet = next(p for p in maze.pellet_positions if not maze.is_wall(*p))
+    maze.collect_pellet(*pellet)
+    assert not graph._dirty
+
+if __name__ == "__main__":
+    test_graph_compresses_corridors()
+    print("✓ Graph compression test passed")
+
+    test_routes_are_shortest()
+    print("✓ Shortest route test passed")
+
+    test_routes_around_loops()
+    print("✓ Loop route test passed")
+
+    test_graph_follows_wall_changes()
+    print("✓ Wall change repair test passed")
+
+    print("\nAll navigation graph tests passed!")
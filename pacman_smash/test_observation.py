@@ -0,0 +1,93 @@
+"""
+Test incremental observation tensors.
+"""
+
+import numpy as np
+from maze import Maze, CellType
+from observation import ObservationEncoder, CHANNEL_WALLS, CHANNEL_PELLETS, CHANNEL_POWERUPS
+from player import Player, PLAYER_1_CONTROLS, PLAYER_1_COLOR
+from ghost_ai import Ghost
+
+def _expected_cells(maze):
+    """Build the cell channels directly from the grid for comparison."""
+    grid = np.array(maze.grid)
+    return (grid == CellType.WALL.value,
+            grid == CellType.PELLET.value,
+            grid == CellType.POWER_UP.value)
+
+def test_observation_shape():
+    """Test the channel layout of the observation tensor."""
+    maze = Maze(25, 19)
+    encoder = ObservationEncoder(maze, num_players=2, num_ghosts=4)
+    obs = encoder.observe()
+
+    # walls, pellets, power-ups, 2 players, 4 ghosts, removed walls
+    assert obs.shape == (10, 19, 25)
+    walls, pellets, powerups = _expected_cells(maze)
+    assert (obs[CHANNEL_WALLS] == walls).all()
+    assert (obs[CHANNEL_PELLETS] == pellets).all()
+
+def test_observation_tracks_maze_changes():
+    """Test that maze mutations are reflected without a rebuild."""
+    maze = Maze(15, 15)
+    encoder = ObservationEncoder(maze)
+
+    pellet = next(iter(maze.pellet_positions))
+    maze.collect_pellet(*pellet)
+    empty = maze.find_empty_positions_near(pellet, 2)
+    maze.place_powerup(*empty[0])
+    maze.apply_chaos_mode(10.0, 5)
+
+    obs = encoder.observe()
+    walls, pellets, powerups = _expected_cells(maze)
+    assert (obs[CHANNEL_WALLS] == walls).all()
+    assert (obs[CHANNEL_PELLETS] == pellets).all()
+    assert (obs[CHANNEL_POWERUPS] == powerups).all()
+
+    removed = obs[encoder.removed_walls_channel]
+    assert removed.sum() == len(maze.temporary_modifications)
+
+    # Restoring the maze clears the removed-walls channel again
+    maze.restore_original_maze()
+    assert encoder.observe()[encoder.removed_walls_channel].sum() == 0
+    assert (encoder.observe()[CHANNEL_WALLS] == _expected_cells(maze)[0]).all()
+
+def test_observation_entities():
+    """Test that entity channels follow players and ghosts."""
+    maze = Maze(15, 15)
+    encoder = ObservationEncoder(maze, num_players=1, num_ghosts=1)
+    player = Player(1, (1, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+    ghost = Ghost(0, (7, 7), (255, 0, 0))
+
+    encoder.update_entities([player], [ghost])
+    player.position = (2, 1)
+    encoder.update_entities([player], [ghost])
+
+    obs = encoder.observe()
+    assert obs[encoder.player_channel_start].sum() == 1
+    assert obs[encoder.player_channel_start, 1, 2] == 1
+    assert obs[encoder.ghost_channel_start, 7, 7] == 1
+
+def test_observation_is_read_only_view():
+    """Test that observe() does not copy and cannot be written through."""
+    maze = Maze(10, 10)
+    encoder = ObservationEncoder(maze)
+    obs = encoder.observe()
+
+    assert np.shares_memory(obs, encoder.buffer)
+    assert not obs.flags.writeable
+
+if __name__ == "__main__":
+    test_observation_shape()
+    print("✓ Observation shape test passed")
+
+    test_observation_tracks_maze_changes()
+    print("✓ Observation maze tracking test passed")
+
+    test_observation_entities()
+    print("✓ Observation entity test passed")
+
+    test_observation_is_read_only_view()
+    print("✓ Observation view test passed")
+
+    print("\nAll observation tests passed!")
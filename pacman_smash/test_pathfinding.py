@@ -0,0 +1,151 @@
+"""
+Test A* path planning and the shared path cache.
+"""
+
+import random
+from maze import Maze, CellType
+from navigation import DistanceCache
+from pathfinding import PathCache, astar
+from ghost_ai import Ghost, GhostManager, GhostBehavior
+from player import Player, PLAYER_1_CONTROLS, PLAYER_1_COLOR
+
+# The ghost starts in a pocket whose only exit faces away from the target
+POCKET_LAYOUT = [
+    "#########",
+    "#.......#",
+    "#.#####.#",
+    "#.#...#.#",
+    "#.##.##.#",
+    "#.......#",
+    "#########",
+]
+
+def make_maze(layout):
+    """Build a maze with a fixed layout."""
+    maze = Maze(len(layout[0]), len(layout))
+    for y, row in enumerate(layout):
+        for x, char in enumerate(row):
+            value = CellType.WALL.value if char == "#" else CellType.PATH.value
+            maze.set_cell(x, y, value)
+    return maze
+
+def test_astar_is_shortest():
+    """Test that A* paths match BFS distances on a generated maze."""
+    maze = Maze(25, 19)
+    distances = DistanceCache(maze)
+    cells = maze.find_path_positions()
+    for start, goal in zip(cells[::7], cells[3::11]):
+        path = astar(maze, start, goal)
+        expected = distances.distance(start, goal)
+        if expected is None:
+            assert path is None
+            continue
+        assert len(path) - 1 == expected
+        assert path[0] == start and path[-1] == goal
+        for a, b in zip(path, path[1:]):
+            assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+            assert maze.is_valid_position(*b)
+
+def test_path_cache_versioning():
+    """Test cache hits and invalidation when walls change."""
+    maze = make_maze(POCKET_LAYOUT)
+    cache = PathCache(maze)
+    path = cache.find_path((4, 3), (4, 1))
+    assert len(path) - 1 == 12
+    assert cache.find_path((4, 3), (4, 1)) is path
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Opening a wall keeps the cached path: it is still valid
+    maze.set_cell(4, 2, CellType.PATH.value)
+    assert cache.find_path((4, 3), (4, 1)) is path
+    assert cache.misses == 1
+
+    # Blocking the path patches just the blocked stretch with a detour
+    maze.set_cell(4, 2, CellType.WALL.value)
+    maze.set_cell(1, 3, CellType.WALL.value)
+    maze.set_cell(2, 3, CellType.PATH.value)
+    maze.set_cell(2, 4, CellType.PATH.value)
+    repaired = cache.find_path((4, 3), (4, 1))
+    assert cache.misses == 1 and cache.repairs == 1
+    assert (1, 3) not in repaired
+    assert len(repaired) - 1 == len(astar(maze, (4, 3), (4, 1))) - 1
+
+    assert cache.find_path((4, 3), (0, 0)) is None
+    assert cache.find_path((4, 3), (0, 0)) is None
+    assert cache.misses == 2
+
+def test_repaired_paths_stay_valid():
+    """Test that repaired paths are connected, open and end at the goal."""
+    rng = random.Random(3)
+    maze = Maze(25, 19)
+    cache = PathCache(maze)
+    cells = maze.find_path_positions()
+    pairs = [(rng.choice(cells), rng.choice(cells)) for _ in range(20)]
+
+    for _ in range(15):
+        for start, goal in pairs:
+            cache.find_path(start, goal)
+        endpoints = {cell for pair in pairs for cell in pair}
+        for _ in range(3):
+            x, y = rng.randint(1, 23), rng.randint(1, 17)
+            if (x, y) not in endpoints:
+                value = CellType.PATH.value if maze.is_wall(x, y) else CellType.WALL.value
+                maze.set_cell(x, y, value)
+        for start, goal in pairs:
+            path = cache.find_path(start, goal)
+            if path is None:
+                assert astar(maze, start, goal) is None
+                continue
+            assert path[0] == start and path[-1] == goal
+            assert len(set(path)) == len(path)
+            for a, b in zip(path, path[1:]):
+                assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+                assert maze.is_valid_position(*b)
+
+    assert cache.repairs > 0
+
+def test_ghost_chases_around_walls():
+    """Test that a chasing ghost escapes the pocket and reuses its plan."""
+    maze = make_maze(POCKET_LAYOUT)
+    manager = GhostManager(maze)
+    ghost = Ghost(0, (4, 3), (255, 0, 0))
+    manager.add_ghost(ghost)
+    player = Player(1, (4, 1), PLAYER_1_CONTROLS, PLAYER_1_COLOR)
+    ghost.set_behavior(GhostBehavior.CHASE)
+    ghost.set_target_player(1)
+
+    for _ in range(12):
+        ghost.last_move_time = 0.0
+        ghost.update(maze.grid, [player], manager.ghosts)
+    assert ghost.position == player.position
+
+    # One plan served the whole chase
+    assert manager.path_cache.misses == 1
+
+    # The target stepping back along the path keeps the plan
+    ghost.position = (1, 5)
+    ghost.path, ghost.path_index = (), 0
+    player.position = (1, 1)
+    ghost.last_move_time = 0.0
+    ghost.update(maze.grid, [player], manager.ghosts)
+    plans = manager.path_cache.misses
+    player.position = (1, 2)
+    ghost.last_move_time = 0.0
+    ghost.update(maze.grid, [player], manager.ghosts)
+    assert manager.path_cache.misses == plans
+    assert ghost.path[-1] == (1, 2)
+
+if __name__ == "__main__":
+    test_astar_is_shortest()
+    print("✓ A* shortest path test passed")
+
+    test_path_cache_versioning()
+    print("✓ Path cache versioning test passed")
+
+    test_repaired_paths_stay_valid()
+    print("✓ Path repair validity test passed")
+
+    test_ghost_chases_around_walls()
+    print("✓ Ghost wall-aware chase test passed")
+
+    print("\nAll pathfinding tests passed!")
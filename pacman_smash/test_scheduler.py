@@ -0,0 +1,114 @@
+"""
+Test the multi-rate subsystem scheduler.
+"""
+
+import time
+import pygame
+from scheduler import Scheduler
+from main import GameEngine
+
+def test_interval_and_self_scheduled_subsystems():
+    """Test that subsystems run only when due."""
+    scheduler = Scheduler()
+    runs = []
+    scheduler.add("fast", lambda t: runs.append(("fast", t)), interval=1.0)
+    scheduler.add("slow", lambda t: runs.append(("slow", t)), interval=5.0)
+    # Asks to run at t=3 every time; the guard keeps it from spinning
+    scheduler.add("self", lambda t: runs.append(("self", t)) or 3.0, min_interval=2.0)
+
+    for t in range(0, 11):
+        scheduler.run_due(float(t))
+
+    names = [name for name, _ in runs]
+    assert names.count("fast") == 11
+    assert names.count("slow") == 3  # t = 0, 5, 10
+    assert [t for name, t in runs if name == "self"] == [0.0, 3.0, 5.0, 7.0, 9.0]
+
+    stats = scheduler.get_stats()
+    assert stats["slow"]["runs"] == 3
+    assert stats["slow"]["next_due"] == 15.0
+
+def test_wake_and_remove():
+    """Test pulling a run forward and unregistering."""
+    scheduler = Scheduler()
+    runs = []
+    scheduler.add("rare", lambda t: runs.append(t), interval=100.0)
+    scheduler.run_due(0.0)
+
+    scheduler.wake("rare", 5.0)
+    assert scheduler.run_due(4.0) == []
+    assert scheduler.run_due(5.0) == ["rare"]
+    assert scheduler.subsystems["rare"].next_due == 105.0
+
+    # Waking never delays a run
+    scheduler.wake("rare", 500.0)
+    assert scheduler.next_due() == 105.0
+
+    scheduler.remove("rare")
+    assert scheduler.run_due(1000.0) == []
+    assert runs == [0.0, 5.0]
+
+def test_falling_behind_does_not_burst():
+    """Test that a stalled loop runs each subsystem once, not once per missed slot."""
+    scheduler = Scheduler()
+    runs = []
+    scheduler.add("tick", lambda t: runs.append(t), interval=0.5)
+    scheduler.run_due(0.0)
+    scheduler.run_due(60.0)
+    scheduler.run_due(60.1)
+    assert runs == [0.0, 60.0]
+    assert scheduler.subsystems["tick"].next_due == 60.5
+
+def test_game_idle_frames_are_cheap():
+    """Test that a game frame right after a full update runs only per-frame work."""
+    pygame.init()
+    game = GameEngine(headless=True)
+    now = 1000.0
+    assert len(game.scheduler.run_due(now)) == len(game.scheduler.subsystems)
+
+    ran = game.scheduler.run_due(now + 0.001)
+    assert "ai_metrics" not in ran and "ai_balancing" not in ran
+    assert "pellet_respawn" not in ran
+    assert "collisions" in ran
+    pygame.quit()
+
+def test_sped_up_ghost_wakes_ghost_update():
+    """Test that speeding a ghost up pulls the sleeping ghost update forward."""
+    pygame.init()
+    game = GameEngine(headless=True)
+    start = time.time()
+    for ghost in game.ghost_manager.ghosts:
+        ghost.last_move_time = start
+        ghost.set_speed_multiplier(0.1)  # Next move in 5 s
+    game.scheduler.run_due(start)
+    assert game.scheduler.subsystems["ghosts"].next_due >= start + 4.0
+
+    ghost = game.ghost_manager.ghosts[0]
+    ghost.set_speed_multiplier(3.0)
+    due = ghost.next_move_time()
+    assert due < start + 1.0
+    assert game.scheduler.subsystems["ghosts"].next_due == due
+
+    time.sleep(max(0.0, due - time.time()) + 0.01)
+    assert "ghosts" in game.scheduler.run_due(time.time())
+    assert ghost.last_move_time >= due
+    assert all(other.last_move_time == start for other in game.ghost_manager.ghosts[1:])
+    pygame.quit()
+
+if __name__ == "__main__":
+    test_interval_and_self_scheduled_subsystems()
+    print("✓ Interval and self-scheduling test passed")
+
+    test_wake_and_remove()
+    print("✓ Wake and remove test passed")
+
+    test_falling_behind_does_not_burst()
+    print("✓ Catch-up test passed")
+
+    test_game_idle_frames_are_cheap()
+    print("✓ Idle frame test passed")
+
+    test_sped_up_ghost_wakes_ghost_update()
+    print("✓ Ghost speed-up wake test passed")
+
+    print("\nAll scheduler tests passed!")
@@ -0,0 +1,125 @@
+"""
+Test bounded performance tracking structures.
+"""
+
+import random
+from tracking import MovementHistory, SlidingWindowCounter
+
+def _reference_speed(samples, current_time, window):
+    """Original list-based speed calculation for comparison."""
+    recent = [s for s in samples if current_time - s[2] <= window]
+    if len(recent) < 2:
+        return 0.0
+    distance = sum(abs(b[0] - a[0]) + abs(b[1] - a[1]) for a, b in zip(recent, recent[1:]))
+    return distance / max(0.001, recent[-1][2] - recent[0][2])
+
+def test_movement_history_matches_full_scan():
+    """Test that the running sums agree with a full history scan."""
+    history = MovementHistory(window=2.0, capacity=64)
+    samples = []
+    for i in range(40):
+        sample = (i % 7, (i * 3) % 5, i * 0.25)
+        samples.append(sample)
+        history.append(*sample)
+
+        now = sample[2] + 0.1
+        assert abs(history.average_speed(now) - _reference_speed(samples, now, 2.0)) < 1e-9
+        assert abs(history.average_speed(now, 1.0) -
+                   _reference_speed(samples, now, 1.0)) < 1e-9
+
+def test_movement_history_is_bounded():
+    """Test that memory stays constant over long sessions."""
+    history = MovementHistory(window=1000.0, capacity=16)
+    for i in range(10000):
+        history.append(i, 0, float(i) * 0.01)
+
+    assert len(history) == 16
+    assert history[0][0] == 10000 - 16
+    assert history[-1][0] == 9999
+
+def test_movement_history_evicts_old_samples():
+    """Test that samples outside the window are dropped."""
+    history = MovementHistory(window=1.0)
+    history.append(0, 0, 0.0)
+    history.append(1, 0, 0.5)
+    history.append(2, 0, 5.0)
+
+    assert len(history) == 1
+    assert history.average_speed(5.1) == 0.0
+    assert list(history) == [(2, 0, 5.0)]
+
+def test_sliding_counter_window():
+    """Test that only events inside the window are counted."""
+    counter = SlidingWindowCounter(window=10.0, num_buckets=20)
+    for t in range(30):
+        counter.add(float(t))
+
+    # Events at t = 20..29 lie in (19.5, 29.5] apart from the boundary bucket
+    total = counter.total(29.5)
+    assert 9.0 <= total <= 11.0
+    assert abs(counter.rate(29.5) - total / 10.0) < 1e-9
+
+    # Shorter windows only sum the buckets they cover
+    assert counter.total(29.5, 2.0) == 2.0
+
+def test_sliding_counter_expires_events():
+    """Test that idle time clears the window."""
+    counter = SlidingWindowCounter(window=5.0, num_buckets=10)
+    counter.add(100.0, 3)
+    assert counter.total(100.2) == 3
+    assert counter.total(104.0) == 3
+    assert counter.total(106.0) == 0
+    assert counter.total(1000.0) == 0
+
+def test_sliding_counter_weighted_amounts():
+    """Test that weighted amounts (e.g. score deltas) can go negative."""
+    counter = SlidingWindowCounter(window=10.0, num_buckets=10)
+    counter.add(1.0, 10)
+    counter.add(2.0, 10)
+    counter.add(3.0, -50)
+    assert counter.total(3.5) == -30
+
+def test_sliding_counter_any_window_matches_scan():
+    """Test prefix-sum totals against summing the buckets a window covers."""
+    rng = random.Random(5)
+    counter = SlidingWindowCounter(window=60.0, num_buckets=120)
+    events = []
+    current_time = 0.0
+    for _ in range(2000):
+        current_time += rng.expovariate(20.0)
+        amount = rng.choice([1, 10, 50, -20])
+        counter.add(current_time, amount)
+        events.append((current_time, amount))
+        if rng.random() < 0.05:
+            for window in (0.3, 2.0, 10.0, 37.5, 60.0):
+                window_start = current_time - window
+                expected = 0.0
+                for event_time, event_amount in events:
+                    bucket_start = event_time // 0.5 * 0.5
+                    inside = min(1.0, max(0.0, (bucket_start + 0.5 - window_start) / 0.5))
+                    expected += event_amount * inside
+                assert abs(counter.total(current_time, window) - expected) < 1e-6
+
+if __name__ == "__main__":
+    test_movement_history_matches_full_scan()
+    print("✓ Movement history accuracy test passed")
+
+    test_movement_history_is_bounded()
+    print("✓ Movement history bound test passed")
+
+    test_movement_history_evicts_old_samples()
+    print("✓ Movement history eviction test passed")
+
+    test_sliding_counter_window()
+    print("✓ Sliding counter window test passed")
+
+    test_sliding_counter_expires_events()
+    print("✓ Sliding counter expiry test passed")
+
+    test_sliding_counter_weighted_amounts()
+    print("✓ Sliding counter weighted amount test passed")
+
+    test_sliding_counter_any_window_matches_scan()
+    print("✓ Sliding counter prefix sum test passed")
+
+    print("\nAll tracking tests passed!")
@@ -0,0 +1,230 @@
+"""
+Bounded performance tracking structures for Pacman Smash.
+Keeps per-player history in fixed memory with O(1) windowed queries.
+"""
+
+from typing import Iterator, Optional, Tuple
+
+class MovementHistory:
+    """
+    Ring buffer of (x, y, timestamp) movement samples.
+
+    Samples older than the window (or beyond the capacity) are dropped as new
+    ones arrive, and the Manhattan distance between consecutive retained samples
+    is kept as a running sum, so the windowed average speed is O(1).
+    """
+
+    def __init__(self, window: float = 10.0, capacity: int = 256):
+        """
+        Initialize the history.
+
+        Args:
+            window: Time window in seconds covered by the running sums
+            capacity: Maximum number of samples kept
+        """
+        self.window = window
+        self.capacity = capacity
+
+        self._xs = [0] * capacity
+        self._ys = [0] * capacity
+        self._times = [0.0] * capacity
+        self._start = 0
+        self._count = 0
+
+        # Sum of distances between consecutive retained samples
+        self._distance_sum = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Tuple[int, int, float]]:
+        for i in range(self._count):
+            index = (self._start + i) % self.capacity
+            yield self._xs[index], self._ys[index], self._times[index]
+
+    def __getitem__(self, i: int) -> Tuple[int, int, float]:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("movement history index out of range")
+        index = (self._start + i) % self.capacity
+        return self._xs[index], self._ys[index], self._times[index]
+
+    def _step_distance(self, a: int, b: int) -> int:
+        """Manhattan distance between the samples at buffer slots a and b."""
+        return abs(self._xs[b] - self._xs[a]) + abs(self._ys[b] - self._ys[a])
+
+    def _drop_oldest(self) -> None:
+        """Remove the oldest sample and its contribution to the running sum."""
+        if self._count > 1:
+            self._distance_sum -= self._step_distance(
+                self._start, (self._start + 1) % self.capacity)
+        self._start = (self._start + 1) % self.capacity
+        self._count -= 1
+        if self._count == 0:
+            self._distance_sum = 0
+
+    def evict_older_than(self, current_time: float) -> None:
+        """Drop samples that have left the time window."""
+        while self._count and current_time - self._times[self._start] > self.window:
+            self._drop_oldest()
+
+    def append(self, x: int, y: int, timestamp: float) -> None:
+        """Record a movement sample."""
+        self.evict_older_than(timestamp)
+        if self._count == self.capacity:
+            self._drop_oldest()
+
+        index = (self._start + self._count) % self.capacity
+        self._xs[index] = x
+        self._ys[index] = y
+        self._times[index] = timestamp
+
+        if self._count:
+            self._distance_sum += self._step_distance(
+                (index - 1) % self.capacity, index)
+        self._count += 1
+
+    def average_speed(self, current_time: float,
+                      time_window: Optional[float] = None) -> float:
+        """
+        Calculate cells moved per second over a time window.
+
+        Args:
+            current_time: Time of the query
+            time_window: Window in seconds; the configured window is O(1),
+                other windows scan the (bounded) buffer
+
+        Returns:
+            Average speed, or 0.0 with fewer than two samples in the window
+        """
+        if time_window is None or time_window == self.window:
+            self.evict_older_than(current_time)
+            if self._count < 2:
+                return 0.0
+            first_time = self._times[self._start]
+            last_time = self._times[(self._start + self._count - 1) % self.capacity]
+            return self._distance_sum / max(0.001, last_time - first_time)
+
+        # Arbitrary window: walk back from the newest sample
+        total_distance = 0
+        samples = 0
+        first_time = last_time = 0.0
+        newer = None
+        for i in range(self._count - 1, -1, -1):
+            index = (self._start + i) % self.capacity
+            if current_time - self._times[index] > time_window:
+                break
+            if newer is None:
+                last_time = self._times[index]
+            else:
+                total_distance += self._step_distance(index, newer)
+            first_time = self._times[index]
+            newer = index
+            samples += 1
+
+        if samples < 2:
+            return 0.0
+        return total_distance / max(0.001, last_time - first_time)
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._start = 0
+        self._count = 0
+        self._distance_sum = 0
+
+class SlidingWindowCounter:
+    """
+    Time-bucketed event counter over a sliding window.
+
+    Events are summed into fixed-width buckets in a ring. Next to each bucket
+    the ring keeps the running total of every event up to and including that
+    bucket, so the events in any window are the difference of two prefix sums
+    plus the in-window share of the bucket that straddles the window start:
+    O(1) whatever the window length.
+    """
+
+    def __init__(self, window: float = 60.0, num_buckets: int = 120):
+        """
+        Initialize the counter.
+
+        Args:
+            window: Longest window in seconds that can be queried
+            num_buckets: Buckets per window (window / num_buckets is the resolution)
+        """
+        self.window = window
+        self.bucket_width = window / num_buckets
+
+        # One extra slot holds the bucket that straddles the window start
+        self._size = num_buckets + 1
+        self._buckets = [0.0] * self._size
+        self._prefix = [0.0] * self._size  # Running total through each bucket
+        self._head: Optional[int] = None  # Absolute index of the newest bucket
+        self._running = 0.0  # Total of every event recorded
+
+    def _advance(self, current_time: float) -> None:
+        """Rotate the ring forward to the bucket containing current_time."""
+        bucket = int(current_time // self.bucket_width)
+        if self._head is None:
+            self._head = bucket
+            return
+        if bucket <= self._head:
+            return
+
+        if bucket - self._head >= self._size:
+            # Idle for longer than the whole ring
+            self._buckets = [0.0] * self._size
+            self._prefix = [self._running] * self._size
+        else:
+            # Reuse the slots of buckets that fell out of the ring
+            for step in range(1, bucket - self._head + 1):
+                slot = (self._head + step) % self._size
+                self._buckets[slot] = 0.0
+                self._prefix[slot] = self._running
+        self._head = bucket
+
+    def add(self, current_time: float, amount: float = 1.0) -> None:
+        """Record an event (or a weighted amount) at current_time."""
+        self._advance(current_time)
+        slot = self._head % self._size
+        self._buckets[slot] += amount
+        self._running += amount
+        self._prefix[slot] = self._running
+
+    def total(self, current_time: float, time_window: Optional[float] = None) -> float:
+        """
+        Get the sum of events in the last time_window seconds.
+
+        Args:
+            current_time: Time of the query
+            time_window: Window in seconds, capped at the configured window
+
+        Returns:
+            Event total, with the boundary bucket weighted by its overlap
+        """
+        self._advance(current_time)
+        if self._head is None:
+            return 0.0
+
+        window = self.window if time_window is None else min(time_window, self.window)
+        window_start = current_time - window
+        bucket_width = self.bucket_width
+
+        # The bucket straddling the window start, kept inside the ring
+        oldest = self._head - self._size + 1
+        boundary = min(self._head, max(oldest, int(window_start // bucket_width)))
+        slot = boundary % self._size
+        inside = min(1.0, max(0.0, ((boundary + 1) * bucket_width - window_start) / bucket_width))
+        return (self._running - self._prefix[slot]) + self._buckets[slot] * inside
+
+    def rate(self, current_time: float, time_window: Optional[float] = None) -> float:
+        """Get events per second over the last time_window seconds."""
+        window = self.window if time_window is None else min(time_window, self.window)
+        return self.total(current_time, window) / max(0.001, window)
+
+    def clear(self) -> None:
+        """Drop all recorded events."""
+        self._buckets = [0.0] * self._size
+        self._prefix = [0.0] * self._size
+        self._head = None
+        self._running = 0.0